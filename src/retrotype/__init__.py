@@ -1,11 +1,61 @@
-from retrotype.retrotype import (read_file,
-                                 check_line_number_seq,
-                                 ahoy_lines_list,
-                                 split_line_num,
-                                 scan_manager,
-                                 ahoy1_checksum,
-                                 ahoy2_checksum,
-                                 ahoy3_checksum,
-                                 write_binary,
-                                 write_checksums,
-                                 )
+"""
+Tools for Commodore BASIC type-in programs.
+
+Names are imported from the modules that define them on first use, so that
+running a tool of the package (such as retrotype.client) only loads the
+modules it needs.
+"""
+
+# public names of each module of the package
+_EXPORTS = {
+    'retrotype': (
+        'read_file', 'SourceLine', 'parse_source_line', 'read_source_lines',
+        'iter_source_lines', 'read_ref_file', 'parse_ref_lines',
+        'RefComparison', 'compare_checksums', 'check_line_number_seq',
+        'iter_checked_lines', 'iter_numbered_lines', 'MAX_LINE_NUM',
+        'ahoy_lines_list', 'split_line_num', 'scan_manager', 'scan_line',
+        'scan_ahoy_line', 'scan_ahoy_text', 'loose_brace_column',
+        'bad_char_column', 'detokenize_line', 'ahoy1_checksum',
+        'ahoy2_checksum', 'ahoy3_checksum', 'CHECKSUM_SOURCES',
+        'line_checksum', 'fused_checksums', 'detect_source', 'batch_checksums',
+        'ChecksumState', 'checksum_state', 'checksum_prefix_states',
+        'PrgBuilder', 'tokenize_chunk', 'convert_line', 'LineCache',
+        'write_binary', 'write_checksums', 'stream_checksums',
+        'ConversionError', 'LineNumberError', 'LooseBraceError',
+        'BadCharError', 'Conversion', 'convert',
+    ),
+    'suggest': (
+        'Suggestion', 'suggest_corrections',
+    ),
+    'cache': (
+        'ConversionCache', 'CacheEntry', 'default_cache_dir',
+    ),
+    'watch': (
+        'ProgramState', 'WatchedLine', 'LineChange', 'file_watcher',
+    ),
+    'interactive': (
+        'TypedProgram', 'EnteredLine',
+    ),
+    'output': (
+        'place_binary',
+    ),
+}
+
+_MODULES = {name: module for (module, names) in _EXPORTS.items()
+            for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    """Import a public name from its module the first time it is used"""
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = __import__(f'{__name__}.{_MODULES[name]}', fromlist=[name])
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
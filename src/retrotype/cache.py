@@ -0,0 +1,212 @@
+"""
+On-disk cache of converted programs, keyed by the content of the source file
+and the conversion options, so unchanged sources skip conversion.
+"""
+
+import hashlib
+from os import environ, getpid, listdir, makedirs, path, remove, replace, \
+    stat, utime
+from typing import NamedTuple
+
+# import retrotype.py, tables.py, and char_maps.py, whose code and tables are
+# part of every cache key
+try:
+    from retrotype import char_maps as char_maps
+    from retrotype import retrotype as retrotype
+    from retrotype import tables as tables
+    from retrotype.retrotype import CHECKSUM_SOURCES
+except ImportError:  # Case for direct python execution
+    import char_maps
+    import retrotype
+    import tables
+    from retrotype import CHECKSUM_SOURCES
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# sources larger than this are converted without the cache, streaming in
+# bounded memory rather than being read whole to find their key
+DEFAULT_MAX_SOURCE_BYTES = 4 * 1024 * 1024
+
+_ENTRY_SUFFIX = '.entry'
+_HEADER = b'retrotype-cache 1'
+
+
+def _tool_version():
+    """Digest of the conversion code and tables, so entries made by another
+       version of the tool are never used
+    """
+    digest = hashlib.sha256()
+    # retrotype_cli.py is read rather than imported, as it imports this
+    # module; its conversion paths (such as --jobs) shape the output too
+    filenames = [module.__file__ for module in (retrotype, tables, char_maps)]
+    filenames.append(path.join(path.dirname(retrotype.__file__),
+                               'retrotype_cli.py'))
+    for filename in filenames:
+        with open(filename, 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def default_cache_dir():
+    """Cache directory under $XDG_CACHE_HOME, or ~/.cache if it is not set"""
+    cache_home = environ.get('XDG_CACHE_HOME') or path.join(
+        path.expanduser('~'), '.cache')
+    return path.join(cache_home, 'retrotype')
+
+
+class CacheEntry(NamedTuple):
+    """A converted program as stored in the cache"""
+
+    prg: bytes
+    checksums: list  # (line number, checksum) tuples, or (line number, dict
+    # of checksums keyed by source format) for the 'auto' source format
+
+
+class ConversionCache:
+    """Size-bounded cache of converted programs in a directory
+
+    Each entry is a single file named by its key, written under a temporary
+    name and renamed into place so other processes only ever see complete
+    entries.  Reading an entry updates its modification time, and the least
+    recently used entries are removed once the directory grows past
+    max_bytes.  Entries removed by another process part way through are
+    treated as misses.  Sources larger than max_source_bytes are not cached.
+    """
+
+    _version = None
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES,
+                 max_source_bytes=DEFAULT_MAX_SOURCE_BYTES):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.max_bytes = max_bytes
+        self.max_source_bytes = max_source_bytes
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def version(cls):
+        if cls._version is None:
+            cls._version = _tool_version()
+        return cls._version
+
+    def key(self, source_bytes, source, load_addr):
+        """Key for a source file's content and conversion options
+
+        Args:
+            source_bytes (bytes): Content of the source file
+            source (str): Magazine source format
+            load_addr (int): Load address of the program
+
+        Returns:
+            str: Hex digest naming the cache entry
+        """
+        digest = hashlib.sha256(self.version().encode())
+        digest.update(f'\0{source}\0{load_addr}\0'.encode())
+        digest.update(source_bytes)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Look up a converted program, marking it as recently used
+
+        Returns:
+            CacheEntry or None: The entry, or None on a miss
+        """
+        filename = self._filename(key)
+        try:
+            with open(filename, 'rb') as file:
+                data = file.read()
+            utime(filename)
+            entry = _decode_entry(data)
+        except (OSError, ValueError):
+            entry = None
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def put(self, key, prg, checksums):
+        """Store a converted program, then evict the least recently used
+           entries past the size bound.  Failures to write leave the cache
+           unchanged.
+
+        Args:
+            key (str): Key from key()
+            prg (bytes-like): Program file image
+            checksums (list): Line checksums as in CacheEntry
+        """
+        filename = self._filename(key)
+        temp = f'{filename}.{getpid()}.tmp'
+        try:
+            makedirs(self.cache_dir, exist_ok=True)
+            with open(temp, 'wb') as file:
+                file.write(_encode_entry(prg, checksums))
+            replace(temp, filename)
+        except OSError:
+            if path.exists(temp):
+                remove(temp)
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the cache fits within
+           max_bytes
+        """
+        entries = []
+        total = 0
+        try:
+            names = listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            filename = path.join(self.cache_dir, name)
+            try:
+                status = stat(filename)
+            except OSError:
+                continue
+            entries.append((status.st_mtime, filename, status.st_size))
+            total += status.st_size
+        entries.sort()
+        for (_, filename, size) in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                remove(filename)
+            except OSError:
+                pass
+            total -= size
+
+    def _filename(self, key):
+        return path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+
+def _encode_entry(prg, checksums):
+    """Entry file content: a header giving the image length, a line per
+       checksum, then the program image
+    """
+    lines = [b'%s %d\n' % (_HEADER, len(prg))]
+    for (line_num, codes) in checksums:
+        if isinstance(codes, dict):
+            codes = ' '.join(codes[source] for source in CHECKSUM_SOURCES)
+        lines.append(f'{line_num} {codes}\n'.encode())
+    return b''.join(lines) + bytes(prg)
+
+
+def _decode_entry(data):
+    """Parse entry file content, or return None if it is not complete"""
+    (header, _, rest) = data.partition(b'\n')
+    (name, _, size) = header.rpartition(b' ')
+    if name != _HEADER or not size.isdigit() or int(size) > len(rest):
+        return None
+    size = int(size)
+    checksums = []
+    for line in rest[:len(rest) - size].decode().splitlines():
+        fields = line.split()
+        if len(fields) == 2:
+            checksums.append((int(fields[0]), fields[1]))
+        else:
+            checksums.append((int(fields[0]),
+                              dict(zip(CHECKSUM_SOURCES, fields[1:]))))
+    return CacheEntry(rest[len(rest) - size:], checksums)
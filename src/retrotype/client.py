@@ -0,0 +1,156 @@
+"""
+Converts a type-in program with a conversion server started with
+'retrotype_cli --serve', writing the same output files and printing the same
+report as retrotype_cli.  Only needs the standard library and output.py, so
+it starts without loading the conversion tables.
+"""
+
+import argparse
+from base64 import b64decode
+import json
+from os import environ, get_terminal_size, getpid, path, remove, replace
+import socket
+import sys
+
+try:
+    from retrotype.output import place_binary
+except ImportError:  # Case for direct python execution
+    from output import place_binary
+
+
+def parse_args(argv):
+    """Parses command line inputs for the client."""
+
+    parser = argparse.ArgumentParser(
+        description="Converts a Commodore BASIC type-in program with a "
+                    "retrotype_cli conversion server.")
+    parser.add_argument(
+        "socket", type=str,
+        help="Unix socket of a server started with 'retrotype_cli --serve'")
+    parser.add_argument(
+        "-l", "--loadaddr", type=str, nargs=1, required=False,
+        metavar="load_address", default=["0x0801"],
+        help="Target BASIC memory address when loading (default: 0x0801)")
+    parser.add_argument(
+        "-s", "--source", choices=["ahoy1", "ahoy2", "ahoy3", "auto"],
+        type=str, nargs=1, required=False, metavar="source_format",
+        default=["ahoy2"],
+        help="Magazine source for conversion and checksum (default: ahoy2)")
+    parser.add_argument(
+        "-r", "--ref", type=str, nargs=1, required=False,
+        metavar="ref_file", default=None,
+        help="Reference file of magazine line numbers and checksums")
+    parser.add_argument(
+        "--suggest", action="store_true",
+        help="Suggest corrections for lines that do not match the reference "
+             "file")
+    parser.add_argument(
+        "file_in", type=str, metavar="input_file",
+        help="Input file name including path")
+    return parser.parse_args(argv)
+
+
+def send_request(socket_path, request):
+    """Send one request to a conversion server and wait for its response
+
+    Args:
+        socket_path (str): Unix socket the server listens on
+        request (dict): Request as described in retrotype.server
+
+    Returns:
+        dict: Response decoded from JSON
+
+    Raises:
+        OSError: If the server cannot be reached or closes the connection
+    """
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall(json.dumps(request).encode() + b'\n')
+        with client.makefile('rb') as response:
+            line = response.readline()
+    if not line:
+        raise ConnectionError('server closed the connection')
+    return json.loads(line)
+
+
+def main(argv=None, width=None):
+    """Convert a file with the server, as retrotype_cli does on its own
+
+    Returns:
+        int: Exit status
+    """
+
+    args = parse_args(argv)
+    try:
+        with open(args.file_in) as file:
+            text = file.read()
+    except IOError:
+        print("File read failed - please check source file name and path.")
+        return 1
+    ref = None
+    if args.ref:
+        try:
+            with open(args.ref[0]) as file:
+                ref = file.read()
+        except IOError as error:
+            print(f"Reference file read failed - {error}")
+            return 1
+
+    if not width:
+        width = _terminal_columns()
+    request = {'text': text, 'source': args.source[0],
+               'load_addr': args.loadaddr[0], 'ref': ref,
+               'suggest': args.suggest, 'width': width}
+    try:
+        response = send_request(args.socket, request)
+    except (OSError, ValueError) as error:
+        print(f'Conversion server request failed - {error}')
+        return 1
+
+    print(response['messages'], end='')
+    if response['prg'] is not None:
+        file_stem = path.splitext(args.file_in)[0]
+        _write_outputs(file_stem, b64decode(response['prg']),
+                       response['chk'].encode())
+    print(response['report'], end='')
+    return response['status']
+
+
+def _terminal_columns():
+    # as retrotype_cli.terminal_columns(), which would load the conversion
+    # tables
+    try:
+        return int(environ['COLUMNS'])
+    except (KeyError, ValueError):
+        pass
+    try:
+        return get_terminal_size(sys.__stdout__.fileno()).columns or 80
+    except (AttributeError, ValueError, OSError):
+        return 80
+
+
+def _write_outputs(file_stem, prg, chk):
+    """Write the output files as retrotype_cli does, replacing the checksum
+    file and confirming before replacing an existing program file.
+    """
+
+    bin_file = f'{file_stem}.prg'
+    chk_file = f'{file_stem}.chk'
+    bin_temp = f'{bin_file}.{getpid()}.tmp'
+    chk_temp = f'{chk_file}.{getpid()}.tmp'
+    try:
+        with open(bin_temp, 'xb') as file:
+            file.write(prg)
+        with open(chk_temp, 'xb') as file:
+            file.write(chk)
+        place_binary(bin_temp, bin_file)
+        replace(chk_temp, chk_file)
+    finally:
+        for temp in (bin_temp, chk_temp):
+            if path.exists(temp):
+                remove(temp)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Holds a program being typed in one line at a time, keyed by line number the
+way BASIC does, giving each line's checksum as soon as it is entered.
+"""
+
+from typing import NamedTuple
+
+try:
+    from retrotype.retrotype import (PrgBuilder,
+                                     parse_source_line,
+                                     convert_line,
+                                     loose_brace_column,
+                                     bad_char_column,
+                                     MAX_LINE_NUM,
+                                     )
+except ImportError:  # Case for direct python execution
+    from retrotype import (PrgBuilder,
+                           parse_source_line,
+                           convert_line,
+                           loose_brace_column,
+                           bad_char_column,
+                           MAX_LINE_NUM,
+                           )
+
+
+class EnteredLine(NamedTuple):
+    """A line of the program as typed, with its tokenized bytes and
+       checksum
+    """
+
+    line_num: int
+    listing: str  # line as typed, for saving the source
+    byte_list: bytes
+    checksum: str
+
+
+class TypedProgram:
+    """Lines of a program entered in any order, kept by line number
+
+    Entering a line only tokenizes and checksums that line, so the time per
+    entry does not grow with the program.  The program image is built from
+    the lines in line number order when it is saved.
+    """
+
+    def __init__(self, source, load_addr=0x0801):
+        self.source = source
+        self.load_addr = load_addr
+        self.lines = {}
+        self.modified = False
+
+    def __len__(self):
+        return len(self.lines)
+
+    def enter(self, line):
+        """Add, replace, or delete a line as BASIC does when one is typed
+
+        Args:
+            line (str): Line as typed, starting with its line number.  A
+                line number alone deletes that line.
+
+        Returns:
+            EnteredLine or None: The line entered, or None if a line was
+                deleted
+
+        Raises:
+            ValueError: If the line has no line number or one past
+                MAX_LINE_NUM, has a loose brace or a character with no
+                Commodore equivalent, or a line to delete is not in the
+                program
+        """
+
+        record = parse_source_line(line.lower())
+        if record.line_num is None:
+            raise ValueError('Line should start with a line number')
+        if record.line_num > MAX_LINE_NUM:
+            raise ValueError('Line numbers should be at most '
+                             f'{MAX_LINE_NUM}')
+        if not record.text:
+            if self.lines.pop(record.line_num, None) is None:
+                raise ValueError(f'Line {record.line_num} is not in the '
+                                 'program')
+            self.modified = True
+            return None
+
+        try:
+            (byte_list, checksum) = convert_line(record.line_num,
+                                                 record.text, self.source)
+        except ValueError:
+            column = bad_char_column(record)
+            if column is None:
+                raise
+            raise ValueError(f'Character "{line[column - 1]}" at column '
+                             f'{column} has no Commodore equivalent - type '
+                             'it as printed in the magazine') from None
+        if byte_list is None:
+            raise ValueError('Loose brace/bracket at column '
+                             f'{loose_brace_column(record)} - special '
+                             'characters should be enclosed in '
+                             'braces/brackets')
+        entered = EnteredLine(record.line_num, line.strip(), bytes(byte_list),
+                              checksum)
+        self.lines[record.line_num] = entered
+        self.modified = True
+        return entered
+
+    def ordered(self, first=0, last=None):
+        """Lines in line number order, optionally within a range
+
+        Args:
+            first (int): Lowest line number to include
+            last (int): Highest line number to include, or None for all
+
+        Returns:
+            list: EnteredLine tuples
+        """
+
+        return [self.lines[line_num] for line_num in sorted(self.lines)
+                if line_num >= first and (last is None or line_num <= last)]
+
+    @property
+    def checksums(self):
+        """Tuples of (line number, checksum) in line number order"""
+        return [(line.line_num, line.checksum) for line in self.ordered()]
+
+    def build(self):
+        """Link the lines into a program image
+
+        Returns:
+            PrgBuilder: Builder holding the program image
+        """
+
+        prg = PrgBuilder(self.load_addr)
+        for line in self.ordered():
+            prg.add_line(line.line_num, line.byte_list)
+        return prg
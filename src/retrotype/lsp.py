@@ -0,0 +1,533 @@
+"""
+Language server for magazine type-in source files, speaking the Language
+Server Protocol over stdin and stdout.  Shows each line's checksum as an
+inlay hint and reports loose braces, line number errors, and checksums that
+do not match a '.ref' file as diagnostics while the source is edited.
+"""
+
+import argparse
+from bisect import bisect_left
+import json
+from os import path
+import re
+import sys
+from typing import NamedTuple
+from urllib.parse import unquote, urlparse
+
+try:
+    from retrotype.retrotype import (parse_source_line,
+                                     convert_line,
+                                     loose_brace_column,
+                                     bad_char_column,
+                                     read_ref_file,
+                                     )
+except ImportError:  # Case for direct python execution
+    from retrotype import (parse_source_line,
+                           convert_line,
+                           loose_brace_column,
+                           bad_char_column,
+                           read_ref_file,
+                           )
+
+# diagnostic severities and text document sync kinds, see the protocol
+_ERROR = 1
+_WARNING = 2
+_INFORMATION = 3
+_SYNC_INCREMENTAL = 2
+
+# line ends the protocol counts when numbering lines
+_LINE_ENDS = re.compile('\r\n|\r|\n')
+
+
+class LineInfo(NamedTuple):
+    """A line of the source as last converted, with columns counted in
+       UTF-16 code units as the protocol counts them
+    """
+
+    line_num: int  # None if the line does not start with a line number
+    column: int  # column of the line number, counting from 1
+    digits: int  # number of characters in the line number
+    checksum: str  # None if the line has no line number or an error
+    brace_column: int  # column of a loose brace, from 1, or None
+    char_column: int = None  # column of a character with no Commodore
+    # byte value, from 1, or None
+    char: str = None  # the character with no Commodore byte value
+
+
+def analyze_line(line, source):
+    """Tokenize and checksum one line of source text
+
+    Args:
+        line (str): Text of the line without its line end
+        source (str): Magazine source format
+
+    Returns:
+        LineInfo or None: The line's checksum or error, or None for a blank
+            line
+    """
+
+    if not line.strip():
+        return None
+    record = parse_source_line(line.lower())
+    if record.line_num is None:
+        return LineInfo(None, record.column, 0, None, None)
+    number = line[record.column - 1:]
+    digits = len(number) - len(number.lstrip('0123456789'))
+    column = _utf16_column(line, record.column)
+    char_column = bad_char_column(record)
+    if char_column is not None:
+        return LineInfo(record.line_num, column, digits, None, None,
+                        _utf16_column(line, char_column),
+                        line[char_column - 1])
+    (byte_list, checksum) = convert_line(record.line_num, record.text, source)
+    if byte_list is None:
+        return LineInfo(record.line_num, column, digits, None,
+                        _utf16_column(line, loose_brace_column(record)))
+    return LineInfo(record.line_num, column, digits, checksum, None)
+
+
+class SourceDocument:
+    """Text of an open source file with the conversion of each of its lines
+
+    Edits replace ranges of lines, and only the lines in an edited range are
+    tokenized and checksummed again.  Diagnostics that depend on neighbouring
+    lines, such as the line number order, are found from the stored results
+    without converting any line.
+    """
+
+    def __init__(self, text, source, ref_codes=None):
+        self.source = source
+        self.ref_codes = ref_codes
+        self.lines = []
+        self.infos = []
+        self.converted = 0  # lines converted by the last edit
+        self._encoded = {}  # row inputs -> encoded diagnostics template
+        self._load(text)
+
+    def _load(self, text):
+        self.lines = _LINE_ENDS.split(text)
+        self.infos = [analyze_line(line, self.source) for line in self.lines]
+        self.converted = len(self.lines)
+
+    def apply_change(self, change):
+        """Apply one content change from a didChange notification
+
+        Args:
+            change (dict): Change with the new text and, for an incremental
+                change, the range of the text it replaces
+        """
+
+        if 'range' not in change:
+            self._load(change['text'])
+            return
+
+        start = change['range']['start']
+        end = change['range']['end']
+        last_row = len(self.lines) - 1
+        (start_row, end_row) = (min(start['line'], last_row),
+                                min(end['line'], last_row))
+        first = self.lines[start_row]
+        last = self.lines[end_row]
+        text = (first[:_index(first, start['character'])] + change['text']
+                + last[_index(last, end['character']):])
+        new_lines = _LINE_ENDS.split(text)
+        # convert before changing anything, so the lines and their
+        # conversions stay in step
+        new_infos = [analyze_line(line, self.source) for line in new_lines]
+        self.lines[start_row:end_row + 1] = new_lines
+        self.infos[start_row:end_row + 1] = new_infos
+        self.converted = len(new_lines)
+
+    def diagnostics(self):
+        """Diagnostics for every line of the document
+
+        Returns:
+            list: Diagnostic dicts in line order
+        """
+
+        return json.loads(self.diagnostics_json())
+
+    def diagnostics_json(self):
+        """Diagnostics for every line of the document as a JSON array
+
+        The diagnostics of each row are encoded once, with a placeholder for
+        the row, and reused until the line, its neighbouring line number, or
+        its reference checksum changes.  An edit, even one that moves the
+        rows after it, only encodes the diagnostics of the edited lines.
+
+        Returns:
+            str: JSON text of the array of diagnostics in line order
+        """
+
+        ref_codes = self.ref_codes
+        missing = []
+        if ref_codes:
+            seen = {info.line_num for info in self.infos
+                    if info is not None}
+            missing = sorted(line_num for line_num in ref_codes
+                             if line_num not in seen)
+
+        parts = []
+        encoded = {}
+        prev_num = 0
+        last_row = 0
+        for (row, info) in enumerate(self.infos):
+            if info is None:
+                continue
+            last_row = row
+            missing_here = ()
+            ref_code = None
+            if info.line_num is not None:
+                if missing and missing[0] < info.line_num:
+                    # report reference lines missing before this line here
+                    count = bisect_left(missing, info.line_num)
+                    missing_here = tuple(missing[:count])
+                    del missing[:count]
+                if ref_codes is not None:
+                    ref_code = ref_codes.get(info.line_num, '')
+            key = (info, _utf16_len(self.lines[row]), prev_num,
+                   missing_here, ref_code)
+            if info.line_num is not None:
+                prev_num = info.line_num
+
+            template = self._encoded.get(key)
+            if template is None:
+                template = _encode_template(_row_diagnostics(*key))
+            encoded[key] = template
+            if template[0]:
+                parts.append(template[0] % ((row,) * template[1]))
+        self._encoded = encoded
+
+        if missing:
+            line = self.lines[last_row]
+            parts.append(json.dumps(
+                _diagnostic(last_row, 0, _utf16_len(line), _INFORMATION,
+                            _missing_message(missing)),
+                separators=(',', ':')))
+        return f'[{",".join(parts)}]'
+
+    def inlay_hints(self, start_row=0, end_row=None):
+        """Checksum hints at the end of each line in a range of rows
+
+        Args:
+            start_row (int): First row to give hints for
+            end_row (int): Last row to give hints for, or None for the end
+                of the document
+
+        Returns:
+            list: InlayHint dicts
+        """
+
+        if end_row is None:
+            end_row = len(self.lines) - 1
+        hints = []
+        for row in range(start_row, min(end_row, len(self.lines) - 1) + 1):
+            info = self.infos[row]
+            if info is None or info.checksum is None:
+                continue
+            hints.append({'position': {'line': row,
+                                       'character': _utf16_len(
+                                           self.lines[row])},
+                          'label': info.checksum,
+                          'paddingLeft': True})
+        return hints
+
+
+def _row_diagnostics(info, line_length, prev_num, missing, ref_code):
+    """Diagnostics for one row of a document, given as row -1 for
+       _encode_template()
+
+    Args:
+        info (LineInfo): Conversion of the line
+        line_length (int): Length of the line's text in UTF-16 code units
+        prev_num (int): Line number of the line before, or 0 for the first
+        missing (tuple): Reference line numbers missing before this line
+        ref_code (str): Reference checksum of the line, '' if the reference
+            file does not list it, or None if there is no reference file
+
+    Returns:
+        list: Diagnostic dicts
+    """
+
+    row = -1
+    if info.line_num is None:
+        return [_diagnostic(row, info.column - 1, line_length, _ERROR,
+                            'Line should start with a line number')]
+
+    diagnostics = []
+    num_range = (row, info.column - 1, info.column - 1 + info.digits)
+    if missing:
+        diagnostics.append(_diagnostic(*num_range, _INFORMATION,
+                                       _missing_message(missing)))
+    if not prev_num < info.line_num:
+        diagnostics.append(_diagnostic(
+            *num_range, _ERROR,
+            f'Line {info.line_num} follows line {prev_num} - lines should '
+            'be in sequential order'))
+    if info.brace_column is not None:
+        diagnostics.append(_diagnostic(
+            row, info.brace_column - 1, info.brace_column, _ERROR,
+            'Loose brace/bracket - special characters should be enclosed in '
+            'braces/brackets'))
+    elif info.char_column is not None:
+        diagnostics.append(_diagnostic(
+            row, info.char_column - 1,
+            info.char_column - 1 + _utf16_len(info.char), _ERROR,
+            f'Character "{info.char}" has no Commodore equivalent - type it '
+            'as printed in the magazine'))
+    elif ref_code == '':
+        diagnostics.append(_diagnostic(
+            *num_range, _WARNING,
+            f'Line {info.line_num} is not in the reference file'))
+    elif ref_code is not None and ref_code != info.checksum:
+        diagnostics.append(_diagnostic(
+            *num_range, _WARNING,
+            f'Checksum {info.checksum} does not match reference {ref_code}'))
+    return diagnostics
+
+
+def _encode_template(diagnostics):
+    """JSON text of the diagnostics of a row given as row -1, with '%d' in
+       place of the row for filling in with the % operator, and the number
+       of places the row goes
+    """
+    text = ','.join(json.dumps(diagnostic, separators=(',', ':'))
+                    for diagnostic in diagnostics)
+    text = text.replace('%', '%%').replace('"line":-1', '"line":%d')
+    return (text, text.count('"line":%d'))
+
+
+def _diagnostic(row, start, end, severity, message):
+    return {'range': {'start': {'line': row, 'character': start},
+                      'end': {'line': row, 'character': end}},
+            'severity': severity,
+            'source': 'retrotype',
+            'message': message}
+
+
+def _missing_message(line_nums):
+    return ('Reference lines missing: '
+            f'{", ".join(str(num) for num in line_nums)}')
+
+
+def _index(line, character):
+    """String index of a protocol position, counted in UTF-16 code units"""
+    if len(line.encode('utf-16-le')) == 2 * len(line):
+        return min(character, len(line))
+    units = 0
+    for (index, char) in enumerate(line):
+        if units >= character:
+            return index
+        units += 2 if ord(char) > 0xffff else 1
+    return len(line)
+
+
+def _utf16_len(line):
+    if line.isascii():
+        return len(line)
+    return len(line.encode('utf-16-le')) // 2
+
+
+def _utf16_column(line, column):
+    """Protocol column of a string column, both counting from 1"""
+    return _utf16_len(line[:column - 1]) + 1
+
+
+def ref_codes_for(uri):
+    """Reference checksums from the '.ref' file beside a source file
+
+    Args:
+        uri (str): Document URI of the source file
+
+    Returns:
+        dict or None: Reference codes keyed by line number, or None if there
+            is no readable reference file
+    """
+
+    parsed = urlparse(uri)
+    if parsed.scheme != 'file':
+        return None
+    ref_file = f'{path.splitext(unquote(parsed.path))[0]}.ref'
+    try:
+        return read_ref_file(ref_file)
+    except (IOError, ValueError):
+        return None
+
+
+class LanguageServer:
+    """Reads protocol messages from a binary input stream, keeping the open
+       documents up to date and writing responses and diagnostics to a
+       binary output stream
+    """
+
+    def __init__(self, reader, writer, source='ahoy2'):
+        self.reader = reader
+        self.writer = writer
+        self.source = source
+        self.documents = {}
+        self.shutdown_requested = False
+        self.handlers = {
+            'initialize': self.initialize,
+            'shutdown': self.shutdown,
+            'textDocument/didOpen': self.did_open,
+            'textDocument/didChange': self.did_change,
+            'textDocument/didSave': self.did_save,
+            'textDocument/didClose': self.did_close,
+            'textDocument/inlayHint': self.inlay_hint,
+        }
+
+    def serve(self):
+        """Handle messages until the exit notification or end of input
+
+        Returns:
+            int: Exit status, 0 if shutdown was requested before exiting
+        """
+
+        while True:
+            message = self.read_message()
+            if message is None or message.get('method') == 'exit':
+                return 0 if self.shutdown_requested else 1
+            self.handle(message)
+
+    def read_message(self):
+        """Read one message, or return None at the end of input"""
+
+        length = None
+        while True:
+            header = self.reader.readline()
+            if not header:
+                return None
+            header = header.strip()
+            if not header:
+                break
+            (name, _, value) = header.decode('ascii').partition(':')
+            if name.lower() == 'content-length':
+                length = int(value)
+        if length is None:
+            return {}
+        try:
+            return json.loads(self.reader.read(length).decode('utf-8'))
+        except ValueError:
+            self.send({'id': None,
+                       'error': {'code': -32700, 'message': 'Parse error'}})
+            return {}
+
+    def send(self, message):
+        message['jsonrpc'] = '2.0'
+        self.write(json.dumps(message, separators=(',', ':')))
+
+    def write(self, text):
+        body = text.encode('utf-8')
+        self.writer.write(b'Content-Length: %d\r\n\r\n' % len(body) + body)
+        self.writer.flush()
+
+    def handle(self, message):
+        """Dispatch a request or notification to its handler, answering
+           requests with the result or an error
+        """
+
+        method = message.get('method')
+        handler = self.handlers.get(method)
+        if handler is None:
+            if 'id' in message:
+                self.send({'id': message['id'],
+                           'error': {'code': -32601, 'message':
+                                     f'Method not found: {method}'}})
+            return
+        try:
+            result = handler(message.get('params') or {})
+        except (KeyError, TypeError, ValueError) as error:
+            if 'id' in message:
+                self.send({'id': message['id'],
+                           'error': {'code': -32602,
+                                     'message': f'Invalid params: {error}'}})
+            else:
+                self.send({'method': 'window/logMessage',
+                           'params': {'type': _ERROR, 'message':
+                                      f'Invalid {method} params: {error}'}})
+            return
+        if 'id' in message:
+            self.send({'id': message['id'], 'result': result})
+
+    def initialize(self, params):
+        options = params.get('initializationOptions') or {}
+        if options.get('source') in ('ahoy1', 'ahoy2', 'ahoy3'):
+            self.source = options['source']
+        return {'capabilities': {
+                    'textDocumentSync': {'openClose': True,
+                                         'change': _SYNC_INCREMENTAL,
+                                         'save': True},
+                    'inlayHintProvider': True},
+                'serverInfo': {'name': 'retrotype-lsp'}}
+
+    def shutdown(self, params):
+        self.shutdown_requested = True
+        return None
+
+    def did_open(self, params):
+        item = params['textDocument']
+        self.documents[item['uri']] = SourceDocument(
+            item['text'], self.source, ref_codes_for(item['uri']))
+        self.publish(item['uri'])
+
+    def did_change(self, params):
+        uri = params['textDocument']['uri']
+        document = self.documents.get(uri)
+        if document is None:
+            return
+        for change in params['contentChanges']:
+            document.apply_change(change)
+        self.publish(uri)
+
+    def did_save(self, params):
+        # a saved reference file updates the checks of its source file
+        uri = params['textDocument']['uri']
+        for (doc_uri, document) in self.documents.items():
+            if path.splitext(doc_uri)[0] == path.splitext(uri)[0]:
+                document.ref_codes = ref_codes_for(doc_uri)
+                self.publish(doc_uri)
+
+    def did_close(self, params):
+        uri = params['textDocument']['uri']
+        if self.documents.pop(uri, None) is not None:
+            self.send({'method': 'textDocument/publishDiagnostics',
+                       'params': {'uri': uri, 'diagnostics': []}})
+
+    def inlay_hint(self, params):
+        document = self.documents.get(params['textDocument']['uri'])
+        if document is None:
+            return []
+        line_range = params['range']
+        return document.inlay_hints(line_range['start']['line'],
+                                    line_range['end']['line'])
+
+    def publish(self, uri):
+        # the diagnostics arrive encoded, so the message is put together
+        # around them rather than encoded again
+        self.write('{"jsonrpc":"2.0","method":'
+                   '"textDocument/publishDiagnostics","params":{"uri":'
+                   f'{json.dumps(uri)},"diagnostics":'
+                   f'{self.documents[uri].diagnostics_json()}}}}}')
+
+
+def main(argv=None):
+    """Run the language server on stdin and stdout"""
+
+    parser = argparse.ArgumentParser(
+        description="Language server for Commodore BASIC type-in programs, "
+                    "speaking the Language Server Protocol over stdin and "
+                    "stdout.")
+    parser.add_argument(
+        "-s", "--source", choices=["ahoy1", "ahoy2", "ahoy3"], type=str,
+        nargs=1, required=False, metavar="source_format", default=["ahoy2"],
+        help="Magazine source for checksums, unless the client gives one "
+             "as the 'source' initialization option (default: ahoy2)")
+    args = parser.parse_args(argv)
+
+    server = LanguageServer(sys.stdin.buffer, sys.stdout.buffer,
+                            args.source[0])
+    return server.serve()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
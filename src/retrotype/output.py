@@ -0,0 +1,49 @@
+"""
+Puts output files written under a temporary name in place, shared by
+retrotype_cli and retrotype.client.  Only needs the standard library, so the
+client can use it without loading the conversion tables.
+"""
+
+from os import link, path, replace
+
+
+def confirm_overwrite(filename):
+
+    overwrite = input(f'Output file "{filename}" already exists. '
+                      'Overwrite? (Y = yes) ')
+    return overwrite.lower() == 'y'
+
+
+def place_binary(temp_filename, filename, confirm=True):
+    """Put a binary file already written under a temporary name in place,
+       confirming before replacing an existing file as write_binary() does
+
+    Args:
+        temp_filename (str): The file name the binary was streamed to, in
+            the same directory; it is left for the caller to remove if it
+            is not moved into place
+        filename (str): The file name of the file to write as binary
+        confirm (bool): Whether to ask before replacing an existing file,
+            e.g. False when standard input is not free for the answer
+
+    Returns:
+        None: Implicit return
+    """
+    print(f'Writing binary output file "{filename}"...\n')
+
+    try:
+        # a link only succeeds if there is no file to replace
+        link(temp_filename, filename)
+    except OSError as error:
+        # file systems without hard links (such as FAT or SMB) cannot tell,
+        # so check for the file before replacing it
+        exists = isinstance(error, FileExistsError) or path.exists(filename)
+        if exists and confirm:
+            if not confirm_overwrite(filename):
+                print(f'File "{filename}" not overwritten.\n')
+                return
+            # announced again once confirmed, as write_binary() does
+            print(f'Writing binary output file "{filename}"...\n')
+        replace(temp_filename, filename)
+
+    print(f'File "{filename}" written successfully.\n')
@@ -4,15 +4,28 @@ checks for errors, and converts to an executable file for use with an
 emulator or on original hardware.
 """
 
+from functools import lru_cache
+from io import StringIO
 from os import remove
 import re
 import sys
+from typing import NamedTuple
 
-# import char_maps.py: Module containing Commodore to magazine conversion maps
+# import tables.py: Lookup tables derived from the Commodore to magazine
+# conversion maps in char_maps.py
 try:
-    from retrotype import char_maps as char_maps
+    from retrotype.tables import load_tables
 except ImportError:  # Case for direct python execution
-    import char_maps
+    from tables import load_tables
+
+# import output.py: Asks before replacing an existing output file
+try:
+    from retrotype.output import confirm_overwrite
+except ImportError:  # Case for direct python execution
+    from output import confirm_overwrite
+
+(_TOKEN_TRIE, _AHOY_TO_PETCAT, _AHOY_TOKENS, _LISTING_TEXT,
+ _KEYWORD_TEXT) = load_tables()
 
 
 def read_file(filename):
@@ -37,23 +50,309 @@ def read_file(filename):
         return lower_lines
 
 
+class SourceLine(NamedTuple):
+    """A line of magazine source, split once into its line number and text"""
+
+    line_num: int  # None if the line does not start with a line number
+    text: str  # text after the line number with whitespace stripped
+    row: int  # line of the source file, counting from 1 (0 if unknown)
+    column: int  # column of the first character of the line, from 1
+    text_column: int  # column of the first character of the text, from 1
+
+
+def parse_source_line(line, row=0):
+    """Split a line of magazine source into a SourceLine record
+
+    Args:
+        line (str): Text of the line as read from the source file
+        row (int): Line of the source file the text came from, or 0 if not
+            known
+
+    Returns:
+        SourceLine: Line number, remaining text, and source position
+    """
+
+    start = len(line) - len(line.lstrip())
+    end = start
+    while end < len(line) and line[end].isdigit():
+        end += 1
+    if end == start:
+        return SourceLine(None, line[start:].rstrip(), row, start + 1,
+                          start + 1)
+    text_start = end + len(line[end:]) - len(line[end:].lstrip())
+    return SourceLine(int(line[start:end]), line[text_start:].rstrip(), row,
+                      start + 1, text_start + 1)
+
+
+def read_source_lines(filename):
+    """Opens and reads magazine source into a SourceLine record for each
+       non-blank line, converted to lowercase, keeping its source position
+
+    Args:
+        filename (str): The file name of the magazine source file
+
+    Returns:
+        list: SourceLine records for each non-blank line of the source file
+    """
+
+    with open(filename) as file:
+        return list(iter_source_lines(file))
+
+
+def iter_source_lines(lines):
+    """Generate a SourceLine record for each non-blank line of magazine
+       source, converted to lowercase, one line at a time
+
+    Args:
+        lines (iterable): Lines of source text, e.g. an open source file
+
+    Yields:
+        SourceLine: Record for each non-blank line, with its source row
+    """
+
+    for (row, line) in enumerate(lines, 1):
+        if line.strip():
+            yield parse_source_line(line.lower(), row)
+
+
+def read_ref_file(filename):
+    """Opens and reads a reference file of magazine line numbers and
+       checksums in the same format as the '.chk' output file
+
+    A reference file may list every line of the program or only a sample
+    of lines.  Blank lines and the 'Lines:' count line are skipped.
+
+    Args:
+        filename (str): The file name of the reference file
+
+    Returns:
+        dict: Two letter checksum code (str) keyed by line number (int)
+
+    Raises:
+        ValueError: If a line is not a line number and a checksum code
+    """
+
+    with open(filename) as file:
+        return parse_ref_lines(file)
+
+
+def parse_ref_lines(lines):
+    """Parse the lines of a reference file, as read_ref_file() does
+
+    Args:
+        lines (iterable): Lines of reference file text
+
+    Returns:
+        dict: Two letter checksum code (str) keyed by line number (int)
+
+    Raises:
+        ValueError: If a line is not a line number and a checksum code
+    """
+
+    ref_codes = {}
+    for (index, line) in enumerate(lines, 1):
+        fields = line.split()
+        if not fields or fields[0].lower() == 'lines:':
+            continue
+        if (len(fields) != 2 or not fields[0].isdigit()
+                or len(fields[1]) != 2 or not fields[1].isalpha()):
+            raise ValueError(f'Reference file line {index} should be a '
+                             f'line number and checksum: {line.strip()}')
+        ref_codes[int(fields[0])] = fields[1].upper()
+    return ref_codes
+
+
+class RefComparison(NamedTuple):
+    """Result of checking line checksums against a reference file"""
+
+    mismatched: list  # (line number, checksum, reference checksum) tuples
+    missing: list  # line numbers in the reference but not the program
+    extra: list  # line numbers in the program but not the reference
+    line_count: int
+    ref_line_count: int
+    sample: bool = False  # reference lists only some lines, so lines not
+    # in it are unchecked rather than extra
+
+    @property
+    def ok(self):
+        """True if every line matches and no line is missing or extra"""
+        return not (self.mismatched or self.missing
+                    or (self.extra and not self.sample))
+
+
+def compare_checksums(ahoy_checksums, ref_codes, sample=False):
+    """Check line checksums against reference checksums in one pass
+
+    Args:
+        ahoy_checksums (iterable): Tuples of (line number, checksum) for each
+            line in program order, e.g. as each line is computed
+        ref_codes (dict): Reference checksum codes keyed by line number
+        sample (bool): True if the reference may list only a sample of the
+            lines, as for source format 'auto', so lines not in it are not
+            reported as extra
+
+    Returns:
+        RefComparison: Mismatched, missing, and extra (or unchecked, for a
+            sample) lines and line counts
+    """
+
+    mismatched = []
+    extra = []
+    seen = set()
+    for (line_num, code) in ahoy_checksums:
+        seen.add(line_num)
+        ref_code = ref_codes.get(line_num)
+        if ref_code is None:
+            extra.append(line_num)
+        elif ref_code != code:
+            mismatched.append((line_num, code, ref_code))
+    missing = sorted(line_num for line_num in ref_codes
+                     if line_num not in seen)
+    return RefComparison(mismatched, missing, extra, len(seen),
+                         len(ref_codes), sample)
+
+
+class PrgBuilder:
+    """Builds a Commodore program file image one tokenized line at a time
+
+    The load address, each line's link address, line number, and token
+    bytes, and the end of program marker are appended straight into a
+    single bytearray.  The image always ends with the end of program marker;
+    adding a line overwrites it with the new line's link address, which is
+    patched in place once the line's length is known.
+
+    Given a file, completed lines are written out whenever the buffer
+    reaches buffer_size bytes, so a program of any size is built in bounded
+    memory.  Link addresses past the end of memory wrap around to 16 bits.
+    """
+
+    def __init__(self, load_addr=0x0801, file=None, buffer_size=65536):
+        self.load_addr = load_addr
+        self.file = file
+        self.buffer_size = buffer_size
+        self.data = bytearray(load_addr.to_bytes(2, 'little'))
+        self.data += b'\x00\x00'
+        self.written = 0
+        self.line_count = 0
+
+    @property
+    def next_addr(self):
+        """Memory address the next line will be loaded at"""
+        return self.load_addr + self.written + len(self.data) - 4
+
+    def add_line(self, line_num, byte_list):
+        """Append a tokenized line to the program
+
+        Args:
+            line_num (int): BASIC line number
+            byte_list (bytes-like or list): Tokenized bytes of the line,
+                including the trailing 0
+
+        Returns:
+            int: Link address of the line, the address of the next line
+        """
+        start = len(self.data) - 2
+        self.data += line_num.to_bytes(2, 'little')
+        self.data.extend(byte_list)
+        self.data += b'\x00\x00'
+        link_addr = self.next_addr
+        self.data[start:start + 2] = (link_addr & 0xffff).to_bytes(2,
+                                                                   'little')
+        self.line_count += 1
+        if self.file is not None and len(self.data) >= self.buffer_size:
+            self.flush()
+        return link_addr
+
+    def add_chunk(self, blob, sizes):
+        """Append a chunk of lines tokenized elsewhere, e.g. by
+           tokenize_chunk() in a worker process, linking them with a running
+           sum over their lengths
+
+        Args:
+            blob (bytes-like): Line number and tokenized bytes of each line,
+                back to back
+            sizes (list): Length of each line's part of the blob
+
+        Returns:
+            int: Link address of the last line, the address of the next line
+        """
+        data = self.data
+        del data[-2:]  # the end marker becomes the first line's link address
+        link_addr = self.next_addr + 2
+        offset = 0
+        with memoryview(blob) as view:
+            for size in sizes:
+                link_addr += size + 2
+                data += (link_addr & 0xffff).to_bytes(2, 'little')
+                data += view[offset:offset + size]
+                offset += size
+        data += b'\x00\x00'
+        self.line_count += len(sizes)
+        if self.file is not None and len(data) >= self.buffer_size:
+            self.flush()
+        return link_addr
+
+    def truncate(self, offset, line_count):
+        """Drop the lines from a byte offset of the image on, e.g. to relink
+           the lines after an edit, ending the image there
+
+        Args:
+            offset (int): Offset of the link address of the first line to
+                drop, not yet written to a file
+            line_count (int): Number of lines left in the image
+        """
+        del self.data[offset:]
+        self.data += b'\x00\x00'
+        self.line_count = line_count
+
+    def flush(self):
+        """Write the completed lines to the file, keeping back the end of
+           program marker that the next line will overwrite
+        """
+        with memoryview(self.data) as view:
+            self.file.write(view[:-2])
+        self.written += len(self.data) - 2
+        del self.data[:-2]
+
+    def finish(self):
+        """Write the rest of the image, ending with the end of program
+           marker, to the file
+        """
+        with memoryview(self.data) as view:
+            self.file.write(view)
+        self.written += len(self.data)
+        self.data = bytearray()
+
+    def image(self):
+        """Program file image not yet written to a file, ready to write
+
+        Returns:
+            memoryview: View of the image bytes; release it before adding
+                more lines
+        """
+        return memoryview(self.data)
+
+
 def write_binary(filename, int_list):
     """Write binary file readable on Commodore computers or emulators
 
     Args:
         filename (str): The file name of the file to write as binary
-        int_list (list): List of integers to convert to binary bytes and
-            output write to file
+        int_list (bytes-like or list): Program bytes, e.g. from
+            PrgBuilder.image(), or a list of integers to convert to bytes,
+            written to the file in a single write
 
     Returns:
         None: Implicit return
     """
     print(f'Writing binary output file "{filename}"...\n')
 
+    if not isinstance(int_list, (bytes, bytearray, memoryview)):
+        int_list = bytes(int_list)
+
     try:
         with open(filename, "xb") as file:
-            for byte in int_list:
-                file.write(byte.to_bytes(1, byteorder='big'))
+            file.write(int_list)
             print(f'File "{filename}" written successfully.\n')
 
     except FileExistsError:
@@ -64,11 +363,247 @@ def write_binary(filename, int_list):
             print(f'File "{filename}" not overwritten.\n')
 
 
-def confirm_overwrite(filename):
+def tokenize_chunk(records, source):
+    """Tokenize and checksum a chunk of lines on their own, as a worker
+       process can, leaving their link addresses to PrgBuilder.add_chunk()
+
+    Args:
+        records (list): SourceLine records for consecutive program lines
+        source (str): Magazine source format, with 'auto' giving the
+            checksums of every Ahoy format
+
+    Returns:
+        tuple consisting of:
+            blob (bytes): Line number and tokenized bytes of each line up to
+                any loose brace error, back to back
+            sizes (list): Length of each line's part of the blob
+            checksums (list): Tuples of (line number, checksum), or of (line
+                number, dict of checksums) for 'auto', for each line
+            error (SourceLine or None): The line with a loose brace or a
+                character with no Commodore equivalent, if any
+    """
+
+    blob = bytearray()
+    sizes = []
+    checksums = []
+    for record in records:
+        line_num = record.line_num
+        try:
+            (byte_list, checksum) = convert_line(line_num, record.text,
+                                                 source)
+        except ValueError:
+            if bad_char_column(record) is None:
+                raise
+            byte_list = None
+        if byte_list is None:
+            return (bytes(blob), sizes, checksums, record)
+        blob += line_num.to_bytes(2, 'little')
+        blob += byte_list
+        sizes.append(len(byte_list) + 2)
+        checksums.append((line_num, checksum))
+    return (bytes(blob), sizes, checksums, None)
+
+
+def convert_line(line_num, text, source):
+    """Tokenize and checksum the text of one line
+
+    Args:
+        line_num (int): Line number, part of the 'ahoy3' checksum
+        text (str): Text of the line after the line number
+        source (str): Magazine source format, with 'auto' giving the
+            checksums of every Ahoy format
+
+    Returns:
+        tuple consisting of:
+            tokenized bytes (bytearray or None): Bytes for the text followed
+                by the 0 terminator, or None if an Ahoy line has a loose brace
+            checksum (str or dict or None): Checksum code, or dict of codes
+                keyed by source format for 'auto'
+    """
+
+    if source[:4] in ('ahoy', 'auto'):
+        # convert Ahoy special characters straight to tokenized bytes while
+        # checking for loose brackets/braces
+        byte_list = scan_ahoy_text(text)
+        if byte_list is None:
+            return (None, None)
+    else:
+        byte_list = scan_line(text)
+    if source == 'auto':
+        return (byte_list, fused_checksums(line_num, byte_list))
+    return (byte_list, line_checksum(source, line_num, byte_list))
+
+
+class LineCache:
+    """Bounded least recently used memo of convert_line() results, for the
+       lines repeated within and across programs: DATA lines, loaders, and
+       PRINT lines
+
+    Results are keyed by the line text and source format, and also by the
+    line number for the formats whose checksum includes it ('ahoy3' and
+    'auto').  Tokenized bytes are returned as immutable bytes since they
+    are shared between calls.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._convert = lru_cache(maxsize)(_frozen_convert_line)
+
+    def convert(self, line_num, text, source):
+        """Tokenize and checksum one line as convert_line() does"""
+        if source not in ('ahoy3', 'auto'):
+            line_num = 0  # not part of the checksum, so not of the key
+        return self._convert(line_num, text, source)
+
+    @property
+    def hits(self):
+        return self._convert.cache_info().hits
+
+    @property
+    def misses(self):
+        return self._convert.cache_info().misses
+
+
+def _frozen_convert_line(line_num, text, source):
+    (byte_list, checksum) = convert_line(line_num, text, source)
+    if byte_list is not None:
+        byte_list = bytes(byte_list)
+    return (byte_list, checksum)
+
+
+class ConversionError(ValueError):
+    """A program that cannot be converted
+
+    Attributes:
+        record (SourceLine): The line at fault, or None if the error is not
+            in one line
+    """
+
+    def __init__(self, message, record=None):
+        super().__init__(message)
+        self.record = record
+
+
+class LineNumberError(ConversionError):
+    """A line without a line number, or with one out of sequence"""
+
+
+class LooseBraceError(ConversionError):
+    """A line with an unmatched brace or bracket around a special character
+
+    Attributes:
+        column (int): Column of the loose brace in the source line, from 1
+    """
+
+    def __init__(self, record):
+        self.column = loose_brace_column(record)
+        super().__init__(f"Loose brace/bracket error in line: "
+                         f"{record.line_num}{_source_pos(record, self.column)}"
+                         " - special characters should be enclosed in "
+                         "braces/brackets.", record)
+
+
+class BadCharError(ConversionError):
+    """A line with a character that has no Commodore equivalent, such as a
+    typographic quote pasted in from a web page
+
+    Attributes:
+        column (int): Column of the character in the source line, from 1
+    """
+
+    def __init__(self, record):
+        self.column = bad_char_column(record)
+        char = record.text[self.column - record.text_column]
+        super().__init__(f'Character "{char}" has no Commodore equivalent in '
+                         f'line: {record.line_num}'
+                         f'{_source_pos(record, self.column)} - type it as '
+                         'printed in the magazine.', record)
+
 
-    overwrite = input(f'Output file "{filename}" already exists. '
-                      'Overwrite? (Y = yes) ')
-    return overwrite.lower() == 'y'
+class Conversion(NamedTuple):
+    """A converted program"""
+
+    prg: bytes  # program file image
+    checksums: list  # (line number, checksum) tuples in program order
+    source: str  # magazine source format, as detected for 'auto'
+    comparison: RefComparison  # None if no reference codes were given
+
+    @property
+    def wraps(self):
+        """True if the program extends past the end of memory, so that its
+        line link addresses wrap around
+        """
+        load_addr = int.from_bytes(self.prg[:2], 'little')
+        return load_addr + len(self.prg) - 4 > 0xffff
+
+
+def convert(text, source='ahoy2', load_addr=0x0801, ref_codes=None):
+    """Convert the text of a magazine source file in memory, without
+       reading or writing files, printing, or exiting
+
+    Only the arguments and local state are used, so conversions may run at
+    the same time in several threads.
+
+    Args:
+        text (str): Magazine source text, one program line per line
+        source (str): Magazine source format ('ahoy1', 'ahoy2', 'ahoy3', or
+            'auto' to detect it from ref_codes)
+        load_addr (int): Load address of the program
+        ref_codes (dict): Reference checksum codes keyed by line number to
+            compare the line checksums to, as from parse_ref_lines(), or
+            None
+
+    Returns:
+        Conversion: Program file image, line checksums, source format, and
+            reference comparison
+
+    Raises:
+        LineNumberError: For a line without a line number or out of sequence
+        LooseBraceError: For a line with a loose brace or bracket
+        BadCharError: For a line with a character that has no Commodore
+            equivalent
+        ConversionError: If the source format cannot be detected
+        ValueError: For an unknown source format, or 'auto' without
+            reference codes
+    """
+
+    if source not in CHECKSUM_SOURCES + ('auto',):
+        raise ValueError(f"Unknown source format '{source}'")
+    if source == 'auto' and ref_codes is None:
+        raise ValueError("Source format 'auto' requires reference codes")
+
+    prg = PrgBuilder(load_addr)
+    checksums = []
+    # split lines as reading a source file does, at any line end
+    lines = StringIO(text, newline=None)
+    for record in iter_numbered_lines(iter_source_lines(lines)):
+        try:
+            (byte_list, checksum) = convert_line(record.line_num,
+                                                 record.text, source)
+        except ValueError:
+            if bad_char_column(record) is None:
+                raise
+            raise BadCharError(record) from None
+        if byte_list is None:
+            raise LooseBraceError(record)
+        prg.add_line(record.line_num, byte_list)
+        checksums.append((record.line_num, checksum))
+
+    # a reference for detecting the format may list only a sample of lines
+    sample = source == 'auto'
+    if sample:
+        detected = detect_source(checksums, ref_codes)
+        if detected is None:
+            raise ConversionError("Unable to detect source format - no line "
+                                  "checksums match the reference codes.")
+        source = detected[0]
+        checksums = [(line_num, codes[source])
+                     for (line_num, codes) in checksums]
+
+    comparison = None
+    if ref_codes is not None:
+        comparison = compare_checksums(checksums, ref_codes, sample)
+    return Conversion(bytes(prg.data), checksums, source, comparison)
 
 
 def check_line_number_seq(lines_list):
@@ -76,30 +611,83 @@ def check_line_number_seq(lines_list):
        number or starts with an out of sequence line number.
 
     Args:
-        lines_list (list): List of lines (str) in program.
+        lines_list (list): List of lines (str) in program, or SourceLine
+            records whose source position is cited in error messages.
 
     Returns:
-        None: implicit return
+        list: SourceLine record for each line, so later stages do not need
+            to split the line number from the text again
     """
 
-    line_no = 0  # handles case where first line does not have a line number
-    ln_num_buffer = [0]  # first popped after three line numbers are appended
-    for line in lines_list:
-        try:
-            line_no = split_line_num(line)[0]
-            ln_num_buffer.append(line_no)
+    return list(iter_checked_lines(lines_list))
 
-            if not ln_num_buffer[0] < ln_num_buffer[1]:
-                print("Entry error after line "
-                      f"{ln_num_buffer[0]} - lines should be in sequential "
-                      "order.  Exiting.")
-                sys.exit(1)
-            ln_num_buffer.pop(0)
 
-        except ValueError:
-            print(f"Entry error after line {line_no} - each line should start "
-                  "with a line number.  Exiting.")
-            sys.exit(1)
+# highest line number Commodore BASIC accepts
+MAX_LINE_NUM = 63999
+
+
+def iter_checked_lines(lines_list):
+    """Check the line number sequence one line at a time, as in
+       check_line_number_seq(), passing each line on as it is checked
+
+    Args:
+        lines_list (iterable): Lines (str) in program, or SourceLine records
+
+    Yields:
+        SourceLine: Record for each line once its line number is checked
+    """
+
+    try:
+        yield from iter_numbered_lines(lines_list)
+    except LineNumberError as error:
+        print(f"{error}  Exiting.")
+        sys.exit(1)
+
+
+def iter_numbered_lines(lines_list):
+    """Check the line number sequence one line at a time, raising an
+       exception for a line without a line number or out of sequence rather
+       than printing a message and exiting as iter_checked_lines() does
+
+    Args:
+        lines_list (iterable): Lines (str) in program, or SourceLine records
+
+    Yields:
+        SourceLine: Record for each line once its line number is checked
+
+    Raises:
+        LineNumberError: For the first line that does not start with a line
+            number, whose line number is not after the one before, or whose
+            line number is past MAX_LINE_NUM
+    """
+
+    line_no = 0  # handles case where first line does not have a line number
+    for line in lines_list:
+        if not isinstance(line, SourceLine):
+            line = parse_source_line(line)
+        if line.line_num is None:
+            raise LineNumberError(
+                f"Entry error after line {line_no}{_source_pos(line)} - "
+                "each line should start with a line number.", line)
+        if not line_no < line.line_num:
+            raise LineNumberError(
+                f"Entry error after line {line_no}{_source_pos(line)} - "
+                "lines should be in sequential order.", line)
+        if line.line_num > MAX_LINE_NUM:
+            raise LineNumberError(
+                f"Entry error after line {line_no}{_source_pos(line)} - "
+                f"line numbers should be at most {MAX_LINE_NUM}.", line)
+        line_no = line.line_num
+        yield line
+
+
+def _source_pos(record, column=None):
+    """Describe where a SourceLine record sits in the source file, if known"""
+    if not record.row:
+        return ''
+    if column is None:
+        column = record.column
+    return f' (source line {record.row}, column {column})'
 
 
 def ahoy_lines_list(lines_list):
@@ -118,77 +706,118 @@ def ahoy_lines_list(lines_list):
 
     for line in lines_list:
         # replace brackets with braces since Ahoy used both over time
-        line = line.replace('[', '{')
-        line = line.replace(']', '}')
-
-        # split each line on ahoy special characters
-        str_split = re.split(r"{\d+\s?\".[^{]*?\"}|{.[^{]*?}", line)
-
-        # check for loose braces in each substring, return error indication
-        for sub_str in str_split:
-            loose_brace = re.search(r"\}|{", sub_str)
-            # Improve loose brace error handling, inconsistent return
-            if loose_brace is not None:
-                return (None, line)
-
-        # create list of ahoy special character code strings
-        code_split = re.findall(r"{\d+\s?\".+?\"}|{.+?}", line)
-
-        new_codes = []
-
-        # for each ahoy special character, append the petcat equivalent
-        num = 0
-
-        for item in code_split:
+        line = line.translate(_BRACKETS_TO_BRACES)
+
+        # split each line into text segments and ahoy special characters,
+        # return error indication if a loose brace is found
+        lexed = _lex_ahoy_line(line)
+        # Improve loose brace error handling, inconsistent return
+        if lexed is None:
+            return (None, line)
+        (segments, codes) = lexed
+
+        # piece the string segments and petcat codes back together
+        new_line = [segments[0]]
+        for (segment, (code, count)) in zip(segments[1:], codes):
+            new_line.append(_AHOY_TO_PETCAT.get(code.upper(), code)
+                            * count)
+            new_line.append(segment)
+        new_lines.append(''.join(new_line))
 
-            if item.upper() in char_maps.AHOY_TO_PETCAT:
-                new_codes.append(char_maps.AHOY_TO_PETCAT[item.upper()])
+    return new_lines
 
-            elif re.match(r"{\d+\s?\".+?\"}", item):
-                # Extract number of times to repeat special character
-                char_count = int(re.search(r"\d+\b", item).group())
-                # Get the string inside the brackets and strip quotes on ends
-                char_code = re.search(r"\".+?\"", item).group()[1:-1]
 
-                if char_code.upper() in char_maps.AHOY_TO_PETCAT:
-                    new_codes.append(char_maps.AHOY_TO_PETCAT
-                                     [char_code.upper()])
+_BRACKETS_TO_BRACES = str.maketrans('[]', '{}')
 
-                    while char_count > 1:
-                        new_codes.append(char_maps.AHOY_TO_PETCAT
-                                         [char_code.upper()])
-                        str_split.insert(num + 1, '')
-                        num += 1
-                        char_count -= 1
 
-                else:
-                    new_codes.append(char_code)
-                    while char_count > 1:
-                        new_codes.append(char_code)
-                        str_split.insert(num + 1, '')
-                        num += 1
-                        char_count -= 1
+def _lex_ahoy_line(line):
+    """Split a line into the text segments between Ahoy special character
+       codes and the codes themselves in a single left to right pass
 
-            else:
-                new_codes.append(item)
-            num += 1
+    Args:
+        line (str): Text of the line with brackets already replaced by braces
 
-        # add blank item to list of special characters prior to blending strs
-        if new_codes:
-            new_codes.append('')
+    Returns:
+        tuple or None: None if the line has a loose brace, otherwise a tuple
+            consisting of:
+                segments (list): Text (str) before, between, and after the
+                    special character codes, one more than there are codes
+                codes (list): Tuples of (code, count) for each special
+                    character code, where code is the brace code text (or the
+                    quoted text of a repeat code like {4"{cd}"}) and count is
+                    the number of times it repeats
+    """
 
-            new_line = []
+    segments = []
+    codes = []
+    start = 0
+    pos = line.find('{')
+    while pos != -1:
+        match = _match_ahoy_code(line, pos)
+        segment = line[start:pos]
+        if match is None or '}' in segment:
+            return None
+        segments.append(segment)
+        (start, code, count) = match
+        codes.append((code, count))
+        pos = line.find('{', start)
+
+    segment = line[start:]
+    if '}' in segment:
+        return None
+    segments.append(segment)
+    return (segments, codes)
+
+
+def _match_ahoy_code(line, pos):
+    """Match the Ahoy special character code starting at an opening brace
+
+    A code is either a repeat code, i.e. a count and quoted text such as
+    {4"{cd}"} or {4 "*"}, or any text up to the next closing brace such as
+    {cd} or {s a}.  Neither may contain another opening brace after its
+    first character.
 
-            # piece the string segments and petcat codes back together
-            for count in range(len(new_codes)):
-                new_line.extend((str_split[count], new_codes[count]))
+    Args:
+        line (str): Text of the line being lexed
+        pos (int): Index of the opening brace in the line
 
-        # handle case where line contained no special characters
-        else:
-            new_line = str_split
-        new_lines.append(''.join(new_line))
+    Returns:
+        tuple or None: (end index, code, count) for the matched code, or None
+            if the brace does not start a complete code
+    """
 
-    return new_lines
+    length = len(line)
+
+    # repeat code, e.g. {4"{cd}"} or {4 "*"}
+    digit_end = pos + 1
+    while digit_end < length and line[digit_end].isdecimal():
+        digit_end += 1
+    if digit_end > pos + 1:
+        quote = digit_end
+        if quote < length and line[quote].isspace():
+            quote += 1
+        first = quote + 1
+        if first < length and line[quote] == '"' and line[first] != '\n':
+            next_open = line.find('{', first + 1)
+            if next_open == -1:
+                next_open = length
+            close = line.find('"}', first + 1, next_open)
+            if close != -1:
+                code = line[first:line.find('"', first + 1)]
+                # a count of zero still yields the character once
+                count = max(int(line[pos + 1:digit_end]), 1)
+                return (close + 2, code, count)
+
+    # single code, e.g. {cd} or {s a}
+    if pos + 1 < length and line[pos + 1] != '\n':
+        next_open = line.find('{', pos + 2)
+        if next_open == -1:
+            next_open = length
+        close = line.find('}', pos + 2, next_open)
+        if close != -1:
+            return (close + 1, line[pos:close + 1], 1)
+
+    return None
 
 
 def split_line_num(line):
@@ -204,31 +833,252 @@ def split_line_num(line):
                 stripped
     """
 
-    line = line.lstrip()
-    acc = []
-    while line and line[0].isdigit():
-        acc.append(line[0])
-        line = line[1:]
+    start = len(line) - len(line.lstrip())
+    end = start
+    while end < len(line) and line[end].isdigit():
+        end += 1
 
-    return (int(''.join(acc)), line.lstrip())
+    return (int(line[start:end]), line[end:].lstrip())
 
 
 # manage the tokenization process for each line text string
 def scan_manager(ln):
-    in_quotes = False
-    in_remark = False
-    bytestr = []
+    return list(scan_line(ln))
+
+
+def scan_line(ln):
+    """Tokenize a line of BASIC text by walking it with a cursor
+
+    Args:
+        ln (str): Text of the line to convert, without the line number
+
+    Returns:
+        bytearray: Tokenized bytes for the line followed by the 0 terminator
+    """
+
+    # each token or character consumes at least one character of the line,
+    # so the line length plus the terminator bounds the output size
+    bytestr = bytearray(len(ln) + 1)
+    count = _scan_run(ln, bytestr)[0]
+    # keep one zeroed byte past the last token as the line terminator
+    del bytestr[count + 1:]
+    return bytestr
+
+
+def scan_ahoy_line(line):
+    """Convert a line of Ahoy source straight to its line number and
+       tokenized bytes, without building the intermediate petcat text
+
+    Ahoy special character codes with a petcat equivalent are emitted as
+    their byte values directly; other codes are tokenized as text, so the
+    result matches ahoy_lines_list(), split_line_num(), and scan_line()
+    applied in turn.
+
+    Args:
+        line (str): Text of the line including the line number
+
+    Returns:
+        tuple or None: None if the line has a loose brace, otherwise a tuple
+            consisting of:
+                line number (int): Line number from the beginning of the line
+                tokenized bytes (bytearray): Bytes for the remaining line
+                    text followed by the 0 terminator
+    """
+
+    (line_num, text) = split_line_num(line)
+    bytestr = scan_ahoy_text(text)
+    if bytestr is None:
+        return None
+    return (line_num, bytestr)
+
+
+def scan_ahoy_text(text):
+    """Convert the text of a line of Ahoy source, after its line number,
+       straight to tokenized bytes
+
+    Args:
+        text (str): Text of the line after the line number, e.g. the text of
+            a SourceLine record
+
+    Returns:
+        bytearray or None: None if the text has a loose brace, otherwise the
+            bytes for the text followed by the 0 terminator
+    """
+
+    lexed = _lex_ahoy_line(text.translate(_BRACKETS_TO_BRACES))
+    if lexed is None:
+        return None
+    (segments, codes) = lexed
+
+    # collect alternating runs of text and bytes for converted codes, joining
+    # text that sits between codes without a petcat equivalent
+    runs = []
+    text = [segments[0]]
+    size = 1
+    for (segment, (code, count)) in zip(segments[1:], codes):
+        value = _AHOY_TOKENS.get(code.upper())
+        if value is None:
+            text.append(code * count)
+        else:
+            runs.append(''.join(text))
+            runs.append(bytes((value,)) * count)
+            size += count
+            text = []
+        text.append(segment)
+    runs.append(''.join(text))
+    # repeat codes at the start of the text may expand to leading spaces
+    runs[0] = runs[0].lstrip()
+
+    bytestr = bytearray(size + sum(len(run) for run in runs[::2]))
+    (count, in_quotes, in_remark) = _scan_run(runs[0], bytestr)
+    for index in range(1, len(runs), 2):
+        code_bytes = runs[index]
+        bytestr[count:count + len(code_bytes)] = code_bytes
+        count += len(code_bytes)
+        (count, in_quotes, in_remark) = _scan_run(runs[index + 1], bytestr,
+                                                  count, in_quotes, in_remark)
+    del bytestr[count + 1:]
+    return bytestr
+
 
-    while ln:
-        (byte, ln) = _scan(ln, tokenize=not (in_quotes or in_remark))
-        # if byte is not None:
-        bytestr.append(byte)
-        if byte == ord('"'):
+def loose_brace_column(record):
+    """Find the column of the first loose brace or bracket in the text of a
+       SourceLine record, for citing in error messages
+
+    Args:
+        record (SourceLine): Line whose text failed to convert
+
+    Returns:
+        int or None: Column of the loose brace in the source line, counting
+            from 1, or None if the text has no loose brace
+    """
+
+    line = record.text.translate(_BRACKETS_TO_BRACES)
+    start = 0
+    pos = line.find('{')
+    while pos != -1:
+        close = line.find('}', start, pos)
+        if close != -1:
+            return record.text_column + close
+        match = _match_ahoy_code(line, pos)
+        if match is None:
+            return record.text_column + pos
+        start = match[0]
+        pos = line.find('{', start)
+    close = line.find('}', start)
+    if close != -1:
+        return record.text_column + close
+    return None
+
+
+# Characters past Latin-1 have no byte value to convert to
+_BAD_CHAR = re.compile('[^\x00-\xff]')
+
+
+def bad_char_column(record):
+    """Find the column of the first character in the text of a SourceLine
+       record that has no Commodore byte value (such as a typographic quote
+       pasted in from a web page), which convert_line() cannot convert
+
+    Args:
+        record (SourceLine): Line to check
+
+    Returns:
+        int or None: Column of the character in the source line, counting
+            from 1, or None if every character can be converted
+    """
+
+    match = _BAD_CHAR.search(record.text)
+    if match is None:
+        return None
+    return record.text_column + match.start()
+
+
+# Text inside quotes or after a REM that can be converted without token
+# lookups, stopping at codes, quotes, and characters with the REM value
+_LITERAL_RUN = re.compile('[^{"\x8f]+')
+
+# Latin letters shifted by -32 for the difference between ascii and petscii
+_PETSCII_LETTERS = bytes.maketrans(b'abcdefghijklmnopqrstuvwxyz',
+                                   b'ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+
+
+def _scan_run(ln, bytestr, count=0, in_quotes=False, in_remark=False):
+    """Tokenize a run of line text into a preallocated bytearray, tracking
+       whether each position is inside quotes or after a REM statement
+
+    Args:
+        ln (str): Text of the run to convert
+        bytestr (bytearray): Output buffer with room for at least one byte
+            per character of the run
+        count (int): Index in the output buffer to write the first byte
+        in_quotes (bool): Flag to indicate if the run starts inside quotes
+        in_remark (bool): Flag to indicate if the run starts after a REM
+
+    Returns:
+        tuple consisting of:
+            count (int): Index in the output buffer after the last byte
+            in_quotes (bool): Flag for quotes state at the end of the run
+            in_remark (bool): Flag for REM state at the end of the run
+    """
+
+    pos = 0
+    end = len(ln)
+    while pos < end:
+        if in_quotes or in_remark:
+            # convert the literal text up to the next special character
+            # code, quote, or REM value in one step, shifting latin letters
+            match = _LITERAL_RUN.match(ln, pos)
+            if match is not None:
+                run_end = match.end()
+                bytestr[count:count + run_end - pos] = (
+                    ln[pos:run_end].encode('latin-1')
+                    .translate(_PETSCII_LETTERS))
+                count += run_end - pos
+                pos = run_end
+                continue
+        (byte, pos) = _scan_at(ln, pos, not (in_quotes or in_remark))
+        bytestr[count] = byte
+        count += 1
+        if byte == 34:  # quote character
             in_quotes = not in_quotes
-        if byte == 143:
+        if byte == 143:  # REM token
             in_remark = True
-    bytestr.append(0)
-    return bytestr
+    return (count, in_quotes, in_remark)
+
+
+def _match_token(ln, pos=0, tokenize=True):
+    """Find the token starting at a position in a line segment
+
+    Walks the token trie along the line and, of all tokens that match at the
+    position, picks the one that appears first in the table search order.
+    This gives the same result as testing each table entry with startswith
+    in turn (e.g. 'input#' before 'input', petcat codes before keywords).
+
+    Args:
+        ln (str): Text of the line to scan
+        pos (int): Index in the line where the token must start
+        tokenize (bool): Flag to indicate if BASIC keywords may match (False
+            if the position is within quotes or after a REM statement)
+
+    Returns:
+        tuple or None: (token value, end index) of the matching token, or
+            None if no token starts at the position
+    """
+
+    node = _TOKEN_TRIE
+    best = None
+    for index in range(pos, len(ln)):
+        node = node.get(ln[index])
+        if node is None:
+            break
+        entry = node.get(None)
+        if entry is not None and (tokenize or not entry[2]):
+            if best is None or entry[0] < best[0]:
+                best = (entry[0], entry[1], index + 1)
+    if best is None:
+        return None
+    return (best[1], best[2])
 
 
 # scan each line segement and convert to tokenized bytes.
@@ -252,31 +1102,73 @@ def _scan(ln, tokenize=True):
                 specical character, or alphanumeric character stripped
     """
 
-    # check if each line passed in starts with a petcat special character
-    # if so, return value of token and line with token string removed
-    for (token, value) in char_maps.PETCAT_TOKENS:
-        if ln.startswith(token):
-            return (value, ln[len(token):])
-    # check if each line passed in starts with shifted or commodore special
-    # character.  if so, return value of token, line with token string removed
-    for (token, value) in char_maps.SHIFT_CMDRE_TOKENS:
-        if ln.startswith(token):
-            return (value, ln[len(token):])
-    # if tokenize flag is True (i.e. line beginning is not inside quotes or
-    # after a REM statement), check if line starts with a BASIC keyword
-    # if so, return value of token and line with BASIC keyword removed
-    if tokenize:
-        for (token, value) in char_maps.TOKENS_V2:
-            if ln.startswith(token):
-                return (value, ln[len(token):])
+    (char_val, end) = _scan_at(ln, 0, tokenize)
+    return (char_val, ln[end:])
+
+
+def _scan_at(ln, pos, tokenize=True):
+    """Convert the token or character at a position in a line to its
+       tokenized byte value without copying the line
+
+    Args:
+        ln (str): Text of the line being scanned
+        pos (int): Index in the line of the next character to convert
+        tokenize (bool): Flag to indicate if BASIC keywords may be tokenized
+            at the position (False if within quotes or after a REM statement)
+
+    Returns:
+        tuple consisting of:
+            character/token value (int): Decimal value of ascii character or
+                tokenized word
+            next position (int): Index in the line following the converted
+                keyword, special character, or alphanumeric character
+    """
+
+    # check if line starts with a petcat special character, a shifted or
+    # commodore special character, or (if tokenize flag is True, i.e. line
+    # position is not inside quotes or after a REM statement) a BASIC
+    # keyword; if so, return value of token and position after the token
+    match = _match_token(ln, pos, tokenize)
+    if match is not None:
+        return match
     # for characters without token values, convert to unicode (ascii) value
     # and, for latin letters, shift values by -32 to account for difference
     # between ascii and petscii used by Commodore BASIC
-    # finally, return character value and line with character removed
-    char_val = ord(ln[0])
+    # finally, return character value and position after the character
+    char_val = ord(ln[pos])
     if char_val >= 97 and char_val <= 122:
         char_val -= 32
-    return (char_val, ln[1:])
+    return (char_val, pos + 1)
+
+
+def detokenize_line(byte_list):
+    """Convert tokenized line bytes back to line text as it would be typed
+       in, like a magazine listing with keywords, letters, and Ahoy special
+       character codes in upper case
+
+    Args:
+        byte_list (iterable): Tokenized bytes of the line, optionally ending
+            with the 0 terminator
+
+    Returns:
+        str: Text of the line, without the line number
+    """
+
+    text = []
+    in_quotes = False
+    in_remark = False
+    for byte in byte_list:
+        if byte == 0:
+            break
+        if not (in_quotes or in_remark) and byte in _KEYWORD_TEXT:
+            text.append(_KEYWORD_TEXT[byte])
+        else:
+            text.append(_LISTING_TEXT.get(byte) or chr(byte))
+        if byte == 34:  # quote character
+            in_quotes = not in_quotes
+        if byte == 143:  # REM token
+            in_remark = True
+    return ''.join(text)
 
 
 def ahoy1_checksum(byte_list):
@@ -286,25 +1178,7 @@ def ahoy1_checksum(byte_list):
     Covers Ahoy Bug Repellent version for Mar-Apr 1984 issues.
     '''
 
-    next_value = 0
-
-    for char_val in byte_list:
-        # Detect spaces that are outside of quotes and ignore them, else
-        # execute primary checksum generation algorithm
-        if char_val == 32:
-            continue
-        next_value = char_val + next_value
-        next_value = next_value << 1
-
-    xor_value = next_value
-    # get high nibble of xor_value
-    high_nib = (xor_value & 0xf0) >> 4
-    high_char_val = high_nib + 65  # 0x41
-    # get low nibble of xor_value
-    low_nib = xor_value & 0x0f
-    low_char_val = low_nib + 65  # 0x41
-    checksum = chr(high_char_val) + chr(low_char_val)
-    return checksum
+    return _CHECKSUM_CODES[_ahoy1_run(byte_list)]
 
 
 def ahoy2_checksum(byte_list):
@@ -314,17 +1188,340 @@ def ahoy2_checksum(byte_list):
     Covers Ahoy Bug Repellent version for May 1984-Apr 1987 issues.
     '''
 
-    xor_value = 0
-    char_position = 1
-    carry_flag = 1
-    in_quotes = False
+    return _CHECKSUM_CODES[_ahoy2_run(byte_list)[0]]
+
+
+def ahoy3_checksum(line_num, byte_list):
+    """
+    Function to create Ahoy checksums from passed in line number and
+    byte list to match the codes printed in the magazine to check each
+    line for typed in accuracy. Covers the last Ahoy Bug Repellent
+    version introduced in May 1987.
+    """
+
+    # line number low and high bytes are checked ahead of the line bytes
+    state = _ahoy3_run((line_num % 256, line_num // 256))
+    return _CHECKSUM_CODES[_ahoy3_run(byte_list, *state)[0]]
+
+
+def line_checksum(source, line_num, byte_list):
+    """Create the checksum for a line in the given magazine source format
+
+    Args:
+        source (str): Magazine source format ('ahoy1', 'ahoy2', or 'ahoy3')
+        line_num (int): Line number of the line
+        byte_list (iterable): Tokenized bytes of the line
+
+    Returns:
+        str: Two letter checksum code
+
+    Raises:
+        ValueError: If the source format has no checksum
+    """
+
+    if source == 'ahoy1':
+        return ahoy1_checksum(byte_list)
+    if source == 'ahoy2':
+        return ahoy2_checksum(byte_list)
+    if source == 'ahoy3':
+        return ahoy3_checksum(line_num, byte_list)
+    raise ValueError(f'Checksum not supported for source format: {source}')
+
+
+CHECKSUM_SOURCES = ('ahoy1', 'ahoy2', 'ahoy3')
+
+
+def fused_checksums(line_num, byte_list):
+    """Create the checksums for a line in every Ahoy Bug Repellent format in
+       a single pass over the line bytes
+
+    Args:
+        line_num (int): Line number of the line
+        byte_list (iterable): Tokenized bytes of the line
+
+    Returns:
+        dict: Two letter checksum code (str) keyed by source format
+    """
+
+    xor1 = 0
+    (xor2, pos2, in_quotes2) = (0, 1, False)
+    # ahoy3 checks the line number low and high bytes ahead of the line text
+    (xor3, pos3, in_quotes3) = _ahoy3_run((line_num % 256, line_num // 256))
+
+    for char_val in byte_list:
+        if char_val == 34:
+            in_quotes2 = not in_quotes2
+            in_quotes3 = not in_quotes3
+        elif char_val == 32:
+            # spaces are always ignored by ahoy1, and by ahoy2 and ahoy3
+            # only when outside of quotes (carry flag is zero for a space)
+            if in_quotes2:
+                xor2 = ((32 + xor2) ^ pos2) & 255
+                pos2 = (pos2 + 1) & 255
+            if in_quotes3:
+                xor3 = ((32 + xor3) ^ pos3) & 255
+                pos3 = (pos3 + 1) & 255
+            continue
+
+        xor1 = ((char_val + xor1) << 1) & 255
+        xor2 = ((char_val + xor2 + (char_val >= 34)) ^ pos2) & 255
+        pos2 = (pos2 + 1) & 255
+        xor3 = ((char_val + xor3) ^ pos3) & 255
+        pos3 = (pos3 + 1) & 255
+
+    return {'ahoy1': _CHECKSUM_CODES[xor1],
+            'ahoy2': _CHECKSUM_CODES[xor2],
+            'ahoy3': _CHECKSUM_CODES[xor3]}
+
+
+def detect_source(line_codes, ref_codes):
+    """Pick the checksum source format whose codes match the most lines of a
+       reference
+
+    Args:
+        line_codes (list): Tuples of (line number, dict of checksum codes
+            keyed by source format) for each line, as from fused_checksums()
+        ref_codes (dict): Reference checksum codes keyed by line number
+
+    Returns:
+        tuple or None: (source format, number of matching lines) for the best
+            match, or None if no line matches in any format.  Ties go to the
+            format listed first in CHECKSUM_SOURCES.
+    """
+
+    matches = dict.fromkeys(CHECKSUM_SOURCES, 0)
+    for (line_num, codes) in line_codes:
+        ref_code = ref_codes.get(line_num)
+        if ref_code is None:
+            continue
+        for source in CHECKSUM_SOURCES:
+            if codes[source] == ref_code:
+                matches[source] += 1
+
+    best = max(CHECKSUM_SOURCES, key=lambda source: matches[source])
+    if not matches[best]:
+        return None
+    return (best, matches[best])
+
+
+def batch_checksums(source, lines, use_numpy=None):
+    """Create checksums for many lines at once.  With NumPy installed, the
+       lines are packed into a padded 2-D array and each checksum step runs
+       column by column across all lines together.
+
+    Args:
+        source (str): Magazine source format ('ahoy1', 'ahoy2', or 'ahoy3')
+        lines (list): Tuples of (line number, tokenized bytes) for each line
+        use_numpy (bool): True to require NumPy, False to use the pure Python
+            checksum functions, or None (default) to use NumPy if installed
+
+    Returns:
+        list: Two letter checksum code (str) for each line, in order
+
+    Raises:
+        ValueError: If the source format has no checksum
+        ImportError: If use_numpy is True and NumPy is not installed
+    """
+
+    if source not in CHECKSUM_SOURCES:
+        raise ValueError(
+            f'Checksum not supported for source format: {source}')
+
+    np = None
+    if use_numpy is not False:
+        try:
+            import numpy as np
+        except ImportError:
+            if use_numpy:
+                raise
+
+    if np is None or not lines:
+        return [line_checksum(source, line_num, byte_list)
+                for (line_num, byte_list) in lines]
+
+    # ahoy3 checks the line number low and high bytes ahead of the line text
+    offset = 2 if source == 'ahoy3' else 0
+    lengths = np.array([len(byte_list) + offset for (_, byte_list) in lines])
+    table = np.zeros((len(lines), int(lengths.max())), dtype=np.int64)
+    for (row, (line_num, byte_list)) in enumerate(lines):
+        if offset:
+            table[row, 0] = line_num % 256
+            table[row, 1] = line_num // 256
+        if isinstance(byte_list, (bytes, bytearray, memoryview)):
+            byte_list = np.frombuffer(byte_list, dtype=np.uint8)
+        table[row, offset:lengths[row]] = byte_list
+
+    xor_value = np.zeros(len(lines), dtype=np.int64)
+    char_position = np.full(len(lines), 1 if source == 'ahoy2' else 0,
+                            dtype=np.int64)
+    in_quotes = np.zeros(len(lines), dtype=bool)
+
+    for column in range(table.shape[1]):
+        char_val = table[:, column]
+        # padding past the end of shorter lines leaves their state unchanged
+        active = lengths > column
+        if source == 'ahoy1':
+            step = active & (char_val != 32)
+            xor_value = np.where(step, ((char_val + xor_value) << 1) & 255,
+                                 xor_value)
+            continue
+
+        in_quotes ^= active & (char_val == 34)
+        step = active & ((char_val != 32) | in_quotes)
+        next_value = char_val + xor_value
+        if source == 'ahoy2':
+            next_value += char_val >= 34  # carry flag
+        xor_value = np.where(step, (next_value ^ char_position) & 255,
+                             xor_value)
+        char_position = np.where(step, (char_position + 1) & 255,
+                                 char_position)
+
+    return [_CHECKSUM_CODES[value] for value in xor_value.tolist()]
+
+
+class ChecksumState(NamedTuple):
+    """Running state of an Ahoy Bug Repellent checksum part way through a
+       line, so a checksum can be resumed from any memoized prefix
+
+    States are immutable; feeding bytes returns a new state and leaves the
+    original unchanged.
+    """
+
+    source: str
+    xor_value: int = 0
+    char_position: int = 0
+    carry_flag: int = 1
+    in_quotes: bool = False
+
+    def feed(self, char_val):
+        """Return the state after adding one byte to the checksum"""
+        return self.feed_many((char_val,))
+
+    def feed_many(self, byte_list):
+        """Return the state after adding a sequence of bytes (bytes,
+           bytearray, memoryview, or list of int) to the checksum
+        """
+        if self.source == 'ahoy1':
+            return self._replace(xor_value=_ahoy1_run(byte_list,
+                                                      self.xor_value))
+        if self.source == 'ahoy2':
+            (xor_value, char_position, carry_flag, in_quotes) = _ahoy2_run(
+                byte_list, self.xor_value, self.char_position,
+                self.carry_flag, self.in_quotes)
+            return self._replace(xor_value=xor_value,
+                                 char_position=char_position,
+                                 carry_flag=carry_flag, in_quotes=in_quotes)
+        (xor_value, char_position, in_quotes) = _ahoy3_run(
+            byte_list, self.xor_value, self.char_position, self.in_quotes)
+        return self._replace(xor_value=xor_value, char_position=char_position,
+                             in_quotes=in_quotes)
+
+    @property
+    def checksum(self):
+        """Two letter checksum code for the bytes fed so far"""
+        return _CHECKSUM_CODES[self.xor_value]
+
+
+def checksum_state(source, line_num=0):
+    """Create the starting checksum state for a line
+
+    Args:
+        source (str): Magazine source format ('ahoy1', 'ahoy2', or 'ahoy3')
+        line_num (int): Line number, checked ahead of the line bytes by the
+            'ahoy3' checksum and ignored by the others
+
+    Returns:
+        ChecksumState: State before the first byte of the line text
+
+    Raises:
+        ValueError: If the source format has no checksum
+    """
+
+    if source == 'ahoy1':
+        return ChecksumState(source)
+    if source == 'ahoy2':
+        return ChecksumState(source, char_position=1)
+    if source == 'ahoy3':
+        return ChecksumState(source).feed_many((line_num % 256,
+                                                line_num // 256))
+    raise ValueError(f'Checksum not supported for source format: {source}')
+
+
+def checksum_prefix_states(state, byte_list):
+    """Memoize the checksum state after each prefix of a line, so an edit at
+       a position only needs the bytes from that position on to be re-fed
+
+    Args:
+        state (ChecksumState): State before the first byte
+        byte_list (iterable): Tokenized bytes of the line
+
+    Returns:
+        list: ChecksumState before each byte, followed by the final state
+    """
+
+    states = [state]
+    for char_val in byte_list:
+        state = state.feed(char_val)
+        states.append(state)
+    return states
+
+
+# Two letter checksum codes for each xor value: the high and low nibbles
+# offset from 'A' (0x41)
+_CHECKSUM_CODES = tuple(chr(65 + (xor_value >> 4)) + chr(65 + (xor_value & 15))
+                        for xor_value in range(256))
+
+
+def _ahoy1_run(byte_list, xor_value=0):
+    """Run the Mar-Apr 1984 Bug Repellent checksum over a sequence of bytes
+
+    Only the low byte of the running value feeds the checksum code, so it is
+    kept to one byte after each step.
+
+    Args:
+        byte_list (iterable): Tokenized bytes (bytes, bytearray, memoryview,
+            or list of int) to add to the checksum
+        xor_value (int): Running checksum value before the first byte
+
+    Returns:
+        int: Running checksum value (0-255) after the last byte
+    """
+
+    for char_val in byte_list:
+        # Detect spaces and ignore them, else execute primary checksum
+        # generation algorithm
+        if char_val == 32:
+            continue
+        xor_value = ((char_val + xor_value) << 1) & 255
+    return xor_value
+
+
+def _ahoy2_run(byte_list, xor_value=0, char_position=1, carry_flag=1,
+               in_quotes=False):
+    """Run the May 1984-Apr 1987 Bug Repellent checksum over a sequence of
+       bytes
+
+    Only the low byte of the xor value feeds the checksum code, so it and the
+    character position are kept to one byte after each step.
+
+    Args:
+        byte_list (iterable): Tokenized bytes (bytes, bytearray, memoryview,
+            or list of int) to add to the checksum
+        xor_value (int): Running xor value before the first byte
+        char_position (int): Position counter for the next checked character
+        carry_flag (int): Carry flag left by the previous character
+        in_quotes (bool): Flag to indicate if the first byte is inside quotes
+
+    Returns:
+        tuple: (xor_value, char_position, carry_flag, in_quotes) after the
+            last byte
+    """
 
     for char_val in byte_list:
 
         # set carry flag to zero for char values less than ascii value for
         # quote character since assembly code for repellent sets carry flag
         # based on cmp 0x22 (decimal 34)
-
         carry_flag = 0 if char_val < 34 else 1
 
         # Detect quote symbol in line and toggle in-quotes flag
@@ -333,46 +1530,31 @@ def ahoy2_checksum(byte_list):
 
         # Detect spaces that are outside of quotes and ignore them, else
         # execute primary checksum generation algorithm
-        if char_val == 32 and in_quotes is False:
+        if char_val == 32 and not in_quotes:
             continue
 
-        next_value = char_val + xor_value + carry_flag
-        xor_value = next_value ^ char_position
+        xor_value = ((char_val + xor_value + carry_flag) ^ char_position) & 255
+        char_position = (char_position + 1) & 255
 
-        # limit next value to fit in one byte
-        next_value = next_value & 255
+    return (xor_value, char_position, carry_flag, in_quotes)
 
-        char_position = char_position + 1
 
-    # get high nibble of xor_value
-    high_nib = (xor_value & 0xf0) >> 4
-    high_char_val = high_nib + 65  # 0x41
-    # get low nibble of xor_value
-    low_nib = xor_value & 0x0f
-    low_char_val = low_nib + 65  # 0x41
-    checksum = chr(high_char_val) + chr(low_char_val)
-    return checksum
+def _ahoy3_run(byte_list, xor_value=0, char_position=0, in_quotes=False):
+    """Run the May 1987 Bug Repellent checksum over a sequence of bytes
 
+    Only the low byte of the xor value feeds the checksum code, so it and the
+    character position are kept to one byte after each step.
 
-def ahoy3_checksum(line_num, byte_list):
-    """
-    Function to create Ahoy checksums from passed in line number and
-    byte list to match the codes printed in the magazine to check each
-    line for typed in accuracy. Covers the last Ahoy Bug Repellent
-    version introduced in May 1987.
-    """
-
-    xor_value = 0
-    char_position = 0
-    in_quotes = False
-
-    line_low = line_num % 256
-    line_hi = int(line_num / 256)
-
-    byte_list = [line_low] + [line_hi] + byte_list
+    Args:
+        byte_list (iterable): Line number bytes or tokenized bytes (bytes,
+            bytearray, memoryview, or list of int) to add to the checksum
+        xor_value (int): Running xor value before the first byte
+        char_position (int): Position counter for the next checked character
+        in_quotes (bool): Flag to indicate if the first byte is inside quotes
 
-    # byte_list.insert(0, line_hi)
-    # byte_list.insert(0, line_low)
+    Returns:
+        tuple: (xor_value, char_position, in_quotes) after the last byte
+    """
 
     for char_val in byte_list:
 
@@ -382,41 +1564,39 @@ def ahoy3_checksum(line_num, byte_list):
 
         # Detect spaces that are outside of quotes and ignore them, else
         # execute primary checksum generation algorithm
-        if char_val == 32 and in_quotes is False:
+        if char_val == 32 and not in_quotes:
             continue
 
-        next_value = char_val + xor_value
+        xor_value = ((char_val + xor_value) ^ char_position) & 255
+        char_position = (char_position + 1) & 255
 
-        xor_value = next_value ^ char_position
+    return (xor_value, char_position, in_quotes)
 
-        # limit next value to fit in one byte
-        next_value = next_value & 255
 
-        char_position = char_position + 1
+def write_checksums(filename, ahoy_checksums):
 
-    # get high nibble of xor_value
-    high_nib = (xor_value & 0xf0) >> 4
-    high_char_val = high_nib + 65  # 0x41
-    # high_char_val = high_char_val & 0x0f
-    # get low nibble of xor_value
-    low_nib = xor_value & 0x0f
-    low_char_val = low_nib + 65  # 0x41
-    # low_char_val = low_char_val & 0x0f
-    checksum = chr(high_char_val) + chr(low_char_val)
-    return checksum
+    with open(filename, 'w') as f:
+        for _ in stream_checksums(f, ahoy_checksums):
+            pass
 
 
-def write_checksums(filename, ahoy_checksums):
+def stream_checksums(file, ahoy_checksums):
+    """Write line checksums to an open '.chk' file as they pass through
 
-    output = []
-    # Print each line number, code combination in matrix format
-    for checksum in ahoy_checksums:
-        prt_line = str(checksum[0])
-        prt_code = str(checksum[1])
-        output.append(f'{prt_line} {prt_code}\n')
+    Args:
+        file (file): Text file to write to
+        ahoy_checksums (iterable): Tuples of (line number, checksum) for each
+            line in program order
+
+    Yields:
+        tuple: Each (line number, checksum) once written; the line count is
+            written when the checksums run out
+    """
 
-    output.append(f'\nLines: {len(ahoy_checksums)}\n')
+    count = 0
+    for checksum in ahoy_checksums:
+        file.write(f'{checksum[0]} {checksum[1]}\n')
+        count += 1
+        yield checksum
 
-    with open(filename, 'w') as f:
-        for line in output:
-            f.write(line)
+    file.write(f'\nLines: {count}\n')
@@ -6,22 +6,46 @@ emulator or on original hardware.
 
 import argparse
 from argparse import RawTextHelpFormatter
-from os import get_terminal_size
+from collections import deque
+from contextlib import ExitStack, nullcontext, redirect_stdout
+from functools import partial
+from io import BytesIO, StringIO, TextIOWrapper
+from os import (cpu_count, devnull, environ, get_terminal_size, getpid, path,
+                remove, replace)
 import sys
 import math
+from typing import NamedTuple
 
-from retrotype import (read_file,
+from retrotype import (iter_source_lines,
+                       parse_source_line,
+                       read_ref_file,
                        check_line_number_seq,
-                       ahoy_lines_list,
-                       split_line_num,
-                       scan_manager,
-                       ahoy1_checksum,
-                       ahoy2_checksum,
-                       ahoy3_checksum,
-                       write_binary,
-                       write_checksums,
+                       iter_checked_lines,
+                       iter_numbered_lines,
+                       loose_brace_column,
+                       bad_char_column,
+                       convert_line,
+                       LineCache,
+                       detect_source,
+                       compare_checksums,
+                       PrgBuilder,
+                       tokenize_chunk,
+                       place_binary,
+                       stream_checksums,
+                       BadCharError,
+                       ConversionError,
+                       LineNumberError,
+                       LooseBraceError,
                        )
 
+# modules only some runs need, such as the process pool for --jobs and the
+# conversion cache, are imported where they are used to keep start-up fast
+
+# an output for standard output is held in memory up to this size until the
+# conversion succeeds, then in a temporary file, and copied in blocks
+DATA_SPOOL_BYTES = 1024 * 1024
+DATA_BLOCK_SIZE = 64 * 1024
+
 
 def parse_args(argv):
     """Parses command line inputs and generate command line interface and
@@ -73,22 +97,178 @@ def parse_args(argv):
     )
 
     parser.add_argument(
-        "-s", "--source", choices=["ahoy1", "ahoy2", "ahoy3"], type=str,
-        nargs=1, required=False, metavar="source_format", default=["ahoy2"],
+        "-s", "--source", choices=["ahoy1", "ahoy2", "ahoy3", "auto"],
+        type=str, nargs=1, required=False, metavar="source_format",
+        default=["ahoy2"],
         help="Specifies the magazine source for conversion and checksum:\n"
              "ahoy1 - Ahoy magazine (Apr-May 1984)\n"
              "ahoy2 - Ahoy magazine (Jun 1984-Apr 1987) (default)\n"
              "ahoy3 - Ahoy magazine (May 1987-)\n"
+             "auto - Ahoy magazine, format detected from reference file\n"
+    )
+
+    parser.add_argument(
+        "-r", "--ref", type=str, nargs=1, required=False,
+        metavar="ref_file", default=None,
+        help="Specifies a reference file of magazine line numbers and\n"
+             "checksums, one line number and checksum per line.  Only\n"
+             "mismatched, missing, and extra lines are reported, with exit\n"
+             "status 1 if there are any.  For source format 'auto' it may\n"
+             "list only a sample of lines: lines it does not list are not\n"
+             "reported as extra, and every line checksum is printed.\n"
+    )
+
+    parser.add_argument(
+        "--suggest", action="store_true",
+        help="For each line whose checksum does not match the reference\n"
+             "file, suggest single character or special character code\n"
+             "corrections that make it match.  Requires --ref.\n"
+    )
+
+    parser.add_argument(
+        "--batch", type=str, nargs=1, required=False,
+        metavar="dir_or_glob", default=None,
+        help="Converts every '.ahoy' file in a directory, or every file\n"
+             "matching a glob pattern, in place of a single input file.\n"
+             "Each file is checked against a '.ref' file with the same\n"
+             "basename if there is one.  Existing output files are\n"
+             "overwritten.  Ends with a summary of each file.\n"
+    )
+
+    parser.add_argument(
+        "--jobs", type=int, nargs=1, required=False,
+        metavar="N", default=[None],
+        help="Number of worker processes for --batch (default: number of\n"
+             "CPUs), or for tokenizing chunks of lines of a single large\n"
+             "input file in parallel (default: 1).\n"
+    )
+
+    parser.add_argument(
+        "--cache-dir", type=str, nargs=1, required=False,
+        metavar="cache_dir", default=None,
+        help="Directory of the cache of converted programs, keyed by the\n"
+             "source file content and conversion options (default:\n"
+             "~/.cache/retrotype).  Unchanged sources are not converted\n"
+             "again.  Standard input and sources over 4 MiB are not\n"
+             "cached.\n"
+    )
+
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Always convert the source, without using the cache.\n"
+    )
+
+    parser.add_argument(
+        "--line-cache", type=int, nargs=1, required=False,
+        metavar="size", default=[0],
+        help="Remember the tokenized bytes and checksums of up to this\n"
+             "many distinct lines, reusing them for repeated lines, shared\n"
+             "by the files of a --batch run that each worker process\n"
+             "converts (every one of the --jobs workers keeps its own\n"
+             "cache).  Reports cache hits and misses.  Not used with --jobs\n"
+             "for a single input file.  (default: 0, off)\n"
+    )
+
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="After converting, keep watching the input file and reconvert\n"
+             "only the edited lines each time it is saved, rewriting the\n"
+             "output files without asking and printing the lines whose\n"
+             "checksums changed.  Press Ctrl-C to stop.\n"
     )
 
     parser.add_argument(
-        "file_in", type=str, metavar="input_file",
-        help="Specify the input file name including path.\n"
+        "--interactive", action="store_true",
+        help="Type in the program one line at a time, getting each line's\n"
+             "checksum (and reference check) as it is entered.  Lines of an\n"
+             "existing input file are loaded first.  Re-entering a line\n"
+             "number replaces the line and a line number alone deletes it.\n"
+             "Commands: LIST [first[-last]], CHECK, SAVE, QUIT.\n"
+    )
+
+    parser.add_argument(
+        "--serve", type=str, nargs=1, required=False, metavar="socket",
+        default=None,
+        help="Run as a conversion server on a Unix socket, in place of\n"
+             "converting an input file, keeping the conversion tables\n"
+             "loaded between requests.  Requests are converted by --jobs\n"
+             "worker processes (default: number of CPUs).  Use\n"
+             "retrotype-client to convert files with the server.\n"
+    )
+
+    parser.add_argument(
+        "--prg-out", type=str, nargs=1, required=False, metavar="prg_file",
+        default=None,
+        help="Program output file name, or '-' to write the program to\n"
+             "standard output (default: input file basename with extension\n"
+             "'.prg').  Required when reading standard input.\n"
+    )
+
+    parser.add_argument(
+        "--chk-out", type=str, nargs=1, required=False, metavar="chk_file",
+        default=None,
+        help="Checksum output file name, or '-' to write the checksums to\n"
+             "standard output (default: program output file basename with\n"
+             "extension '.chk', not written when reading standard input\n"
+             "and writing the program to standard output).  With either\n"
+             "output on standard output, messages go to standard error.\n"
+    )
+
+    parser.add_argument(
+        "file_in", type=str, metavar="input_file", nargs="?", default=None,
+        help="Specify the input file name including path, or '-' to read\n"
+             "standard input.\n"
              "Note:  Output file will use input file basename with\n"
              "extension '.prg' for Commodore file format."
     )
 
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if [args.file_in, args.batch, args.serve].count(None) != 2:
+        parser.error("specify either an input file, --batch, or --serve")
+    if args.serve and (args.ref or args.suggest or args.watch
+                       or args.interactive):
+        parser.error("--serve cannot be used with --ref, --suggest, --watch, "
+                     "or --interactive")
+    if args.batch and (args.ref or args.suggest):
+        parser.error("--ref and --suggest cannot be used with --batch")
+    if args.watch and (args.batch or args.suggest
+                       or args.source[0] == 'auto'):
+        parser.error("--watch cannot be used with --batch, --suggest, or "
+                     "source format 'auto'")
+    if args.interactive and (args.batch or args.watch or args.suggest
+                             or args.source[0] == 'auto'):
+        parser.error("--interactive cannot be used with --batch, --watch, "
+                     "--suggest, or source format 'auto'")
+    if (args.prg_out or args.chk_out or args.file_in == '-') and (
+            args.batch or args.serve or args.watch or args.interactive):
+        parser.error("--prg-out, --chk-out, and standard input ('-') cannot "
+                     "be used with --batch, --serve, --watch, or "
+                     "--interactive")
+    if args.file_in == '-' and not args.prg_out:
+        parser.error("reading standard input ('-') requires --prg-out")
+    if args.prg_out == ['-'] and args.chk_out == ['-']:
+        parser.error("only one of --prg-out and --chk-out can be '-'")
+    if args.jobs[0] is not None and args.jobs[0] < 1:
+        parser.error("--jobs must be at least 1")
+    if args.line_cache[0] < 0:
+        parser.error("--line-cache size must not be negative")
+    return args
+
+
+def terminal_columns():
+    """Width of the terminal in columns, from $COLUMNS if it is set, or 80 if
+    standard output is not a terminal.  Gives the same width as
+    shutil.get_terminal_size() without importing shutil at start-up.
+    """
+
+    try:
+        return int(environ['COLUMNS'])
+    except (KeyError, ValueError):
+        pass
+    try:
+        return get_terminal_size(sys.__stdout__.fileno()).columns or 80
+    except (AttributeError, ValueError, OSError):
+        return 80
 
 
 def print_checksums(ahoy_checksums, terminal_width):
@@ -112,91 +292,911 @@ def print_checksums(ahoy_checksums, terminal_width):
     print(f'\nLines: {len(ahoy_checksums)}\n')
 
 
+def print_ref_report(comparison, suggestions=None):
+    """Print the lines whose checksums do not match the reference file,
+    the lines missing from or extra to the program, and the line counts.
+    """
+
+    unchecked = comparison.extra if comparison.sample else []
+    if comparison.ok and unchecked:
+        print(f'All {comparison.ref_line_count} listed lines match the '
+              'reference file.\n')
+        return
+    if comparison.ok:
+        print(f'All {comparison.line_count} lines match the reference file.'
+              '\n')
+        return
+
+    print('Reference Check:\n')
+    if comparison.mismatched:
+        print('Mismatched lines (line, checksum, reference):')
+        for (line_num, code, ref_code) in comparison.mismatched:
+            print(f'    {line_num} {code} {ref_code}')
+            if suggestions is None:
+                continue
+            if not suggestions.get(line_num):
+                print('        no single character correction found')
+            for suggestion in suggestions.get(line_num, ()):
+                print(f'        {suggestion.description}:  '
+                      f'{suggestion.listing}')
+        print()
+    if comparison.missing:
+        print('Missing lines: '
+              f'{", ".join(str(num) for num in comparison.missing)}\n')
+    if comparison.extra and not comparison.sample:
+        print('Extra lines: '
+              f'{", ".join(str(num) for num in comparison.extra)}\n')
+    print(f'Lines: {comparison.line_count} '
+          f'(reference: {comparison.ref_line_count})\n')
+
+
 def command_line_runner(argv=None, width=None):
 
     # call function to parse command line input arguments
     args = parse_args(argv)
 
-    # call function to read input file lines
+    if args.batch:
+        return batch_runner(args)
+
+    if args.serve:
+        from retrotype import server
+        return server.serve(args.serve[0], args.jobs[0])
+
+    (bin_file, chk_file) = output_names(args)
+    if '-' in (bin_file, chk_file):
+        # standard output carries an output file, so messages go to
+        # standard error instead
+        data_out = sys.stdout
+        with redirect_stdout(sys.stderr):
+            return file_runner(args, bin_file, chk_file, width, data_out)
+    return file_runner(args, bin_file, chk_file, width)
+
+
+def output_names(args):
+    """Output file names for the input file, from --prg-out and --chk-out or
+    from the input file basename, where '-' is standard output and a
+    checksum file name of None means no checksum file is written.
+    """
+
+    file_stem = path.splitext(args.file_in)[0]
+    bin_file = args.prg_out[0] if args.prg_out else f'{file_stem}.prg'
+    if args.chk_out:
+        chk_file = args.chk_out[0]
+    elif bin_file != '-':
+        chk_file = f'{path.splitext(bin_file)[0]}.chk'
+    elif args.file_in != '-':
+        chk_file = f'{file_stem}.chk'
+    else:
+        chk_file = None
+    return (bin_file, chk_file)
+
+
+def file_runner(args, bin_file, chk_file, width=None, data_out=None):
+    """Convert the input file, or standard input, writing the program and
+    checksum files and reporting the checksums.  An output file named '-' is
+    written to data_out once every line has been converted, so a failed
+    conversion writes nothing.
+    """
+
+    source = args.source[0]
+
+    # call function to read reference file of magazine checksums
+    ref_codes = None
+    if args.ref:
+        try:
+            ref_codes = read_ref_file(args.ref[0])
+        except (IOError, ValueError) as error:
+            print(f"Reference file read failed - {error}")
+            sys.exit(1)
+    elif source == 'auto':
+        print("Source format 'auto' requires a reference file (--ref).")
+        sys.exit(1)
+    elif args.suggest:
+        print("Option --suggest requires a reference file (--ref).")
+        sys.exit(1)
+
+    if args.watch:
+        return watch_runner(args, ref_codes, width)
+
+    if args.interactive:
+        return interactive_runner(args, ref_codes, width)
+
+    load_addr = int(args.loadaddr[0], 16)
+
+    # line text for suggestions is only available by converting the source
+    cache = None
+    if not (args.no_cache or args.suggest):
+        from retrotype.cache import ConversionCache
+        cache = ConversionCache(args.cache_dir and args.cache_dir[0])
+
+    # open input file, whose lines are read, checked, and converted one at a
+    # time as the outputs are written, unless it is already in the cache
     try:
-        lines_list = read_file(args.file_in)
+        (source_file, cache_key, cached) = open_source(args.file_in, cache,
+                                                       source, load_addr)
     except IOError:
         print("File read failed - please check source file name and path.")
         sys.exit(1)
 
-    # check each line to insure each starts with a line number
-    check_line_number_seq(lines_list)
-
-    # Create lines list while checking for loose brackets/braces and converting
-    # to common special character codes in braces
-    if args.source[0][:4] == 'ahoy':
-        lines_list = ahoy_lines_list(lines_list)
-        # handle loose brace error returned from ahoy_lines_list()
-        if lines_list[0] is None:
-            line_no = split_line_num(lines_list[1])[0]
-            print(f"Loose brace/bracket error in line: {line_no}\n"
-                  "Special characters should be enclosed in braces/brackets.\n"
-                  "Please check for unmatched single brace/bracket in above "
-                  "line.")
+    # stream outputs to temporary files that are only put in place once every
+    # line has been converted, spooling an output for standard output in
+    # memory, or on disk once it is large
+    bin_temp = chk_temp = None
+    if bin_file != '-':
+        bin_temp = f'{bin_file}.{getpid()}.tmp'
+    if chk_file not in (None, '-'):
+        chk_temp = f'{chk_file}.{getpid()}.tmp'
+    data_temp = None
+    if data_out is not None:
+        from tempfile import SpooledTemporaryFile
+        data_temp = SpooledTemporaryFile(
+            DATA_SPOOL_BYTES, 'w+b' if bin_temp is None else 'w+')
+
+    source_lines = {} if args.suggest else None
+    line_cache = None
+    ahoy_checksums = None
+    comparison = None
+
+    try:
+        with ExitStack() as stack:
+            source_in = stack.enter_context(source_file)
+            if data_temp is not None:
+                stack.callback(data_temp.close)
+            if bin_temp is None:
+                bin_out = data_temp
+            else:
+                bin_out = stack.enter_context(open(bin_temp, 'xb'))
+            if chk_temp is not None:
+                chk_out = stack.enter_context(open(chk_temp, 'x'))
+            elif chk_file == '-':
+                chk_out = data_temp
+            else:
+                chk_out = stack.enter_context(open(devnull, 'w'))
+
+            if cached is not None:
+                bin_out.write(cached.prg)
+                checksums = iter(cached.checksums)
+            else:
+                prg = PrgBuilder(load_addr, bin_out)
+
+                # check each line to insure each starts with a line number
+                lines = iter_source_lines(source_in)
+                if args.jobs[0] and args.jobs[0] > 1:
+                    checksums = convert_chunks(iter_numbered_lines(lines),
+                                               prg, source, args.jobs[0],
+                                               source_lines)
+                else:
+                    records = iter_checked_lines(lines)
+                    if args.line_cache[0]:
+                        line_cache = LineCache(args.line_cache[0])
+                    checksums = convert_lines(records, prg, source,
+                                              source_lines, line_cache)
+                if cache_key is not None:
+                    cache_checksums = []
+                    checksums = _recorded(checksums, cache_checksums)
+
+            # every format is computed in one pass when detecting the
+            # format, keeping the codes until the format is known
+            sample = source == 'auto'
+            if sample:
+                (source, checksums) = select_checksums(checksums, ref_codes)
+
+            # Write text file containing line numbers, checksums, and line
+            # count, comparing to the reference file on the way through.  A
+            # sample reference for 'auto' leaves lines unchecked, so their
+            # checksums are kept to list them all.
+            checksums = stream_checksums(chk_out, checksums)
+            if ref_codes is None or sample:
+                checksums = ahoy_checksums = list(checksums)
+            if ref_codes is not None:
+                comparison = compare_checksums(checksums, ref_codes, sample)
+
+            if cached is None:
+                prg.finish()
+            if data_temp is not None:
+                write_spooled(data_temp, data_out)
+
+        # a program only written to standard output is not kept to cache
+        if cache_key is not None and cached is None and bin_temp is not None:
+            with open(bin_temp, 'rb') as file:
+                cache.put(cache_key, file.read(), cache_checksums)
+
+        prg_size = len(cached.prg) if cached is not None else prg.written
+        if load_addr + prg_size - 4 > 0xffff:
+            print("Warning: program extends past the end of memory - line "
+                  "link addresses wrap around.\n")
+
+        if line_cache is not None:
+            print_line_cache_stats(line_cache.hits, line_cache.misses)
+
+        # Write binary file compatible with Commodore computers or
+        # emulators, without asking before replacing a file when standard
+        # input is the source rather than free for the answer
+        if bin_temp is not None:
+            place_binary(bin_temp, bin_file, confirm=args.file_in != '-')
+        if chk_temp is not None:
+            replace(chk_temp, chk_file)
+
+    finally:
+        for temp in (bin_temp, chk_temp):
+            if temp is not None and path.exists(temp):
+                remove(temp)
+
+    report_checksums(comparison, ahoy_checksums, width, source_lines, source)
+
+
+def report_checksums(comparison, ahoy_checksums, width=None,
+                     source_lines=None, source=None):
+    """Report only lines that differ from the reference file if there is a
+    comparison, with suggested corrections if the source lines are given,
+    else print line checksums formatted to the width of the terminal.
+    Exits with status 1 if any line does not match the reference file.
+    """
+
+    if comparison is not None:
+        suggestions = None
+        if source_lines is not None:
+            from retrotype.suggest import suggest_corrections
+            suggestions = {
+                line_num: suggest_corrections(source_lines[line_num],
+                                              ref_code, source)
+                for (line_num, _, ref_code) in comparison.mismatched}
+        print_ref_report(comparison, suggestions)
+        if comparison.sample and comparison.extra:
+            # lines a sample reference does not list are left to be checked
+            # by hand against the magazine
+            print('Line Checksums:\n')
+            print_checksums(ahoy_checksums, width or terminal_columns())
+        if not comparison.ok:
             sys.exit(1)
+    else:
+        print('Line Checksums:\n')
+        if not width:
+            width = terminal_columns()
+        print_checksums(ahoy_checksums, width)
+
+
+def write_spooled(spool, data_out):
+    """Copy a spooled output to standard output, as bytes to its buffer for a
+    binary spool.
+    """
+
+    spool.seek(0)
+    if 'b' in spool.mode:
+        data_out = getattr(data_out, 'buffer', data_out)
+    for block in iter(lambda: spool.read(DATA_BLOCK_SIZE), spool.read(0)):
+        data_out.write(block)
+    data_out.flush()
+
+
+def open_source(filename, cache, source, load_addr):
+    """Open a source file, or standard input for '-', first looking up its
+    content in the cache if there is one.  Returns the open file along with
+    the cache key and the cached entry, or None for each if not found.
+    Standard input and a file too large for the cache are opened to stream
+    without a key, so they are never read whole.
+    """
+
+    if filename == '-':
+        return (nullcontext(sys.stdin), None, None)
+    if cache is None or path.getsize(filename) > cache.max_source_bytes:
+        return (open(filename), None, None)
+    with open(filename, 'rb') as file:
+        data = file.read()
+    key = cache.key(data, source, load_addr)
+    return (TextIOWrapper(BytesIO(data)), key, cache.get(key))
+
+
+def _recorded(items, record):
+    """Pass items on, keeping a copy of each in a list."""
+
+    for item in items:
+        record.append(item)
+        yield item
+
+
+def select_checksums(line_codes, ref_codes):
+    """Detect the source format from the checksums of every format for each
+    line, returning it with the checksums in that format.
+    """
+
+    line_codes = list(line_codes)
+    detected = detect_source(line_codes, ref_codes)
+    if detected is None:
+        print("Unable to detect source format - no line checksums match the "
+              "reference file.")
+        sys.exit(1)
+    (source, matches) = detected
+    print(f"Detected source format: {source} ({matches} of "
+          f"{len(ref_codes)} reference lines match)\n")
+    return (source, [(line_num, codes[source])
+                     for (line_num, codes) in line_codes])
 
-    addr = int(args.loadaddr[0], 16)
 
-    out_list = []
-    ahoy_checksums = []
+def convert_lines(records, prg, source, source_lines=None, line_cache=None):
+    """Tokenize each checked line of the program as it arrives, adding it to
+    the program image and passing on its checksum.  Repeated lines are taken
+    from the line cache if one is given.
+    """
+
+    convert = convert_line if line_cache is None else line_cache.convert
+
+    for record in records:
+        line_num = record.line_num
+        # call tokenizer and checksum generator functions, with every format
+        # computed in one pass when detecting the format
+        try:
+            (byte_list, checksum) = convert(line_num, record.text, source)
+        except ValueError:
+            if bad_char_column(record) is None:
+                raise
+            bad_char_exit(record)
+        # handle loose brace error returned for Ahoy special characters
+        if byte_list is None:
+            loose_brace_exit(record)
+
+        # append link address, line number, and tokens to program image
+        prg.add_line(line_num, byte_list)
+
+        # keep line text for suggesting corrections to mismatched lines
+        if source_lines is not None:
+            source_lines[line_num] = f'{line_num} {record.text}'
+
+        yield (line_num, checksum)
+
+
+def print_line_cache_stats(hits, misses, workers=1):
+    """Print how often converted lines were found in the line cache, or in
+    the separate caches of the given number of batch worker processes.
+    """
+
+    total = hits + misses
+    rate = f' ({100 * hits // total}% hit rate)' if total else ''
+    scope = f' in {workers} worker process caches' if workers > 1 else ''
+    print(f'Line cache: {hits} hits, {misses} misses{scope}{rate}\n')
+
+
+def convert_chunks(records, prg, source, jobs, source_lines=None,
+                   chunk_size=1000):
+    """Tokenize and checksum chunks of lines in worker processes, linking
+    them into the program image in order as each chunk comes back.  Gives
+    the same image, checksums, and errors as convert_lines(): records are
+    read ahead of the chunks linked, so a LineNumberError they raise is only
+    reported, exiting, once every line before it has been checked.
+    """
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    number_error = None
+    with ProcessPoolExecutor(jobs) as executor:
+        pending = deque()
+        chunk = []
+        try:
+            for record in records:
+                chunk.append(record)
+                # keep line text for suggesting corrections to mismatched
+                # lines
+                if source_lines is not None:
+                    source_lines[record.line_num] = (f'{record.line_num} '
+                                                     f'{record.text}')
+                if len(chunk) < chunk_size:
+                    continue
+                pending.append(executor.submit(tokenize_chunk, chunk, source))
+                chunk = []
+                # keep a few chunks per worker in flight to bound memory use
+                if len(pending) > jobs * 2:
+                    yield from _link_chunk(pending.popleft().result(), prg)
+        except LineNumberError as error:
+            number_error = error
+        if chunk:
+            pending.append(executor.submit(tokenize_chunk, chunk, source))
+        while pending:
+            yield from _link_chunk(pending.popleft().result(), prg)
+
+    if number_error is not None:
+        print(f"{number_error}  Exiting.")
+        sys.exit(1)
+
+
+def _link_chunk(result, prg):
+    """Add a chunk tokenized by a worker to the program image, passing on
+    its checksums.
+    """
+
+    (blob, sizes, checksums, error) = result
+    prg.add_chunk(blob, sizes)
+    yield from checksums
+    if error is not None:
+        if loose_brace_column(error) is None:
+            bad_char_exit(error)
+        loose_brace_exit(error)
+
+
+def loose_brace_exit(record):
+    """Report the line with a loose brace or bracket and exit."""
+
+    print(loose_brace_message(record))
+    sys.exit(1)
+
+
+def bad_char_exit(record):
+    """Report the line with a character that has no Commodore equivalent and
+    exit.
+    """
+
+    print(BadCharError(record))
+    sys.exit(1)
+
+
+def loose_brace_message(record):
+    """Describe the line with a loose brace or bracket."""
+
+    return (f"Loose brace/bracket error in line: {record.line_num} "
+            f"(source line {record.row}, column "
+            f"{loose_brace_column(record)})\n"
+            "Special characters should be enclosed in braces/brackets.\n"
+            "Please check for unmatched single brace/bracket in above line.")
+
+
+class BatchResult(NamedTuple):
+    """Outcome of converting one file in batch mode"""
+
+    filename: str
+    status: str  # 'ok', 'mismatch', or 'error'
+    message: str
+    line_count: int
+    mismatches: int  # mismatched, missing, and extra reference lines
+    prg: bytes
+    chk: bytes
+    line_hits: int = 0  # line cache hits and misses while converting
+    line_misses: int = 0
+
+
+def batch_files(pattern):
+    """List the files to convert for --batch in a fixed, sorted order."""
+
+    from glob import glob
+
+    if path.isdir(pattern):
+        pattern = path.join(pattern, '*.ahoy')
+    return sorted(name for name in glob(pattern) if path.isfile(name))
+
+
+# line cache shared by every file a batch worker process converts
+_batch_line_cache = None
+
+
+def convert_batch_file(filename, source, load_addr, cache_dir=None,
+                       line_cache_size=0):
+    """Convert one source file for batch mode, returning the program image
+    and checksum file contents rather than writing them.  Runs in a worker
+    process, so the messages it would print are captured instead.
+    """
+
+    global _batch_line_cache
+    if not line_cache_size:
+        return _convert_batch_file(filename, source, load_addr, cache_dir)
+
+    if (_batch_line_cache is None
+            or _batch_line_cache.maxsize != line_cache_size):
+        _batch_line_cache = LineCache(line_cache_size)
+    line_cache = _batch_line_cache
+    (hits, misses) = (line_cache.hits, line_cache.misses)
+    result = _convert_batch_file(filename, source, load_addr, cache_dir,
+                                 line_cache)
+    return result._replace(line_hits=line_cache.hits - hits,
+                           line_misses=line_cache.misses - misses)
+
+
+def _convert_batch_file(filename, source, load_addr, cache_dir,
+                        line_cache=None):
+    out = StringIO()
+    ref_file = f'{path.splitext(filename)[0]}.ref'
+    cache = None
+    if cache_dir is not None:
+        from retrotype.cache import ConversionCache
+        cache = ConversionCache(cache_dir)
+    line_count = 0
+    try:
+        with redirect_stdout(out):
+            ref_codes = None
+            if path.exists(ref_file):
+                ref_codes = read_ref_file(ref_file)
+            elif source == 'auto':
+                raise ValueError("Source format 'auto' requires a reference "
+                                 "file")
+
+            chk = StringIO()
+            (source_file, cache_key, cached) = open_source(filename, cache,
+                                                           source, load_addr)
+            with source_file:
+                if cached is not None:
+                    prg_bytes = cached.prg
+                    checksums = iter(cached.checksums)
+                else:
+                    prg = PrgBuilder(load_addr)
+                    records = iter_checked_lines(
+                        iter_source_lines(source_file))
+                    cache_checksums = []
+                    checksums = _recorded(
+                        convert_lines(records, prg, source,
+                                      line_cache=line_cache),
+                        cache_checksums)
+                sample = source == 'auto'
+                if sample:
+                    (source, checksums) = select_checksums(checksums,
+                                                           ref_codes)
+                checksums = stream_checksums(chk, checksums)
+                if ref_codes is not None:
+                    comparison = compare_checksums(checksums, ref_codes,
+                                                   sample)
+                    line_count = comparison.line_count
+                else:
+                    line_count = sum(1 for _ in checksums)
+
+    except SystemExit:
+        message = next((line for line in out.getvalue().splitlines()
+                        if line), 'Conversion failed')
+        return BatchResult(filename, 'error', message, line_count, 0, b'',
+                           b'')
+    except (IOError, ValueError) as error:
+        return BatchResult(filename, 'error', str(error), line_count, 0, b'',
+                           b'')
+
+    if cached is None:
+        with prg.image() as image:
+            prg_bytes = image.tobytes()
+        if cache_key is not None:
+            cache.put(cache_key, prg_bytes, cache_checksums)
 
-    for line in lines_list:
-        # split each line into line number and remaining text
-        (line_num, line_txt) = split_line_num(line)
+    mismatches = 0
+    if ref_codes is not None:
+        mismatches = (len(comparison.mismatched) + len(comparison.missing)
+                      + (0 if comparison.sample else len(comparison.extra)))
+    return BatchResult(filename, 'mismatch' if mismatches else 'ok', source,
+                       line_count, mismatches, prg_bytes,
+                       chk.getvalue().encode())
 
-        token_ln = []
-        # add load address at start of first line only
-        if addr == int(args.loadaddr[0], 16):
-            token_ln.append(addr.to_bytes(2, 'little'))
-        byte_list = scan_manager(line_txt)
 
-        addr = addr + len(byte_list) + 4
+def batch_runner(args):
+    """Convert every file matched by --batch, spread over a pool of worker
+    processes, and print a summary in file name order.
+    """
+
+    files = batch_files(args.batch[0])
+    if not files:
+        print(f"No files found for batch - {args.batch[0]}")
+        sys.exit(1)
+
+    source = args.source[0]
+    load_addr = int(args.loadaddr[0], 16)
+    jobs = min(args.jobs[0] or cpu_count() or 1, len(files))
+    cache_dir = None
+    if not args.no_cache:
+        from retrotype.cache import default_cache_dir
+        cache_dir = (args.cache_dir[0] if args.cache_dir
+                     else default_cache_dir())
+    convert = partial(convert_batch_file, source=source, load_addr=load_addr,
+                      cache_dir=cache_dir,
+                      line_cache_size=args.line_cache[0])
+
+    if jobs == 1:
+        results = map(convert, files)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(jobs)
+        results = executor.map(convert, files,
+                               chunksize=max(1, len(files) // (jobs * 4)))
+
+    print('Batch Summary:\n')
+    width = max(len(filename) for filename in files)
+    counts = dict.fromkeys(('ok', 'mismatch', 'error'), 0)
+    line_hits = line_misses = 0
+    try:
+        for result in results:
+            counts[result.status] += 1
+            line_hits += result.line_hits
+            line_misses += result.line_misses
+            if result.status != 'error':
+                stem = path.splitext(result.filename)[0]
+                _write_output(f'{stem}.prg', result.prg)
+                _write_output(f'{stem}.chk', result.chk)
+            detail = f'{result.line_count} lines'
+            if result.status == 'mismatch':
+                detail += f', {result.mismatches} mismatched'
+            if result.status == 'error':
+                detail = result.message
+            else:
+                detail += f' ({result.message})'
+            print(f'    {result.filename:<{width}}  {result.status:<8}  '
+                  f'{detail}')
+    finally:
+        if jobs > 1:
+            executor.shutdown()
+
+    print(f'\nFiles: {len(files)} (ok: {counts["ok"]}, mismatched: '
+          f'{counts["mismatch"]}, errors: {counts["error"]})\n')
+    if args.line_cache[0]:
+        print_line_cache_stats(line_hits, line_misses, jobs)
+    if counts['mismatch'] or counts['error']:
+        sys.exit(1)
+
+
+def watch_runner(args, ref_codes=None, width=None):
+    """Convert the input file, then reconvert only the lines that change
+    each time it is saved, until interrupted.
+    """
+
+    from retrotype import watch
 
-        token_ln.extend((addr.to_bytes(2, 'little'),
-                         line_num.to_bytes(2, 'little'), byte_list))
+    state = watch.ProgramState(args.source[0], int(args.loadaddr[0], 16))
+    file_stem = path.splitext(args.file_in)[0]
 
-        token_ln = [byte for sublist in token_ln for byte in sublist]
+    # start watching before converting so no save is missed
+    watcher = watch.file_watcher(args.file_in)
+    try:
+        update_watched(args.file_in, state, file_stem, ref_codes, width,
+                       initial=True)
+        print(f'Watching "{args.file_in}" for changes - press Ctrl-C to '
+              'stop.\n')
+        while True:
+            watcher.wait()
+            update_watched(args.file_in, state, file_stem, ref_codes)
+    except KeyboardInterrupt:
+        print('Stopped watching.')
+    finally:
+        watcher.close()
+
+
+def update_watched(filename, state, file_stem, ref_codes, width=None,
+                   initial=False):
+    """Bring a watched program up to date with its source file, rewriting
+    the outputs and reporting the lines whose checksums changed.  Errors in
+    the source are reported without stopping the watch.
+    """
 
-        # call checksum generator function to build list of tuples
-        if args.source[0] == 'ahoy1':
-            ahoy_checksums.append((line_num,
-                                   ahoy1_checksum(byte_list)))
-        elif args.source[0] == 'ahoy2':
-            ahoy_checksums.append((line_num, 
-                                   ahoy2_checksum(byte_list)))
-        elif args.source[0] == 'ahoy3':
-            ahoy_checksums.append((line_num,
-                                   ahoy3_checksum(line_num, byte_list)))
+    out = StringIO()
+    try:
+        with redirect_stdout(out):
+            with open(filename) as source_file:
+                records = check_line_number_seq(
+                    iter_source_lines(source_file))
+        changes = state.update(records)
+    except IOError:
+        print("File read failed - please check source file name and path.")
+        return
+    except SystemExit:
+        print(out.getvalue())
+        return
+    except LooseBraceError as error:
+        print(f'{loose_brace_message(error.record)}\n')
+        return
+    except ConversionError as error:
+        print(f'{error}\n')
+        return
+
+    if not (initial or changes or state.converted):
+        return
+
+    with state.prg.image() as image:
+        _write_output(f'{file_stem}.prg', image)
+    chk = StringIO()
+    for _ in stream_checksums(chk, state.checksums):
+        pass
+    _write_output(f'{file_stem}.chk', chk.getvalue().encode())
+
+    if initial and ref_codes is not None:
+        print_ref_report(compare_checksums(state.checksums, ref_codes))
+    elif initial:
+        print('Line Checksums:\n')
+        if not width:
+            width = terminal_columns()
+        print_checksums(state.checksums, width)
+    else:
+        print_watch_changes(changes, ref_codes, len(state.lines))
+
+
+def print_watch_changes(changes, ref_codes, line_count):
+    """Print the lines whose checksums an edit changed, added, or removed,
+    with their reference status.
+    """
+
+    print('Changed lines:\n')
+    for (line_num, old_code, new_code) in changes:
+        if new_code is None:
+            status = '-- removed'
+        elif old_code is None:
+            status = f'{new_code} (new line)'
         else:
-            print("Magazine format not yet supported.")
+            status = f'{new_code} (was {old_code})'
+        ref_code = None if ref_codes is None else ref_codes.get(line_num)
+        if new_code is not None and ref_code is not None:
+            status += (' - matches reference' if ref_code == new_code
+                       else f' - reference {ref_code}')
+        print(f'    {line_num} {status}')
+    print(f'\nLines: {line_count}\n')
+
+
+def interactive_runner(args, ref_codes=None, width=None):
+    """Read program lines and commands typed at the terminal until QUIT or
+    end of input, giving each line's checksum as it is entered.
+    """
+
+    from retrotype.interactive import TypedProgram
+
+    program = TypedProgram(args.source[0], int(args.loadaddr[0], 16))
+    file_stem = path.splitext(args.file_in)[0]
+    # lines of the input file that could not be loaded, which SAVE would
+    # otherwise drop from the source file, as (row, line as read) keyed by
+    # line number, with those without a line number kept apart as they can
+    # only be fixed in the file
+    rejected = {}
+    unnumbered = []
+
+    if path.exists(args.file_in):
+        try:
+            with open(args.file_in) as source_file:
+                for (row, line) in enumerate(source_file, 1):
+                    if (not line.strip()
+                            or enter_typed_line(program, line, ref_codes,
+                                                quiet=True)):
+                        continue
+                    line_num = parse_source_line(line).line_num
+                    if line_num is None:
+                        unnumbered.append((row, line))
+                    else:
+                        rejected[line_num] = (row, line)
+        except IOError:
+            print("File read failed - please check source file name and "
+                  "path.")
             sys.exit(1)
+        program.modified = False
+        print(f'Loaded {len(program)} lines from "{args.file_in}".\n')
 
-        out_list.append(token_ln)
+    print(f'Type in program lines for "{args.file_in}" '
+          f'({args.source[0]}).  Commands: LIST, CHECK, SAVE, QUIT.\n')
 
-    out_list.append([0, 0])
+    quit_requested = False
+    while True:
+        try:
+            line = input()
+        except (EOFError, KeyboardInterrupt):
+            if program.modified:
+                print('Unsaved changes discarded.')
+            break
+        command = line.strip().lower()
+        if not command:
+            continue
+        if command[0].isdigit():
+            line_num = parse_source_line(command).line_num
+            if (line_num in rejected and line_num not in program.lines
+                    and command == str(line_num)):
+                # deleting a line that could not be loaded
+                del rejected[line_num]
+                print(f'    {line_num} deleted')
+            elif enter_typed_line(program, line, ref_codes):
+                rejected.pop(line_num, None)
+        elif command.split()[0] == 'list':
+            list_typed_lines(program, command[4:])
+        elif command == 'check':
+            if ref_codes is not None:
+                print_ref_report(compare_checksums(program.checksums,
+                                                   ref_codes))
+            else:
+                print('Line Checksums:\n')
+                print_checksums(program.checksums,
+                                width or terminal_columns())
+        elif command == 'save':
+            if rejected or unnumbered:
+                print_rejected_lines(
+                    sorted([*rejected.values(), *unnumbered]), args.file_in)
+            else:
+                save_typed_program(program, args.file_in, file_stem)
+        elif command in ('quit', 'exit'):
+            if program.modified and not quit_requested:
+                print('Unsaved changes - SAVE them, or QUIT again to '
+                      'discard them.\n')
+                quit_requested = True
+                continue
+            break
+        else:
+            print(f'Unknown command: {line.strip()}')
+        quit_requested = False
+
+
+def enter_typed_line(program, line, ref_codes, quiet=False):
+    """Enter a typed line into the program, printing its checksum and
+    reference status, or the error found in the line.  Returns False if the
+    line could not be entered.
+    """
+
+    try:
+        entered = program.enter(line)
+    except ValueError as error:
+        if quiet:
+            print(f'    {line.strip()}')
+        print(f'    Error: {error}')
+        return False
+    if quiet:
+        return True
+    if entered is None:
+        print(f'    {line.strip()} deleted')
+        return True
+    status = ''
+    ref_code = None if ref_codes is None else ref_codes.get(entered.line_num)
+    if ref_code is not None:
+        status = (' - matches reference' if ref_code == entered.checksum
+                  else f' - reference {ref_code}')
+    elif ref_codes is not None:
+        status = ' - not in reference'
+    print(f'    {entered.line_num} {entered.checksum}{status}')
+    return True
 
-    dec_list = [byte for sublist in out_list for byte in sublist]
 
-    file_stem = args.file_in.split('.')[0]
-    bin_file = f'{file_stem}.prg'
+def list_typed_lines(program, line_range):
+    """List the program lines with their checksums, optionally only those in
+    a range of line numbers given as 'first', 'first-last', 'first-' or
+    '-last'.
+    """
+
+    (first, dash, last) = line_range.strip().partition('-')
+    try:
+        first = int(first) if first.strip() else 0
+        last = int(last) if last.strip() else None
+    except ValueError:
+        print(f'Invalid line range: {line_range.strip()}')
+        return
+    if not dash:
+        last = first if line_range.strip() else None
+    for line in program.ordered(first, last):
+        print(f'{line.checksum:>4}  {line.listing}')
+    print(f'\nLines: {len(program)}\n')
+
+
+def print_rejected_lines(rejected, filename):
+    """Refuse to save while lines of the input file that could not be loaded
+    remain, as saving would drop them from the source file.  Lines are given
+    as (row, line as read) tuples in file order.
+    """
+
+    print(f'Not saved - these lines of "{filename}" could not be loaded and '
+          'would be lost:\n')
+    for (_, line) in rejected:
+        print(f'    {line.strip()}')
+    print('\nRe-enter or delete them (lines without a line number must be '
+          'fixed in the file)\nbefore saving.\n')
+
+
+def save_typed_program(program, filename, file_stem):
+    """Write the typed program's source, program image, and checksum files,
+    replacing any earlier versions.
+    """
+
+    listing = ''.join(f'{line.listing}\n' for line in program.ordered())
+    chk = StringIO()
+    for _ in stream_checksums(chk, program.checksums):
+        pass
+    prg = program.build()
+    try:
+        _write_output(filename, listing.encode())
+        with prg.image() as image:
+            _write_output(f'{file_stem}.prg', image)
+        _write_output(f'{file_stem}.chk', chk.getvalue().encode())
+    except IOError as error:
+        print(f'Save failed - {error}\n')
+        return
+    program.modified = False
+    print(f'Saved {len(program)} lines to "{filename}", "{file_stem}.prg" '
+          f'and "{file_stem}.chk".\n')
 
-    # Write binary file compatible with Commodore computers or emulators
-    write_binary(bin_file, dec_list)
 
-    # Print line checksums to terminal, formatted based on screen width
-    print('Line Checksums:\n')
-    if not width:
-        width = get_terminal_size()[0]
-    print_checksums(ahoy_checksums, width)
+def _write_output(filename, data):
+    """Replace an output file with new contents in one step."""
 
-    # Write text file containing line numbers, checksums, and line count
-    chk_file = f'{file_stem}.chk'
-    write_checksums(chk_file, ahoy_checksums)
+    temp = f'{filename}.{getpid()}.tmp'
+    with open(temp, 'wb') as file:
+        file.write(data)
+    replace(temp, filename)
 
 
 if __name__ == '__main__':
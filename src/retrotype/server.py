@@ -0,0 +1,264 @@
+"""
+Long running conversion server listening on a Unix socket, so that many
+small programs can be converted without starting the interpreter and
+building the token tables for each one.
+
+Each request and response is one line of JSON.  A request gives the source
+text and the command line options of retrotype_cli:
+
+    {"text": "10 PRINT...", "source": "ahoy2", "load_addr": "0x0801",
+     "ref": "10 EO\n...", "suggest": false, "width": 80}
+
+Only "text" is required.  The response gives the exit status and terminal
+output retrotype_cli would give, split into the messages printed before the
+output files are written and the report printed after, along with the
+output files themselves (the program file base64 encoded), or null for
+each if the conversion failed:
+
+    {"status": 0, "messages": "", "report": "Line Checksums:...",
+     "prg": "AQgOCAoAmSJIRUxMTyIAAAA=", "chk": "10 EO\n\nLines: 1\n"}
+"""
+
+import asyncio
+from base64 import b64encode
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+import json
+from os import cpu_count, path, remove
+import signal
+import socket
+import sys
+
+try:
+    from retrotype.retrotype import (iter_source_lines,
+                                     iter_checked_lines,
+                                     parse_ref_lines,
+                                     compare_checksums,
+                                     PrgBuilder,
+                                     stream_checksums,
+                                     )
+    from retrotype.retrotype_cli import (convert_lines,
+                                         select_checksums,
+                                         report_checksums,
+                                         )
+except ImportError:  # Case for direct python execution
+    from retrotype import (iter_source_lines,
+                           iter_checked_lines,
+                           parse_ref_lines,
+                           compare_checksums,
+                           PrgBuilder,
+                           stream_checksums,
+                           )
+    from retrotype_cli import (convert_lines,
+                               select_checksums,
+                               report_checksums,
+                               )
+
+# largest request line accepted, enough for any program that fits in memory
+MAX_REQUEST = 16 * 1024 * 1024
+
+
+def convert_request(request):
+    """Convert the source text of a request as retrotype_cli converts a file,
+    capturing its output rather than printing it and returning the output
+    files rather than writing them.
+
+    Args:
+        request (dict): Request decoded from JSON
+
+    Returns:
+        dict: Response to encode as JSON
+    """
+
+    messages = StringIO()
+    report = StringIO()
+    response = {'status': 1, 'messages': '', 'report': '', 'prg': None,
+                'chk': None}
+    try:
+        text = request['text']
+        source = request.get('source', 'ahoy2')
+        load_addr = request.get('load_addr', '0x0801')
+        if isinstance(load_addr, str):
+            load_addr = int(load_addr, 16)
+        if source not in ('ahoy1', 'ahoy2', 'ahoy3', 'auto'):
+            raise ValueError(f'unknown source format {source}')
+    except (KeyError, TypeError, ValueError) as error:
+        response['messages'] = f'Invalid request - {error}\n'
+        return response
+
+    try:
+        with redirect_stdout(messages):
+            ref_codes = None
+            if request.get('ref') is not None:
+                try:
+                    ref_codes = parse_ref_lines(request['ref'].splitlines())
+                except ValueError as error:
+                    print(f"Reference file read failed - {error}")
+                    sys.exit(1)
+            elif source == 'auto':
+                print("Source format 'auto' requires a reference file "
+                      "(--ref).")
+                sys.exit(1)
+            elif request.get('suggest'):
+                print("Option --suggest requires a reference file (--ref).")
+                sys.exit(1)
+
+            prg = PrgBuilder(load_addr)
+            source_lines = {} if request.get('suggest') else None
+            records = iter_checked_lines(iter_source_lines(StringIO(text)))
+            checksums = convert_lines(records, prg, source, source_lines)
+            sample = source == 'auto'
+            if sample:
+                (source, checksums) = select_checksums(checksums, ref_codes)
+            chk = StringIO()
+            checksums = ahoy_checksums = list(stream_checksums(chk,
+                                                               checksums))
+            comparison = None
+            if ref_codes is not None:
+                comparison = compare_checksums(checksums, ref_codes, sample)
+
+            if load_addr + len(prg.data) - 4 > 0xffff:
+                print("Warning: program extends past the end of memory - "
+                      "line link addresses wrap around.\n")
+    except SystemExit:
+        response['messages'] = messages.getvalue()
+        return response
+    except (ValueError, OverflowError) as error:
+        # a conversion error the conversion does not report itself, given
+        # as retrotype_cli --batch gives it
+        response['messages'] = f'{messages.getvalue()}{error}\n'
+        return response
+
+    with prg.image() as image:
+        response['prg'] = b64encode(image).decode('ascii')
+    response['chk'] = chk.getvalue()
+    response['messages'] = messages.getvalue()
+    response['status'] = 0
+    try:
+        with redirect_stdout(report):
+            report_checksums(comparison, ahoy_checksums,
+                             request.get('width') or 80, source_lines,
+                             source)
+    except SystemExit as exit:
+        response['status'] = exit.code
+    response['report'] = report.getvalue()
+    return response
+
+
+def handle_request_line(line):
+    """Decode a request line, convert it, and encode the response line.
+    Runs in a worker process, so decoding and encoding are off the event
+    loop as well.
+    """
+
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError('request should be a JSON object')
+    except ValueError as error:
+        response = {'status': 1, 'messages': f'Invalid request - {error}\n',
+                    'report': '', 'prg': None, 'chk': None}
+    else:
+        response = convert_request(request)
+    return json.dumps(response).encode() + b'\n'
+
+
+def _init_worker():
+    """Leave interrupts to the server process, and convert a line so the
+    worker's tables are ready for the first request.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    convert_request({'text': '10 print"{cd}"'})
+
+
+def _started():
+    return True
+
+
+def serve(socket_path, jobs=None):
+    """Serve conversion requests on a Unix socket until interrupted or
+    terminated, converting in a pool of worker processes.
+
+    Args:
+        socket_path (str): Path of the Unix socket to listen on
+        jobs (int): Number of worker processes, default the number of CPUs
+
+    Returns:
+        int: Exit status
+    """
+
+    if path.exists(socket_path):
+        if _socket_in_use(socket_path):
+            print(f'Socket "{socket_path}" is already in use.')
+            return 1
+        remove(socket_path)  # left behind by a server that did not stop
+
+    jobs = jobs or cpu_count() or 1
+    loop = asyncio.new_event_loop()
+    try:
+        with ProcessPoolExecutor(jobs, initializer=_init_worker) as executor:
+            # start every worker before accepting requests
+            for future in [executor.submit(_started) for _ in range(jobs)]:
+                future.result()
+            loop.run_until_complete(_serve(loop, socket_path, executor,
+                                           jobs))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.close()
+        if path.exists(socket_path):
+            remove(socket_path)
+    print('Conversion server stopped.')
+    return 0
+
+
+async def _serve(loop, socket_path, executor, jobs):
+    stop = loop.create_future()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, _stop, stop)
+
+    async def handle(reader, writer):
+        # requests on a connection are answered in order; connections are
+        # served at the same time, up to one request per worker at once
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    break  # a request line over MAX_REQUEST
+                if not line:
+                    break
+                response = await loop.run_in_executor(
+                    executor, handle_request_line, line)
+                writer.write(response)
+                await writer.drain()
+        except ConnectionError:
+            pass  # client went away
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle, path=socket_path,
+                                             limit=MAX_REQUEST)
+    print(f'Conversion server listening on "{socket_path}" with {jobs} '
+          'workers - press Ctrl-C to stop.', flush=True)
+    try:
+        await stop
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def _stop(stop):
+    if not stop.done():
+        stop.set_result(None)
+
+
+def _socket_in_use(socket_path):
+    """Check whether a server is accepting connections on a socket path"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
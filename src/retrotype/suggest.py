@@ -0,0 +1,281 @@
+"""
+Searches for single character corrections that make a mistyped line match
+the checksum printed in the magazine.
+"""
+
+from typing import NamedTuple
+
+try:
+    from retrotype import char_maps as char_maps
+    from retrotype.retrotype import (scan_ahoy_line,
+                                     detokenize_line,
+                                     checksum_state,
+                                     checksum_prefix_states,
+                                     )
+except ImportError:  # Case for direct python execution
+    import char_maps
+    from retrotype import (scan_ahoy_line,
+                           detokenize_line,
+                           checksum_state,
+                           checksum_prefix_states,
+                           )
+
+
+class Suggestion(NamedTuple):
+    """A candidate correction for a line, ranked by cost (lower costs are
+       more likely typing errors)
+    """
+
+    cost: int
+    position: int
+    description: str
+    listing: str
+
+
+# Pairs of byte values that are easily confused when typing in a listing:
+# cursor and reverse codes, and look-alike letters, digits, and punctuation
+_CONFUSED_PAIRS = (
+    (145, 17),   # {CU} / {CD}
+    (157, 29),   # {CL} / {CR}
+    (18, 146),   # {RV} / {RO}
+    (19, 147),   # {HM} / {SC}
+    (79, 48),    # O / 0
+    (73, 49),    # I / 1
+    (76, 49),    # L / 1
+    (83, 53),    # S / 5
+    (66, 56),    # B / 8
+    (90, 50),    # Z / 2
+    (71, 54),    # G / 6
+    (44, 46),    # , / .
+    (58, 59),    # : / ;
+)
+
+_CONFUSIONS = {}
+for (_first, _second) in _CONFUSED_PAIRS:
+    _CONFUSIONS.setdefault(_first, set()).add(_second)
+    _CONFUSIONS.setdefault(_second, set()).add(_first)
+
+# Costs for each kind of edit, from most to least likely
+_COST_CONFUSION = 0
+_COST_DOUBLED = 1
+_COST_DELETE = 2
+_COST_REPLACE = 3
+_COST_INSERT = 4
+
+# Byte values that can be typed inside quotes or after a REM (space,
+# punctuation, digits, letters, and special character codes), and outside
+# of them where BASIC keywords are tokenized as well
+_LITERAL_VALUES = tuple(sorted(
+    set(range(32, 91))
+    | {value for (_, value) in char_maps.PETCAT_TOKENS}
+    | {value for (_, value) in char_maps.SHIFT_CMDRE_TOKENS}))
+_TOKEN_VALUES = tuple(sorted(
+    set(_LITERAL_VALUES) | {value for (_, value) in char_maps.TOKENS_V2}))
+
+_IDENTITY = bytes(range(256))
+_ROTATED = _IDENTITY * 2
+# x -> (x << 1) & 255, the ahoy1 step after adding the character
+_SHIFTED = bytes((value << 1) & 255 for value in range(256))
+_XOR_TABLES = {}
+
+
+def _add_table(amount):
+    """Table mapping each byte x to (x + amount) & 255"""
+    amount &= 255
+    return _ROTATED[amount:amount + 256]
+
+
+def _xor_table(char_position):
+    """Table mapping each byte x to x ^ char_position"""
+    table = _XOR_TABLES.get(char_position)
+    if table is None:
+        table = bytes(value ^ char_position for value in range(256))
+        _XOR_TABLES[char_position] = table
+    return table
+
+
+class _SuffixTables:
+    """Per-position suffix effects for one line: for each position, a table
+       mapping the xor value entering that position to the final xor value
+       after the rest of the line
+
+    The suffix only depends on the xor value once the in-quotes flag and the
+    character position are fixed.  An edit that keeps the in-quotes flag
+    shifts the position by at most one, so the tables are built for each
+    shift on first use by composing one translate table per byte from the
+    end of the line back.
+    """
+
+    def __init__(self, source, byte_list, states):
+        self.source = source
+        self.byte_list = byte_list
+        self.states = states
+        self.tables = {}
+
+    def lookup(self, end, shift, xor_value):
+        tables = self.tables.get(shift)
+        if tables is None:
+            tables = self._build(shift)
+            self.tables[shift] = tables
+        return tables[end][xor_value]
+
+    def _build(self, shift):
+        count = len(self.byte_list)
+        tables = [None] * count + [_IDENTITY]
+        for pos in range(count - 1, -1, -1):
+            char_val = self.byte_list[pos]
+            state = self.states[pos]
+            # spaces are ignored by ahoy1, and outside of quotes by the others
+            if char_val == 32 and (self.source == 'ahoy1'
+                                   or not state.in_quotes):
+                tables[pos] = tables[pos + 1]
+                continue
+            if self.source == 'ahoy1':
+                step = _add_table(char_val).translate(_SHIFTED)
+            else:
+                carry_flag = char_val >= 34 if self.source == 'ahoy2' else 0
+                step = _add_table(char_val + carry_flag).translate(
+                    _xor_table((state.char_position + shift) & 255))
+            tables[pos] = step.translate(tables[pos + 1])
+        return tables
+
+
+def suggest_corrections(line, ref_code, source, limit=5):
+    """Find single character or special character code substitutions,
+       insertions, and deletions that make a line match a checksum code
+
+    Each candidate edit resumes the checksum from the memoized state before
+    the edit and finishes it with a precomputed suffix table, so the whole
+    line is never rescanned per candidate.  Only the best ranked candidates
+    are checked by retokenizing their listing.
+
+    Args:
+        line (str): Text of the line as read from the source file, including
+            the line number
+        ref_code (str): Two letter checksum code printed in the magazine
+        source (str): Magazine source format ('ahoy1', 'ahoy2', or 'ahoy3')
+        limit (int): Maximum number of suggestions to return
+
+    Returns:
+        list: Suggestion tuples ordered from most to least likely
+    """
+
+    scanned = scan_ahoy_line(line)
+    if scanned is None:
+        return []
+    (line_num, byte_list) = scanned
+    byte_list = bytes(byte_list)
+    target = _code_value(ref_code)
+    if target is None:
+        return []
+
+    states = checksum_prefix_states(checksum_state(source, line_num),
+                                    byte_list)
+    suffix = _SuffixTables(source, byte_list, states)
+    literal = _literal_flags(byte_list)
+    body_len = len(byte_list) - 1  # the 0 terminator is never edited
+
+    def matches(pos, end, new_bytes):
+        state = states[pos].feed_many(new_bytes)
+        if state.in_quotes != states[end].in_quotes:
+            # the edit changes which spaces are inside quotes for the rest
+            # of the line, so finish the checksum directly
+            return state.feed_many(byte_list[end:]).xor_value == target
+        shift = (state.char_position - states[end].char_position) & 255
+        return suffix.lookup(end, shift, state.xor_value) == target
+
+    candidates = []
+    for pos in range(body_len + 1):
+        values = _LITERAL_VALUES if literal[pos] else _TOKEN_VALUES
+        prev_val = byte_list[pos - 1] if pos else None
+
+        if pos < body_len:
+            old_val = byte_list[pos]
+            if matches(pos, pos + 1, b''):
+                doubled = old_val in (prev_val, byte_list[pos + 1])
+                candidates.append(
+                    (_COST_DOUBLED if doubled else _COST_DELETE,
+                     pos, pos + 1, b''))
+            confused = _CONFUSIONS.get(old_val, ())
+            for value in values:
+                if value != old_val and matches(pos, pos + 1, (value,)):
+                    candidates.append(
+                        (_COST_CONFUSION if value in confused
+                         else _COST_REPLACE, pos, pos + 1, bytes((value,))))
+
+        for value in values:
+            if matches(pos, pos, (value,)):
+                doubled = value in (prev_val, byte_list[pos])
+                candidates.append(
+                    (_COST_DOUBLED if doubled else _COST_INSERT,
+                     pos, pos, bytes((value,))))
+
+    candidates.sort(key=lambda candidate: candidate[:2])
+
+    suggestions = []
+    listings = set()
+    for (cost, pos, end, new_bytes) in candidates:
+        new_list = byte_list[:pos] + new_bytes + byte_list[end:]
+        listing = f'{line_num} {detokenize_line(new_list)}'
+        # edits at neighbouring positions can give the same corrected line
+        if listing in listings:
+            continue
+        listings.add(listing)
+        # keep only corrections that tokenize back to the same bytes when
+        # typed in as listed
+        if scan_ahoy_line(listing.lower()) != (line_num, new_list):
+            continue
+        description = _describe(byte_list, literal, pos, end, new_bytes)
+        suggestions.append(Suggestion(cost, pos, description, listing))
+        if len(suggestions) == limit:
+            break
+    return suggestions
+
+
+def _code_value(code):
+    """Convert a two letter checksum code back to its xor value"""
+    code = code.upper()
+    if len(code) != 2 or not all('A' <= letter <= 'P' for letter in code):
+        return None
+    return ((ord(code[0]) - 65) << 4) + ord(code[1]) - 65
+
+
+def _literal_flags(byte_list):
+    """Flag each position of a line, and the end of the line, that is inside
+       quotes or after a REM statement, where keywords are not tokenized
+    """
+    flags = []
+    in_quotes = False
+    in_remark = False
+    for byte in byte_list[:-1]:
+        flags.append(in_quotes or in_remark)
+        if byte == 34:  # quote character
+            in_quotes = not in_quotes
+        if byte == 143:  # REM token
+            in_remark = True
+    flags.append(in_quotes or in_remark)
+    return flags
+
+
+def _token_text(byte_list, literal, pos):
+    """Listing text for the byte at a position of a line"""
+    if literal[pos]:
+        # list inside quotes so keyword values show as special characters
+        return detokenize_line(b'"' + byte_list[pos:pos + 1])[1:]
+    return detokenize_line(byte_list[pos:pos + 1])
+
+
+def _describe(byte_list, literal, pos, end, new_bytes):
+    """Describe an edit to a line in terms of its listing text"""
+    new_text = None
+    if new_bytes:
+        new_text = _token_text(new_bytes, [literal[pos]], 0)
+    if end > pos and new_bytes:
+        return (f'replace "{_token_text(byte_list, literal, pos)}" with '
+                f'"{new_text}"')
+    if end > pos:
+        return f'delete "{_token_text(byte_list, literal, pos)}"'
+    if pos < len(byte_list) - 1:
+        return (f'insert "{new_text}" before '
+                f'"{_token_text(byte_list, literal, pos)}"')
+    return f'insert "{new_text}" at end of line'
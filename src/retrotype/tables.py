@@ -0,0 +1,183 @@
+"""
+Lookup tables derived from the char_maps.py conversion maps, precompiled
+into token_tables.py so they load in one step at start-up rather than being
+built from the source tables on every run.
+
+The precompiled tables are only used if they were generated by this version
+of the table layout from the current char_maps.py; otherwise they are built
+from the source tables.  After editing char_maps.py, regenerate them with:
+
+    python -m retrotype.tables
+"""
+
+import marshal
+from os import path
+import sys
+
+# bump when the layout of the tables returned by build_tables() changes
+TABLES_VERSION = 1
+
+_CHAR_MAPS_FILE = path.join(path.dirname(path.abspath(__file__)),
+                            'char_maps.py')
+
+
+def _import_char_maps():
+    try:
+        from retrotype import char_maps as char_maps
+    except ImportError:  # Case for direct python execution
+        import char_maps
+    return char_maps
+
+
+def source_digest():
+    """CRC-32 of char_maps.py, identifying the source tables the precompiled
+       tables were derived from
+
+    Returns:
+        int or None: Digest, or None if the source file cannot be read
+    """
+
+    from zlib import crc32
+    try:
+        with open(_CHAR_MAPS_FILE, 'rb') as file:
+            return crc32(file.read())
+    except OSError:
+        return None
+
+
+def build_tables():
+    """Build the lookup tables from the char_maps source tables
+
+    Returns:
+        tuple consisting of:
+            token trie (dict): Root node of a prefix trie of the petcat,
+                shifted/commodore, and BASIC keyword tokens.  Each node maps
+                the next character to a child node.  A node that completes
+                a token also holds a tuple of (priority, token value,
+                keyword flag) under the None key, where priority is the
+                position of the token in the original table search order
+                (petcat, shifted/commodore, then BASIC keywords).
+            ahoy to petcat (dict): Petcat code (str) for each Ahoy special
+                character code
+            ahoy tokens (dict): Byte value (int) for each Ahoy special
+                character code
+            listing text (dict): Text (str) used to list each byte value
+                inside quotes or after a REM, preferring the Ahoy code for
+                special characters
+            keyword text (dict): BASIC keyword text (str) for each token
+                value outside quotes
+    """
+
+    char_maps = _import_char_maps()
+
+    trie = {}
+    priority = 0
+    for (table, is_keyword) in ((char_maps.PETCAT_TOKENS, False),
+                                (char_maps.SHIFT_CMDRE_TOKENS, False),
+                                (char_maps.TOKENS_V2, True)):
+        for (token, value) in table:
+            node = trie
+            for char in token:
+                node = node.setdefault(char, {})
+            # keep the earliest entry if a token string is listed twice
+            node.setdefault(None, (priority, value, is_keyword))
+            priority += 1
+
+    petcat_values = dict(char_maps.PETCAT_TOKENS)
+    ahoy_tokens = {code: petcat_values[petcat]
+                   for (code, petcat) in char_maps.AHOY_TO_PETCAT.items()}
+
+    listing = {}
+    for (code, value) in ahoy_tokens.items():
+        listing.setdefault(value, code)
+    # space, punctuation, digits, and letters are typed as themselves
+    for value in range(32, 91):
+        listing.setdefault(value, chr(value))
+    for (token, value) in char_maps.SHIFT_CMDRE_TOKENS:
+        listing.setdefault(value, token.upper())
+
+    keywords = {}
+    for (keyword, value) in char_maps.TOKENS_V2:
+        keywords.setdefault(value, keyword.upper())
+
+    return (trie, dict(char_maps.AHOY_TO_PETCAT), ahoy_tokens, listing,
+            keywords)
+
+
+def load_tables():
+    """Load the precompiled lookup tables, or build them from the source
+       tables if the precompiled tables are missing or out of date
+
+    Returns:
+        tuple: Tables as returned by build_tables()
+    """
+
+    tables = _precompiled_tables()
+    if tables is None:
+        tables = build_tables()
+    return tables
+
+
+def _precompiled_tables():
+    """Tables from token_tables.py, or None if they were not generated by
+       this table layout from the current char_maps.py
+    """
+
+    try:
+        from retrotype import token_tables
+    except ImportError:
+        try:  # Case for direct python execution
+            import token_tables
+        except ImportError:
+            return None
+    if (token_tables.TABLES_VERSION != TABLES_VERSION
+            or token_tables.MARSHAL_VERSION > marshal.version
+            or token_tables.SOURCE_DIGEST != source_digest()):
+        return None
+    return marshal.loads(token_tables.DATA)
+
+
+def write_tables(filename):
+    """Precompile the lookup tables into a Python module
+
+    Args:
+        filename (str): Path of the module to write
+    """
+
+    data = marshal.dumps(build_tables())
+    chunks = [data[start:start + 16] for start in range(0, len(data), 16)]
+    with open(filename, 'w') as file:
+        file.write('"""\nLookup tables derived from char_maps.py, generated '
+                   'by\n\'python -m retrotype.tables\' - do not edit.\n"""\n\n'
+                   f'TABLES_VERSION = {TABLES_VERSION}\n'
+                   f'MARSHAL_VERSION = {marshal.version}\n'
+                   f'SOURCE_DIGEST = 0x{source_digest():08x}\n\n'
+                   'DATA = (\n')
+        for chunk in chunks:
+            file.write(f'    {chunk!r}\n')
+        file.write(')\n')
+
+
+def main(argv=None):
+    """Regenerate token_tables.py, or with --check only report whether it is
+       up to date
+
+    Returns:
+        int: Exit status
+    """
+
+    argv = sys.argv[1:] if argv is None else argv
+    filename = path.join(path.dirname(_CHAR_MAPS_FILE), 'token_tables.py')
+    if argv == ['--check']:
+        if _precompiled_tables() == build_tables():
+            print(f'"{filename}" is up to date.')
+            return 0
+        print(f'"{filename}" is out of date - run python -m retrotype.tables')
+        return 1
+    write_tables(filename)
+    print(f'"{filename}" written.')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
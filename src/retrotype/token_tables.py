@@ -0,0 +1,623 @@
+"""
+Lookup tables derived from char_maps.py, generated by
+'python -m retrotype.tables' - do not edit.
+"""
+
+TABLES_VERSION = 1
+MARSHAL_VERSION = 4
+SOURCE_DIGEST = 0x88d7ead9
+
+DATA = (
+    b')\x05{\xfa\x01{{\xfa\x01c{\xfa\x01l{\xfa'
+    b'\x01r{\xfa\x01}{N)\x03\xe9\x00\x00\x00\x00\xe9'
+    b'\x93\x00\x00\x00F000\xfa\x01y{\xfa\x01n{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9\r\x00\x00\x00\xe9\x9f'
+    b'\x00\x00\x00F000\xfa\x01 {\xfa\x019{r'
+    b'\x04\x00\x00\x00{N)\x03\xe9&\x00\x00\x00\xe9)\x00'
+    b'\x00\x00F00\xda\x010{r\x04\x00\x00\x00{N'
+    b")\x03\xe9'\x00\x00\x00\xe90\x00\x00\x00F00\xda"
+    b'\x011{r\x04\x00\x00\x00{N)\x03\xe9(\x00\x00'
+    b'\x00\xe9\x81\x00\x00\x00F00\xfa\x012{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9*\x00\x00\x00\xe9\x95\x00\x00\x00'
+    b'F00\xfa\x013{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9+\x00\x00\x00\xe9\x96\x00\x00\x00F00\xfa\x014'
+    b'{r\x04\x00\x00\x00{N)\x03\xe9,\x00\x00\x00\xe9'
+    b'\x97\x00\x00\x00F00\xfa\x015{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9-\x00\x00\x00\xe9\x98\x00\x00\x00F0'
+    b'0\xfa\x016{r\x04\x00\x00\x00{N)\x03\xe9.'
+    b'\x00\x00\x00\xe9\x99\x00\x00\x00F00\xfa\x017{r'
+    b'\x04\x00\x00\x00{N)\x03\xe9/\x00\x00\x00\xe9\x9a\x00'
+    b'\x00\x00F00\xfa\x018{r\x04\x00\x00\x00{N'
+    b')\x03r\x11\x00\x00\x00\xe9\x9b\x00\x00\x00F00\xfa'
+    b'\x01k{r\x04\x00\x00\x00{N)\x03\xe92\x00\x00'
+    b'\x00\xe9\xa1\x00\x00\x00F00\xfa\x01i{r\x04\x00'
+    b'\x00\x00{N)\x03\xe93\x00\x00\x00\xe9\xa2\x00\x00\x00'
+    b'F00\xfa\x01t{r\x04\x00\x00\x00{N)\x03'
+    b'\xe94\x00\x00\x00\xe9\xa3\x00\x00\x00F00\xfa\x01@'
+    b'{r\x04\x00\x00\x00{N)\x03\xe95\x00\x00\x00\xe9'
+    b'\xa4\x00\x00\x00F00\xda\x01g{r\x04\x00\x00\x00'
+    b'{N)\x03\xe96\x00\x00\x00\xe9\xa5\x00\x00\x00F0'
+    b'0\xfa\x01+{r\x04\x00\x00\x00{N)\x03\xe97'
+    b'\x00\x00\x00\xe9\xa6\x00\x00\x00F00\xfa\x01m{r'
+    b'\x04\x00\x00\x00{N)\x03\xe98\x00\x00\x00\xe9\xa7\x00'
+    b'\x00\x00F00\xfa\x01e{\xfa\x01p{r\x04\x00'
+    b'\x00\x00{N)\x03\xe99\x00\x00\x00\xe9\xa8\x00\x00\x00'
+    b'F00r\x04\x00\x00\x00{N)\x03\xe9B\x00\x00'
+    b'\x00\xe9\xb1\x00\x00\x00F00r\x08\x00\x00\x00{r'
+    b'\x04\x00\x00\x00{N)\x03\xe9;\x00\x00\x00\xe9\xaa\x00'
+    b'\x00\x00F00\xfa\x01q{r\x04\x00\x00\x00{N'
+    b')\x03\xe9<\x00\x00\x00\xe9\xab\x00\x00\x00F00\xfa'
+    b'\x01d{r\x04\x00\x00\x00{N)\x03\xe9=\x00\x00'
+    b'\x00\xe9\xac\x00\x00\x00F00\xfa\x01z{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9>\x00\x00\x00\xe9\xad\x00\x00\x00'
+    b'F00\xfa\x01s{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9?\x00\x00\x00\xe9\xae\x00\x00\x00F00r?\x00'
+    b'\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9@\x00\x00'
+    b'\x00\xe9\xaf\x00\x00\x00F00\xfa\x01a{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9A\x00\x00\x00\xe9\xb0\x00\x00\x00'
+    b'F00r\x03\x00\x00\x00{r\x04\x00\x00\x00{N'
+    b')\x03\xe9C\x00\x00\x00\xe9\xb2\x00\x00\x00F00\xfa'
+    b'\x01w{r\x04\x00\x00\x00{N)\x03\xe9D\x00\x00'
+    b'\x00\xe9\xb3\x00\x00\x00F00\xfa\x01h{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9E\x00\x00\x00\xe9\xb4\x00\x00\x00'
+    b'F00\xfa\x01j{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9F\x00\x00\x00\xe9\xb5\x00\x00\x00F00r\x02\x00'
+    b'\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9G\x00\x00'
+    b'\x00\xe9\xb6\x00\x00\x00F00r\x07\x00\x00\x00{r'
+    b'\x04\x00\x00\x00{N)\x03\xe9H\x00\x00\x00\xe9\xb7\x00'
+    b'\x00\x00F00\xda\x01u{r\x04\x00\x00\x00{N'
+    b')\x03\xe9I\x00\x00\x00\xe9\xb8\x00\x00\x00F00\xfa'
+    b'\x01o{r\x04\x00\x00\x00{N)\x03\xe9J\x00\x00'
+    b'\x00\xe9\xb9\x00\x00\x00F00\xfa\x01f{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9L\x00\x00\x00\xe9\xbb\x00\x00\x00'
+    b'F00r\x01\x00\x00\x00{r\x04\x00\x00\x00{N'
+    b')\x03\xe9M\x00\x00\x00\xe9\xbc\x00\x00\x00F00\xfa'
+    b'\x01x{r\x04\x00\x00\x00{N)\x03\xe9N\x00\x00'
+    b'\x00\xe9\xbd\x00\x00\x00F00\xfa\x01v{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9O\x00\x00\x00\xe9\xbe\x00\x00\x00'
+    b'F00\xfa\x01b{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9P\x00\x00\x00\xe9\xbf\x00\x00\x00F00\xfa\x01-'
+    b'{r\x04\x00\x00\x00{N)\x03\xe9m\x00\x00\x00\xe9'
+    b'\xdc\x00\x00\x00F00\xda\x01*{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9p\x00\x00\x00\xe9\xdf\x00\x00\x00F0'
+    b'000r\\\x00\x00\x00{ri\x00\x00\x00{r'
+    b';\x00\x00\x00{r>\x00\x00\x00{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9\x01\x00\x00\x00\xe9\x13\x00\x00\x00F0'
+    b'0000rf\x00\x00\x00{r?\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9\x02\x00\x00\x00\xe9\x91'
+    b'\x00\x00\x00F0\xfa\x01_{rT\x00\x00\x00{r'
+    b'\x03\x00\x00\x00{r\x03\x00\x00\x00{ri\x00\x00\x00'
+    b'{rY\x00\x00\x00{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9#\x00\x00\x00\xe9^\x00\x00\x00F00000'
+    b'0000rI\x00\x00\x00{ri\x00\x00\x00{'
+    b'rY\x00\x00\x00{r\x08\x00\x00\x00{r\x04\x00\x00'
+    b'\x00{N)\x03\xe9\x03\x00\x00\x00\xe9\x11\x00\x00\x00F'
+    b'00000r\x02\x00\x00\x00{r>\x00\x00\x00'
+    b'{rl\x00\x00\x00{r/\x00\x00\x00{r\x04\x00'
+    b'\x00\x00{N)\x03\xe9\x04\x00\x00\x00\xe9\x9d\x00\x00\x00'
+    b'F0r\x84\x00\x00\x00{rT\x00\x00\x00{r\x03'
+    b'\x00\x00\x00{r\x03\x00\x00\x00{ri\x00\x00\x00{'
+    b'rY\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'$\x00\x00\x00\xe9_\x00\x00\x00F000000'
+    b'0000r\x03\x00\x00\x00{r>\x00\x00\x00{'
+    b'rI\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'\x14\x00\x00\x00r\x1a\x00\x00\x00F0000r5'
+    b'\x00\x00\x00{r\x03\x00\x00\x00{r\x08\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9\x17\x00\x00\x00r#'
+    b'\x00\x00\x00F0000rw\x00\x00\x00{r\x02'
+    b'\x00\x00\x00{rf\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9\x18\x00\x00\x00r&\x00\x00\x00F00'
+    b'000r\x03\x00\x00\x00{r5\x00\x00\x00{r'
+    b'\\\x00\x00\x00{r/\x00\x00\x00{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9\x05\x00\x00\x00\xe9\x1d\x00\x00\x00F0'
+    b'000rt\x00\x00\x00{ri\x00\x00\x00{r'
+    b'\x08\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9\x08'
+    b'\x00\x00\x00\xe9\x12\x00\x00\x00F00rl\x00\x00\x00'
+    b'{r\x04\x00\x00\x00{N)\x03\xe9\t\x00\x00\x00\xe9'
+    b'\x92\x00\x00\x00F0000r>\x00\x00\x00{r'
+    b'I\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9\x0c'
+    b'\x00\x00\x00\xe9\x1c\x00\x00\x00F0000rO\x00'
+    b'\x00\x00{rO\x00\x00\x00{r?\x00\x00\x00{r'
+    b'\x01\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9\x06'
+    b'\x00\x00\x00\xe9\xa0\x00\x00\x00F0000r\x0b\x00'
+    b'\x00\x00{r\x03\x00\x00\x00{r>\x00\x00\x00{r'
+    b'/\x00\x00\x00{rf\x00\x00\x00{r\x03\x00\x00\x00'
+    b'{r\x08\x00\x00\x00{r\x04\x00\x00\x00{N)\x03'
+    b'r\x0e\x00\x00\x00\xe9\x8d\x00\x00\x00F00000'
+    b'0r\x04\x00\x00\x00{N)\x03\xe9c\x00\x00\x00\xe9'
+    b'\xd2\x00\x00\x00F00rO\x00\x00\x00{r?\x00'
+    b'\x00\x00{rT\x00\x00\x00{r\x01\x00\x00\x00{r'
+    b'>\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe91'
+    b'\x00\x00\x00r\x99\x00\x00\x00F00000r\x04'
+    b'\x00\x00\x00{N)\x03\xe9d\x00\x00\x00\xe9\xd3\x00\x00'
+    b'\x00F00r>\x00\x00\x00{r?\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9:\x00\x00\x00\xe9\xa9'
+    b'\x00\x00\x00F00r\x04\x00\x00\x00{N)\x03\xe9'
+    b'V\x00\x00\x00\xe9\xc5\x00\x00\x00F00r2\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9K\x00\x00\x00'
+    b'\xe9\xba\x00\x00\x00F00r}\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9Q\x00\x00\x00\xe9\xc0\x00\x00'
+    b'\x00F00rT\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9R\x00\x00\x00\xe9\xc1\x00\x00\x00F00'
+    b'rw\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'S\x00\x00\x00\xe9\xc2\x00\x00\x00F00r\x01\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9T\x00\x00\x00'
+    b'\xe9\xc3\x00\x00\x00F00rI\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9U\x00\x00\x00\xe9\xc4\x00\x00'
+    b'\x00F00rl\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9W\x00\x00\x00\xe9\xc6\x00\x00\x00F00'
+    b'r5\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'X\x00\x00\x00\xe9\xc7\x00\x00\x00F00r\\\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9Y\x00\x00\x00'
+    b'\xe9\xc8\x00\x00\x00F00r,\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9Z\x00\x00\x00\xe9\xc9\x00\x00'
+    b'\x00F00r_\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9[\x00\x00\x00\xe9\xca\x00\x00\x00F00'
+    b'r)\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'\\\x00\x00\x00\xe9\xcb\x00\x00\x00F00r\x02\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9]\x00\x00\x00'
+    b'\xe9\xcc\x00\x00\x00F00r;\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03r\x86\x00\x00\x00\xe9\xcd\x00\x00'
+    b'\x00F00r\x08\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03r\x8c\x00\x00\x00\xe9\xce\x00\x00\x00F00'
+    b'ri\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'`\x00\x00\x00\xe9\xcf\x00\x00\x00F00r?\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9a\x00\x00\x00'
+    b'\xe9\xd0\x00\x00\x00F00rF\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9b\x00\x00\x00\xe9\xd1\x00\x00'
+    b'\x00F00r/\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9e\x00\x00\x00\xe9\xd4\x00\x00\x00F00'
+    b'rf\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'f\x00\x00\x00\xe9\xd5\x00\x00\x00F0r?\x00\x00\x00'
+    b'{r\x84\x00\x00\x00{rT\x00\x00\x00{r\x03\x00'
+    b'\x00\x00{r\x03\x00\x00\x00{ri\x00\x00\x00{r'
+    b'Y\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9o'
+    b'\x00\x00\x00\xe9\xde\x00\x00\x00F0000000'
+    b'00rt\x00\x00\x00{r\x04\x00\x00\x00{N)'
+    b'\x03\xe9g\x00\x00\x00\xe9\xd6\x00\x00\x00F00rY'
+    b'\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9h\x00'
+    b'\x00\x00\xe9\xd7\x00\x00\x00F00rq\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9i\x00\x00\x00\xe9\xd8'
+    b'\x00\x00\x00F00r\x07\x00\x00\x00{r\x04\x00\x00'
+    b'\x00{N)\x03\xe9j\x00\x00\x00\xe9\xd9\x00\x00\x00F'
+    b'00rL\x00\x00\x00{r\x04\x00\x00\x00{N)'
+    b'\x03\xe9k\x00\x00\x00\xe9\xda\x00\x00\x00F00r8'
+    b'\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9l\x00'
+    b'\x00\x00\xe9\xdb\x00\x00\x00F00rz\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9n\x00\x00\x00\xe9\xdd'
+    b'\x00\x00\x00F0000r,\x00\x00\x00{r\x08'
+    b'\x00\x00\x00{rO\x00\x00\x00{r/\x00\x00\x00{'
+    b'r\x04\x00\x00\x00{N)\x03\xe9\x07\x00\x00\x00\xe9\x94'
+    b'\x00\x00\x00F00000rw\x00\x00\x00{r'
+    b'\x02\x00\x00\x00{r)\x00\x00\x00{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9\n\x00\x00\x00\xe9\x90\x00\x00\x00F0'
+    b'0rf\x00\x00\x00{r\x04\x00\x00\x00{N)\x03'
+    b'\xe9\x10\x00\x00\x00\xe9\x1f\x00\x00\x00F000r\x03'
+    b'\x00\x00\x00{r\x08\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03r\x81\x00\x00\x00r\x17\x00\x00\x00F00'
+    b'00rY\x00\x00\x00{r\\\x00\x00\x00{r/'
+    b'\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9\x0b\x00'
+    b'\x00\x00r\x90\x00\x00\x00F0000r?\x00\x00'
+    b'\x00{rf\x00\x00\x00{r\x03\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9\x0e\x00\x00\x00\xe9\x9c\x00\x00'
+    b'\x00F000r,\x00\x00\x00{r\x04\x00\x00\x00'
+    b'{N)\x03\xe9%\x00\x00\x00\xe9~\x00\x00\x00F0'
+    b'00r5\x00\x00\x00{r\x03\x00\x00\x00{r\x08'
+    b'\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9\x0f\x00'
+    b'\x00\x00\xe9\x1e\x00\x00\x00F00r\x07\x00\x00\x00{'
+    b'r\x12\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b'\x15\x00\x00\x00r\x1d\x00\x00\x00F00r\x15\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9\x16\x00\x00\x00'
+    b'r \x00\x00\x00F00r\x18\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9\x19\x00\x00\x00r(\x00\x00'
+    b'\x00F00000r\x07\x00\x00\x00{r>\x00'
+    b'\x00\x00{r\x02\x00\x00\x00{r\x04\x00\x00\x00{N'
+    b')\x03r\x88\x00\x00\x00\xe9\x9e\x00\x00\x00F000'
+    b'0ri\x00\x00\x00{r\x03\x00\x00\x00{r\x08\x00'
+    b'\x00\x00{r5\x00\x00\x00{r\x04\x00\x00\x00{N'
+    b')\x03r\x93\x00\x00\x00r\x14\x00\x00\x00F000'
+    b'00rl\x00\x00\x00{r\x12\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03\xe9\x1a\x00\x00\x00\xe9\x85\x00\x00'
+    b'\x00F00r\x15\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03\xe9\x1b\x00\x00\x00\xe9\x89\x00\x00\x00F00'
+    b'r\x18\x00\x00\x00{r\x04\x00\x00\x00{N)\x03r'
+    b'\x97\x00\x00\x00\xe9\x86\x00\x00\x00F00r\x1b\x00\x00'
+    b'\x00{r\x04\x00\x00\x00{N)\x03r\x91\x00\x00\x00'
+    b'\xe9\x8a\x00\x00\x00F00r\x1e\x00\x00\x00{r\x04'
+    b'\x00\x00\x00{N)\x03r\xe6\x00\x00\x00\xe9\x87\x00\x00'
+    b'\x00F00r!\x00\x00\x00{r\x04\x00\x00\x00{'
+    b'N)\x03r\xdf\x00\x00\x00\xe9\x8b\x00\x00\x00F00'
+    b'r$\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9'
+    b" \x00\x00\x00\xe9\x88\x00\x00\x00F00r'\x00\x00"
+    b'\x00{r\x04\x00\x00\x00{N)\x03\xe9!\x00\x00\x00'
+    b'\xe9\x8c\x00\x00\x00F000r>\x00\x00\x00{r'
+    b'?\x00\x00\x00{r\x04\x00\x00\x00{N)\x03\xe9"'
+    b'\x00\x00\x00r\xba\x00\x00\x00F0000r>\x00'
+    b'\x00\x00{r\x08\x00\x00\x00{rI\x00\x00\x00{N'
+    b')\x03\xe9q\x00\x00\x00\xe9\x80\x00\x00\x00T00r'
+    b'q\x00\x00\x00{r?\x00\x00\x00{N)\x03rQ'
+    b'\x00\x00\x00rs\x00\x00\x00T000rl\x00\x00'
+    b'\x00{ri\x00\x00\x00{r\x03\x00\x00\x00{N)'
+    b'\x03\xe9r\x00\x00\x00r\x14\x00\x00\x00T00r\x08'
+    b'\x00\x00\x00{N)\x03r\x1a\x00\x00\x00r7\x00\x00'
+    b'\x00T0r\x03\x00\x00\x00{r>\x00\x00\x00{N'
+    b')\x03r\xa1\x00\x00\x00rh\x00\x00\x00T000'
+    b'r\x08\x00\x00\x00{r>\x00\x00\x00{rq\x00\x00'
+    b'\x00{r/\x00\x00\x00{N)\x03\xe9s\x00\x00\x00'
+    b'\xe9\x82\x00\x00\x00T00rY\x00\x00\x00{N)'
+    b'\x03r\x06\x00\x00\x00r.\x00\x00\x00T00ri'
+    b'\x00\x00\x00{r/\x00\x00\x00{N)\x03r#\x00'
+    b'\x00\x00rA\x00\x00\x00T000rI\x00\x00\x00'
+    b'{rT\x00\x00\x00{r/\x00\x00\x00{rT\x00'
+    b'\x00\x00{N)\x03\xe9t\x00\x00\x00\xe9\x83\x00\x00\x00'
+    b'T000r,\x00\x00\x00{r;\x00\x00\x00{'
+    b'N)\x03\xe9w\x00\x00\x00r\xef\x00\x00\x00T00'
+    b'r>\x00\x00\x00{rl\x00\x00\x00{N)\x03r'
+    b'\xf1\x00\x00\x00r\x1a\x00\x00\x00T000r,\x00'
+    b'\x00\x00{r\x08\x00\x00\x00{r?\x00\x00\x00{r'
+    b'f\x00\x00\x00{r/\x00\x00\x00{\xfa\x01#{N'
+    b')\x03\xe9u\x00\x00\x00\xe9\x84\x00\x00\x00T0N)'
+    b'\x03\xe9v\x00\x00\x00r\xec\x00\x00\x00T000r'
+    b'/\x00\x00\x00{N)\x03r:\x00\x00\x00ra\x00'
+    b'\x00\x00T00rl\x00\x00\x00{N)\x03\xe9|'
+    b'\x00\x00\x00r\xf2\x00\x00\x00T00r\x03\x00\x00\x00'
+    b'{r>\x00\x00\x00{rT\x00\x00\x00{rI\x00'
+    b'\x00\x00{N)\x03\xe9x\x00\x00\x00r\xf1\x00\x00\x00'
+    b'T00rO\x00\x00\x00{r/\x00\x00\x00{r'
+    b'i\x00\x00\x00{r\x03\x00\x00\x00{r>\x00\x00\x00'
+    b'{N)\x03\xe9}\x00\x00\x00r\xf6\x00\x00\x00T0'
+    b'0000r/\x00\x00\x00{rf\x00\x00\x00{'
+    b'r\x03\x00\x00\x00{r\x08\x00\x00\x00{N)\x03\xe9'
+    b'\x7f\x00\x00\x00\xe9\x8e\x00\x00\x00T0000r;'
+    b'\x00\x00\x00{N)\x03r\xf9\x00\x00\x00\xe9\x8f\x00\x00'
+    b'\x00T00rf\x00\x00\x00{r\x08\x00\x00\x00{'
+    b'N)\x03\xe9{\x00\x00\x00r\xf0\x00\x00\x00T00'
+    b'r\x08\x00\x00\x00{rI\x00\x00\x00{N)\x03r'
+    b'K\x00\x00\x00rn\x00\x00\x00T00r,\x00\x00'
+    b'\x00{r5\x00\x00\x00{r\\\x00\x00\x00{r/'
+    b'\x00\x00\x00{\xfa\x01${N)\x03r\xa5\x00\x00\x00'
+    b'r\xb7\x00\x00\x00T000000r\x02\x00\x00'
+    b'\x00{r>\x00\x00\x00{r/\x00\x00\x00{N)'
+    b'\x03\xe9y\x00\x00\x00r\xf4\x00\x00\x00T0r\x08\x00'
+    b'\x00\x00{N)\x03r^\x00\x00\x00r\xad\x00\x00\x00'
+    b'T0rl\x00\x00\x00{r/\x00\x00\x00{r\x0b'
+    b'\x01\x00\x00{N)\x03rk\x00\x00\x00r\xb5\x00\x00'
+    b'\x00T0000ri\x00\x00\x00{rT\x00\x00'
+    b'\x00{rI\x00\x00\x00{N)\x03r\x02\x01\x00\x00'
+    b'r\x06\x00\x00\x00T00r5\x00\x00\x00{N)'
+    b'\x03rN\x00\x00\x00rp\x00\x00\x00T00r,'
+    b'\x00\x00\x00{rO\x00\x00\x00{r/\x00\x00\x00{'
+    b'N)\x03r\xf6\x00\x00\x00r(\x00\x00\x00T00'
+    b'00r5\x00\x00\x00{ri\x00\x00\x00{r/'
+    b'\x00\x00\x00{ri\x00\x00\x00{N)\x03\xe9z\x00'
+    b'\x00\x00r\xee\x00\x00\x00T00rO\x00\x00\x00{'
+    b'rf\x00\x00\x00{rw\x00\x00\x00{N)\x03r'
+    b'\xe4\x00\x00\x00r\x9a\x00\x00\x00T000N)\x03'
+    b'rp\x00\x00\x00r\xbb\x00\x00\x00T0r>\x00\x00'
+    b'\x00{r/\x00\x00\x00{N)\x03r\x95\x00\x00\x00'
+    b'r+\x00\x00\x00T000rO\x00\x00\x00{r'
+    b'/\x00\x00\x00{ri\x00\x00\x00{r?\x00\x00\x00'
+    b'{N)\x03r\x14\x00\x00\x00r\xdd\x00\x00\x00T0'
+    b'0r>\x00\x00\x00{r?\x00\x00\x00{N)\x03'
+    b'r&\x00\x00\x00r\xa1\x00\x00\x00T00r\x03\x00'
+    b'\x00\x00{r\x0b\x01\x00\x00{N)\x03ra\x00\x00'
+    b'\x00r\xaf\x00\x00\x00T000rT\x00\x00\x00{'
+    b'rt\x00\x00\x00{r>\x00\x00\x00{N)\x03r'
+    b'\xec\x00\x00\x00r\xdb\x00\x00\x00T000r\x07\x00'
+    b'\x00\x00{rO\x00\x00\x00{N)\x03r\t\x01\x00'
+    b'\x00r\xea\x00\x00\x00T00r?\x00\x00\x00{r'
+    b'\x01\x00\x00\x00{\xfa\x01({N)\x03r\x1d\x00\x00'
+    b'\x00r:\x00\x00\x00T000r5\x00\x00\x00{'
+    b'r\x08\x00\x00\x00{N)\x03r7\x00\x00\x00r^'
+    b'\x00\x00\x00T00rF\x00\x00\x00{r\x03\x00\x00'
+    b'\x00{N)\x03rH\x00\x00\x00r\xa5\x00\x00\x00T'
+    b'00r,\x00\x00\x00{r\x08\x00\x00\x00{N)'
+    b'\x03rV\x00\x00\x00ry\x00\x00\x00T000r'
+    b'i\x00\x00\x00{r\x08\x00\x00\x00{N)\x03r\xfc'
+    b'\x00\x00\x00r\x83\x00\x00\x00T0r?\x00\x00\x00{'
+    b'r>\x00\x00\x00{r\x08\x00\x00\x00{N)\x03r'
+    b'\xdd\x00\x00\x00r\n\x00\x00\x00T000r\x03\x00'
+    b'\x00\x00{N)\x03r+\x00\x00\x00rV\x00\x00\x00'
+    b'T00rY\x00\x00\x00{rT\x00\x00\x00{r'
+    b',\x00\x00\x00{r/\x00\x00\x00{N)\x03r\xfe'
+    b'\x00\x00\x00r\x95\x00\x00\x00T0000rt\x00'
+    b'\x00\x00{r>\x00\x00\x00{r\x03\x00\x00\x00{r'
+    b',\x00\x00\x00{rl\x00\x00\x00{r\x07\x00\x00\x00'
+    b'{N)\x03r\xef\x00\x00\x00r\x17\x00\x00\x00T0'
+    b'0000rT\x00\x00\x00{r\x02\x00\x00\x00{'
+    b'N)\x03rc\x00\x00\x00r\xa3\x00\x00\x00T00'
+    b'0r?\x00\x00\x00{ri\x00\x00\x00{r)\x00'
+    b'\x00\x00{r>\x00\x00\x00{N)\x03r\xf4\x00\x00'
+    b'\x00r\x1d\x00\x00\x00T00rO\x00\x00\x00{N'
+    b')\x03rE\x00\x00\x00rk\x00\x00\x00T00r'
+    b'\x03\x00\x00\x00{r,\x00\x00\x00{r\x08\x00\x00\x00'
+    b'{r/\x00\x00\x00{r\x00\x01\x00\x00{N)\x03'
+    b'r\xee\x00\x00\x00r \x00\x00\x00T0N)\x03r'
+    b'\xf0\x00\x00\x00r#\x00\x00\x00T0000r>'
+    b'\x00\x00\x00{r>\x00\x00\x00{r)\x00\x00\x00{'
+    b'N)\x03r[\x00\x00\x00r\xab\x00\x00\x00T00'
+    b'00r\x01\x00\x00\x00{ri\x00\x00\x00{r\x08'
+    b'\x00\x00\x00{r/\x00\x00\x00{N)\x03r\xf2\x00'
+    b'\x00\x00r&\x00\x00\x00T00rO\x00\x00\x00{'
+    b'N)\x03rS\x00\x00\x00rv\x00\x00\x00T00'
+    b'r\x02\x00\x00\x00{r\x03\x00\x00\x00{N)\x03r'
+    b'\x9a\x00\x00\x00r\xe2\x00\x00\x00T0ri\x00\x00\x00'
+    b'{rO\x00\x00\x00{r>\x00\x00\x00{N)\x03'
+    b'r\x83\x00\x00\x00r\x99\x00\x00\x00T0000r'
+    b';\x00\x00\x00{rI\x00\x00\x00{N)\x03r\x08'
+    b'\x01\x00\x00r\x8a\x00\x00\x00T00r\\\x00\x00\x00'
+    b'{r\x03\x00\x00\x00{r\x0b\x01\x00\x00{N)\x03'
+    b'rh\x00\x00\x00r\xb3\x00\x00\x00T0000r'
+    b'/\x00\x00\x00{rT\x00\x00\x00{rw\x00\x00\x00'
+    b'{r\x0e\x01\x00\x00{N)\x03r\xdb\x00\x00\x00r'
+    b'1\x00\x00\x00T00r\x08\x00\x00\x00{N)\x03'
+    b'rC\x00\x00\x00r\xa7\x00\x00\x00T00ri\x00'
+    b'\x00\x00{N)\x03r\x17\x00\x00\x00r4\x00\x00\x00'
+    b'T0r\\\x00\x00\x00{r>\x00\x00\x00{r\x08'
+    b'\x00\x00\x00{N)\x03r \x00\x00\x00r=\x00\x00'
+    b'\x00T0000r8\x00\x00\x00{N)\x03r'
+    b'(\x00\x00\x00rE\x00\x00\x00T0rz\x00\x00\x00'
+    b'{N)\x03r\xe2\x00\x00\x00rH\x00\x00\x00T0'
+    b'r}\x00\x00\x00{N)\x03r\x8a\x00\x00\x00rK'
+    b'\x00\x00\x00T0\xfa\x01/{N)\x03r\xea\x00\x00'
+    b'\x00rN\x00\x00\x00T0\xfa\x01^{N)\x03r'
+    b'\n\x00\x00\x00rQ\x00\x00\x00T0rT\x00\x00\x00'
+    b'{r\x08\x00\x00\x00{rI\x00\x00\x00{N)\x03'
+    b'r\x99\x00\x00\x00rS\x00\x00\x00T00rw\x00'
+    b'\x00\x00{rO\x00\x00\x00{N)\x03r=\x00\x00'
+    b'\x00rc\x00\x00\x00T00r/\x00\x00\x00{r'
+    b'\x08\x00\x00\x00{N)\x03rX\x00\x00\x00r\xa9\x00'
+    b'\x00\x00T00rO\x00\x00\x00{r\x01\x00\x00\x00'
+    b'{N)\x03re\x00\x00\x00r\xb1\x00\x00\x00T0'
+    b'00\xfa\x01>{N)\x03r.\x00\x00\x00rC'
+    b'\x00\x00\x00T0\xfa\x01={N)\x03r1\x00\x00'
+    b'\x00rX\x00\x00\x00T0\xfa\x01<{N)\x03r'
+    b'4\x00\x00\x00r[\x00\x00\x00T0rf\x00\x00\x00'
+    b'{rO\x00\x00\x00{r\x03\x00\x00\x00{N)\x03'
+    b'rA\x00\x00\x00re\x00\x00\x00T000r;'
+    b'\x00\x00\x00{r,\x00\x00\x00{rI\x00\x00\x00{'
+    b'r\x0b\x01\x00\x00{N)\x03rn\x00\x00\x00r\xb9'
+    b'\x00\x00\x00T00000{\xfa\x04{SC}'
+    b'\xfa\x05{clr}\xfa\x04{HM}\xfa\x06{'
+    b'home}\xfa\x04{CU}\xfa\x04{up'
+    b'}\xfa\x04{CD}\xfa\x06{down}\xfa'
+    b'\x04{CL}\xfa\x06{left}\xfa\x04{'
+    b'CR}\xfa\x06{rght}\xfa\x04{SS'
+    b'}\xfa\x06{sspc}\xfa\x04{IN}\xfa'
+    b'\x06{inst}\xfa\x04{RV}\xfa\x06{'
+    b'rvon}\xfa\x04{RO}\xfa\x06{rv'
+    b'of}\xfa\x04{BK}\xfa\x05{blk}'
+    b'\xfa\x04{WH}\xfa\x05{wht}\xfa\x04{'
+    b'RD}\xfa\x05{red}\xfa\x04{CY}'
+    b'\xfa\x05{cyn}\xfa\x04{PU}\xfa\x05{'
+    b'pur}\xfa\x04{GN}\xfa\x05{grn'
+    b'}\xfa\x04{BL}\xfa\x05{blu}\xfa\x04'
+    b'{YL}\xfa\x05{yel}\xfa\x04{OR'
+    b'}\xfa\x06{orng}\xfa\x04{BR}\xfa'
+    b'\x05{brn}\xfa\x04{LR}\xfa\x06{l'
+    b'red}\xfa\x04{G1}\xfa\x06{gry'
+    b'1}\xfa\x04{G2}\xfa\x06{gry2}'
+    b'\xfa\x04{LG}\xfa\x06{lgrn}\xfa\x04'
+    b'{LB}\xfa\x06{lblu}\xfa\x04{G'
+    b'3}\xfa\x06{gry3}\xfa\x04{F1}'
+    b'\xfa\x04{f1}\xfa\x04{F2}\xfa\x04{f'
+    b'2}\xfa\x04{F3}\xfa\x04{f3}\xfa\x04'
+    b'{F4}\xfa\x04{f4}\xfa\x04{F5}'
+    b'\xfa\x04{f5}\xfa\x04{F6}\xfa\x04{f'
+    b'6}\xfa\x04{F7}\xfa\x04{f7}\xfa\x04'
+    b'{F8}\xfa\x04{f8}\xfa\x07{CLE'
+    b'AR}r\x15\x01\x00\x00\xfa\x06{HOME}'
+    b'r\x17\x01\x00\x00\xfa\x04{UP}r\x19\x01\x00\x00'
+    b'\xfa\x06{DOWN}r\x1b\x01\x00\x00\xfa\x06{'
+    b'LEFT}r\x1d\x01\x00\x00\xfa\x07{RIG'
+    b'HT}r\x1f\x01\x00\x00\xfa\x08{INSER'
+    b'T}r#\x01\x00\x00\xfa\x07{RVSON}'
+    b'r%\x01\x00\x00\xfa\x08{RVSOFF}r'
+    b"'\x01\x00\x00\xfa\x07{BLACK}r)\x01"
+    b'\x00\x00\xfa\x07{WHITE}r+\x01\x00\x00'
+    b'\xfa\x05{RED}r-\x01\x00\x00\xfa\x06{C'
+    b'YAN}r/\x01\x00\x00\xfa\x08{PURP'
+    b'LE}r1\x01\x00\x00\xfa\x07{GREEN'
+    b'}r3\x01\x00\x00\xfa\x06{BLUE}r5'
+    b'\x01\x00\x00\xfa\x08{YELLOW}r7\x01'
+    b'\x00\x00\xfa\x08{ORANGE}r9\x01\x00'
+    b'\x00\xfa\x07{BROWN}r;\x01\x00\x00\xfa'
+    b'\x07{LTRED}r=\x01\x00\x00\xfa\x07{'
+    b'GRAY1}r?\x01\x00\x00\xfa\x07{GR'
+    b'AY2}rA\x01\x00\x00\xfa\t{LTGR'
+    b'EEN}rC\x01\x00\x00\xfa\x08{LTBL'
+    b'UE}rE\x01\x00\x00\xfa\x07{GRAY3'
+    b'}rG\x01\x00\x000{r\x14\x01\x00\x00r\x06\x00'
+    b'\x00\x00r\x16\x01\x00\x00r\x81\x00\x00\x00r\x18\x01\x00'
+    b'\x00r\x83\x00\x00\x00r\x1a\x01\x00\x00r\x88\x00\x00\x00'
+    b'r\x1c\x01\x00\x00r\x8a\x00\x00\x00r\x1e\x01\x00\x00r'
+    b'\x91\x00\x00\x00r \x01\x00\x00r\x99\x00\x00\x00r"'
+    b'\x01\x00\x00r\xdb\x00\x00\x00r$\x01\x00\x00r\x93\x00'
+    b'\x00\x00r&\x01\x00\x00r\x95\x00\x00\x00r(\x01\x00'
+    b'\x00r\xdd\x00\x00\x00r*\x01\x00\x00r\x90\x00\x00\x00'
+    b'r,\x01\x00\x00r\x97\x00\x00\x00r.\x01\x00\x00r'
+    b'\n\x00\x00\x00r0\x01\x00\x00r\xe2\x00\x00\x00r2'
+    b'\x01\x00\x00r\xe6\x00\x00\x00r4\x01\x00\x00r\xdf\x00'
+    b'\x00\x00r6\x01\x00\x00r\xea\x00\x00\x00r8\x01\x00'
+    b'\x00r\x14\x00\x00\x00r:\x01\x00\x00r\x17\x00\x00\x00'
+    b'r<\x01\x00\x00r\x1a\x00\x00\x00r>\x01\x00\x00r'
+    b'\x1d\x00\x00\x00r@\x01\x00\x00r \x00\x00\x00rB'
+    b'\x01\x00\x00r#\x00\x00\x00rD\x01\x00\x00r&\x00'
+    b'\x00\x00rF\x01\x00\x00r(\x00\x00\x00rH\x01\x00'
+    b'\x00r\xec\x00\x00\x00rJ\x01\x00\x00r\xee\x00\x00\x00'
+    b'rL\x01\x00\x00r\xef\x00\x00\x00rN\x01\x00\x00r'
+    b'\xf0\x00\x00\x00rP\x01\x00\x00r\xf1\x00\x00\x00rR'
+    b'\x01\x00\x00r\xf2\x00\x00\x00rT\x01\x00\x00r\xf4\x00'
+    b'\x00\x00rV\x01\x00\x00r\xf6\x00\x00\x00rX\x01\x00'
+    b'\x00r\x06\x00\x00\x00rY\x01\x00\x00r\x81\x00\x00\x00'
+    b'rZ\x01\x00\x00r\x83\x00\x00\x00r[\x01\x00\x00r'
+    b'\x88\x00\x00\x00r\\\x01\x00\x00r\x8a\x00\x00\x00r]'
+    b'\x01\x00\x00r\x91\x00\x00\x00r^\x01\x00\x00r\xdb\x00'
+    b'\x00\x00r_\x01\x00\x00r\x93\x00\x00\x00r`\x01\x00'
+    b'\x00r\x95\x00\x00\x00ra\x01\x00\x00r\xdd\x00\x00\x00'
+    b'rb\x01\x00\x00r\x90\x00\x00\x00rc\x01\x00\x00r'
+    b'\x97\x00\x00\x00rd\x01\x00\x00r\n\x00\x00\x00re'
+    b'\x01\x00\x00r\xe2\x00\x00\x00rf\x01\x00\x00r\xe6\x00'
+    b'\x00\x00rg\x01\x00\x00r\xdf\x00\x00\x00rh\x01\x00'
+    b'\x00r\xea\x00\x00\x00ri\x01\x00\x00r\x14\x00\x00\x00'
+    b'rj\x01\x00\x00r\x17\x00\x00\x00rk\x01\x00\x00r'
+    b'\x1a\x00\x00\x00rl\x01\x00\x00r\x1d\x00\x00\x00rm'
+    b'\x01\x00\x00r \x00\x00\x00rn\x01\x00\x00r#\x00'
+    b'\x00\x00ro\x01\x00\x00r&\x00\x00\x00rp\x01\x00'
+    b'\x00r(\x00\x00\x000{r\x06\x00\x00\x00r\x14\x01'
+    b'\x00\x00r\x81\x00\x00\x00r\x16\x01\x00\x00r\x83\x00\x00'
+    b'\x00r\x18\x01\x00\x00r\x88\x00\x00\x00r\x1a\x01\x00\x00'
+    b'r\x8a\x00\x00\x00r\x1c\x01\x00\x00r\x91\x00\x00\x00r'
+    b'\x1e\x01\x00\x00r\x99\x00\x00\x00r \x01\x00\x00r\xdb'
+    b'\x00\x00\x00r"\x01\x00\x00r\x93\x00\x00\x00r$\x01'
+    b'\x00\x00r\x95\x00\x00\x00r&\x01\x00\x00r\xdd\x00\x00'
+    b'\x00r(\x01\x00\x00r\x90\x00\x00\x00r*\x01\x00\x00'
+    b'r\x97\x00\x00\x00r,\x01\x00\x00r\n\x00\x00\x00r'
+    b'.\x01\x00\x00r\xe2\x00\x00\x00r0\x01\x00\x00r\xe6'
+    b'\x00\x00\x00r2\x01\x00\x00r\xdf\x00\x00\x00r4\x01'
+    b'\x00\x00r\xea\x00\x00\x00r6\x01\x00\x00r\x14\x00\x00'
+    b'\x00r8\x01\x00\x00r\x17\x00\x00\x00r:\x01\x00\x00'
+    b'r\x1a\x00\x00\x00r<\x01\x00\x00r\x1d\x00\x00\x00r'
+    b'>\x01\x00\x00r \x00\x00\x00r@\x01\x00\x00r#'
+    b'\x00\x00\x00rB\x01\x00\x00r&\x00\x00\x00rD\x01'
+    b'\x00\x00r(\x00\x00\x00rF\x01\x00\x00r\xec\x00\x00'
+    b'\x00rH\x01\x00\x00r\xee\x00\x00\x00rJ\x01\x00\x00'
+    b'r\xef\x00\x00\x00rL\x01\x00\x00r\xf0\x00\x00\x00r'
+    b'N\x01\x00\x00r\xf1\x00\x00\x00rP\x01\x00\x00r\xf2'
+    b'\x00\x00\x00rR\x01\x00\x00r\xf4\x00\x00\x00rT\x01'
+    b'\x00\x00r\xf6\x00\x00\x00rV\x01\x00\x00r\xf3\x00\x00'
+    b'\x00r\x0b\x00\x00\x00r\xf5\x00\x00\x00\xfa\x01!r\xf7'
+    b'\x00\x00\x00\xfa\x01"r\x85\x00\x00\x00r\x00\x01\x00\x00'
+    b'r\x8b\x00\x00\x00r\x0b\x01\x00\x00r\xe3\x00\x00\x00\xfa'
+    b'\x01%r\r\x00\x00\x00\xfa\x01&r\x10\x00\x00\x00\xfa'
+    b"\x01'r\x13\x00\x00\x00r\x0e\x01\x00\x00r\x0e\x00\x00"
+    b'\x00\xfa\x01)r\x16\x00\x00\x00r}\x00\x00\x00r\x19'
+    b'\x00\x00\x00r8\x00\x00\x00r\x1c\x00\x00\x00\xfa\x01,'
+    b'r\x1f\x00\x00\x00rz\x00\x00\x00r"\x00\x00\x00\xfa'
+    b'\x01.r%\x00\x00\x00r\x0f\x01\x00\x00r\x11\x00\x00'
+    b'\x00r\x0f\x00\x00\x00r\x9d\x00\x00\x00r\x12\x00\x00\x00'
+    b'r*\x00\x00\x00r\x15\x00\x00\x00r-\x00\x00\x00r'
+    b'\x18\x00\x00\x00r0\x00\x00\x00r\x1b\x00\x00\x00r3'
+    b'\x00\x00\x00r\x1e\x00\x00\x00r6\x00\x00\x00r!\x00'
+    b'\x00\x00r9\x00\x00\x00r$\x00\x00\x00r<\x00\x00'
+    b"\x00r'\x00\x00\x00r@\x00\x00\x00r\x0c\x00\x00\x00"
+    b'r\xa0\x00\x00\x00\xfa\x01:rD\x00\x00\x00\xfa\x01;'
+    b'rG\x00\x00\x00r\x13\x01\x00\x00rJ\x00\x00\x00r'
+    b'\x12\x01\x00\x00rM\x00\x00\x00r\x11\x01\x00\x00rP'
+    b'\x00\x00\x00\xfa\x01?rR\x00\x00\x00r2\x00\x00\x00'
+    b'rU\x00\x00\x00\xda\x01ArB\x00\x00\x00\xfa\x01B'
+    b'rW\x00\x00\x00\xfa\x01CrZ\x00\x00\x00\xfa\x01D'
+    b'r]\x00\x00\x00\xfa\x01Er`\x00\x00\x00\xfa\x01F'
+    b'rb\x00\x00\x00\xfa\x01Grd\x00\x00\x00\xfa\x01H'
+    b'rg\x00\x00\x00\xda\x01Irj\x00\x00\x00\xfa\x01J'
+    b'r\xa4\x00\x00\x00\xda\x01Krm\x00\x00\x00\xfa\x01L'
+    b'ro\x00\x00\x00\xda\x01Mrr\x00\x00\x00\xda\x01N'
+    b'ru\x00\x00\x00\xfa\x01Orx\x00\x00\x00\xda\x01P'
+    b'r\xa6\x00\x00\x00\xfa\x01Qr\xa8\x00\x00\x00\xfa\x01R'
+    b'r\xaa\x00\x00\x00\xfa\x01Sr\xac\x00\x00\x00\xfa\x01T'
+    b'r\xae\x00\x00\x00\xda\x01Ur\xa2\x00\x00\x00\xfa\x01V'
+    b'r\xb0\x00\x00\x00\xfa\x01Wr\xb2\x00\x00\x00\xda\x01X'
+    b'r\xb4\x00\x00\x00\xfa\x01Yr\xb6\x00\x00\x00\xfa\x01Z'
+    b'r\xba\x00\x00\x00z\x04{EP}r\x86\x00\x00\x00'
+    b'z\n{UP_ARROW}r\x8c\x00\x00'
+    b'\x00z\x0c{LEFT_ARROW}r'
+    b'\xe4\x00\x00\x00z\x04{PI}r\x9a\x00\x00\x00z'
+    b'\n{S RETURN}r+\x00\x00\x00'
+    b'z\x05{C K}r.\x00\x00\x00z\x05{C'
+    b' I}r1\x00\x00\x00z\x05{C T}r'
+    b'4\x00\x00\x00z\x05{C @}r7\x00\x00\x00'
+    b'z\x05{C G}r:\x00\x00\x00z\x05{C'
+    b' +}r=\x00\x00\x00z\x05{C M}r'
+    b'A\x00\x00\x00z\x06{C EP}r\xa1\x00\x00'
+    b'\x00z\x06{S EP}rE\x00\x00\x00z\x05'
+    b'{C N}rH\x00\x00\x00z\x05{C Q'
+    b'}rK\x00\x00\x00z\x05{C D}rN\x00'
+    b'\x00\x00z\x05{C Z}rQ\x00\x00\x00z\x05'
+    b'{C S}rS\x00\x00\x00z\x05{C P'
+    b'}rV\x00\x00\x00z\x05{C A}rC\x00'
+    b'\x00\x00z\x05{C E}rX\x00\x00\x00z\x05'
+    b'{C R}r[\x00\x00\x00z\x05{C W'
+    b'}r^\x00\x00\x00z\x05{C H}ra\x00'
+    b'\x00\x00z\x05{C J}rc\x00\x00\x00z\x05'
+    b'{C L}re\x00\x00\x00z\x05{C Y'
+    b'}rh\x00\x00\x00z\x05{C U}rk\x00'
+    b'\x00\x00z\x05{C O}r\xa5\x00\x00\x00z\x05'
+    b'{S @}rn\x00\x00\x00z\x05{C F'
+    b'}rp\x00\x00\x00z\x05{C C}rs\x00'
+    b'\x00\x00z\x05{C X}rv\x00\x00\x00z\x05'
+    b'{C V}ry\x00\x00\x00z\x05{C B'
+    b'}r\xa7\x00\x00\x00z\x05{S *}r\xa9\x00'
+    b'\x00\x00z\x05{S A}r\xab\x00\x00\x00z\x05'
+    b'{S B}r\xad\x00\x00\x00z\x05{S C'
+    b'}r\xaf\x00\x00\x00z\x05{S D}r\xa3\x00'
+    b'\x00\x00z\x05{S E}r\xb1\x00\x00\x00z\x05'
+    b'{S F}r\xb3\x00\x00\x00z\x05{S G'
+    b'}r\xb5\x00\x00\x00z\x05{S H}r\xb7\x00'
+    b'\x00\x00z\x05{S I}r\xb9\x00\x00\x00z\x05'
+    b'{S J}r\xbb\x00\x00\x00z\x05{S K'
+    b'}r\xbd\x00\x00\x00z\x05{S L}r\xbe\x00'
+    b'\x00\x00z\x05{S M}r\xbf\x00\x00\x00z\x05'
+    b'{S N}r\xc1\x00\x00\x00z\x05{S O'
+    b'}r\xc3\x00\x00\x00z\x05{S P}r\xc5\x00'
+    b'\x00\x00z\x05{S Q}r\x9c\x00\x00\x00z\x05'
+    b'{S R}r\x9f\x00\x00\x00z\x05{S S'
+    b'}r\xc7\x00\x00\x00z\x05{S T}r\xc9\x00'
+    b'\x00\x00z\x05{S U}r\xcd\x00\x00\x00z\x05'
+    b'{S V}r\xcf\x00\x00\x00z\x05{S W'
+    b'}r\xd1\x00\x00\x00z\x05{S X}r\xd3\x00'
+    b'\x00\x00z\x05{S Y}r\xd5\x00\x00\x00z\x05'
+    b'{S Z}r\xd7\x00\x00\x00z\x05{S +'
+    b'}r|\x00\x00\x00z\x05{C -}r\xd9\x00'
+    b'\x00\x00z\x05{S -}r\xcb\x00\x00\x00z\x0c'
+    b'{S UP_ARROW}r\x7f\x00\x00'
+    b'\x00z\x05{C *}0{r\xf9\x00\x00\x00z'
+    b'\x03ENDr\x14\x00\x00\x00z\x03FORr\xfc'
+    b'\x00\x00\x00z\x04NEXTr\xfe\x00\x00\x00z\x04'
+    b'DATAr\x02\x01\x00\x00z\x06INPUT'
+    b'#r\xec\x00\x00\x00z\x05INPUTr\xef\x00'
+    b'\x00\x00z\x03DIMr\xf1\x00\x00\x00z\x04RE'
+    b'ADr\xf4\x00\x00\x00z\x03LETr\xee\x00\x00'
+    b'\x00z\x04GOTOr\xf0\x00\x00\x00z\x03RU'
+    b'Nr\xf2\x00\x00\x00z\x02IFr\xf6\x00\x00\x00z'
+    b'\x07RESTOREr\x9a\x00\x00\x00z\x05G'
+    b'OSUBr\x08\x01\x00\x00z\x06RETUR'
+    b'Nr\t\x01\x00\x00z\x03REMr\xdd\x00\x00\x00'
+    b'z\x04STOPr\x83\x00\x00\x00z\x02ONr'
+    b'\x95\x00\x00\x00z\x04WAITr\x06\x00\x00\x00z'
+    b'\x04LOADr\xdb\x00\x00\x00z\x04SAVE'
+    b'r\x17\x00\x00\x00z\x06VERIFYr\x1a\x00'
+    b'\x00\x00z\x03DEFr\x1d\x00\x00\x00z\x04PO'
+    b'KEr \x00\x00\x00z\x06PRINT#r'
+    b'#\x00\x00\x00z\x05PRINTr&\x00\x00\x00'
+    b'z\x04CONTr(\x00\x00\x00z\x04LIS'
+    b'Tr\xe2\x00\x00\x00z\x03CLRr\x8a\x00\x00\x00'
+    b'z\x03CMDr\xea\x00\x00\x00z\x03SYSr'
+    b'\n\x00\x00\x00z\x04OPENr\x99\x00\x00\x00z'
+    b'\x05CLOSEr+\x00\x00\x00z\x03GET'
+    b'r.\x00\x00\x00z\x03NEWr1\x00\x00\x00z'
+    b'\x04TAB(r4\x00\x00\x00z\x02TOr7'
+    b'\x00\x00\x00z\x02FNr:\x00\x00\x00z\x04SP'
+    b'C(r=\x00\x00\x00z\x04THENrA\x00'
+    b'\x00\x00z\x03NOTr\xa1\x00\x00\x00z\x04ST'
+    b'EPrE\x00\x00\x00z\x01+rH\x00\x00\x00z'
+    b'\x01-rK\x00\x00\x00z\x01*rN\x00\x00\x00z'
+    b'\x01/rQ\x00\x00\x00z\x01^rS\x00\x00\x00z'
+    b'\x03ANDrV\x00\x00\x00z\x02ORrC\x00'
+    b'\x00\x00z\x01>rX\x00\x00\x00z\x01=r[\x00'
+    b'\x00\x00z\x01<r^\x00\x00\x00z\x03SGNr'
+    b'a\x00\x00\x00z\x03INTrc\x00\x00\x00z\x03'
+    b'ABSre\x00\x00\x00z\x03USRrh\x00'
+    b'\x00\x00z\x03FRErk\x00\x00\x00z\x03PO'
+    b'Sr\xa5\x00\x00\x00z\x03SQRrn\x00\x00\x00'
+    b'z\x03RNDrp\x00\x00\x00z\x03LOGr'
+    b's\x00\x00\x00z\x03EXPrv\x00\x00\x00z\x03'
+    b'COSry\x00\x00\x00z\x03SINr\xa7\x00'
+    b'\x00\x00z\x03TANr\xa9\x00\x00\x00z\x03AT'
+    b'Nr\xab\x00\x00\x00z\x04PEEKr\xad\x00\x00'
+    b'\x00z\x03LENr\xaf\x00\x00\x00z\x04STR'
+    b'$r\xa3\x00\x00\x00z\x03VALr\xb1\x00\x00\x00'
+    b'z\x03ASCr\xb3\x00\x00\x00z\x04CHR$'
+    b'r\xb5\x00\x00\x00z\x05LEFT$r\xb7\x00\x00'
+    b'\x00z\x06RIGHT$r\xb9\x00\x00\x00z\x04'
+    b'MID$r\xbb\x00\x00\x00z\x02GO0'
+)
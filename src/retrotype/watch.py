@@ -0,0 +1,222 @@
+"""
+Keeps a converted program in memory while its source file is edited,
+reconverting only the lines that change on each save.
+"""
+
+from difflib import SequenceMatcher
+import os
+import struct
+import time
+from typing import NamedTuple
+
+try:
+    from retrotype.retrotype import (PrgBuilder,
+                                     convert_line,
+                                     bad_char_column,
+                                     BadCharError,
+                                     LooseBraceError,
+                                     )
+except ImportError:  # Case for direct python execution
+    from retrotype import (PrgBuilder,
+                           convert_line,
+                           bad_char_column,
+                           BadCharError,
+                           LooseBraceError,
+                           )
+
+
+class WatchedLine(NamedTuple):
+    """A converted line of the watched program"""
+
+    line_num: int
+    text: str
+    byte_list: bytes
+    checksum: str
+
+
+class LineChange(NamedTuple):
+    """A line whose checksum changed, was added, or was removed by an edit"""
+
+    line_num: int
+    old_checksum: str  # None for an added line
+    new_checksum: str  # None for a removed line
+
+
+class ProgramState:
+    """Converted lines and program image of a source file being edited
+
+    Each update diffs the new lines against the current ones, converts only
+    the inserted and replaced lines, and relinks the program image from the
+    first changed line on.  A failed update leaves the state unchanged.
+    """
+
+    def __init__(self, source, load_addr=0x0801):
+        self.source = source
+        self.prg = PrgBuilder(load_addr)
+        self.lines = []
+        self.offsets = []  # image offset of each line's link address
+        self.converted = 0  # lines converted by the last update
+
+    @property
+    def checksums(self):
+        """Tuples of (line number, checksum) for each line"""
+        return [(line.line_num, line.checksum) for line in self.lines]
+
+    def update(self, records):
+        """Bring the program up to date with the lines of the edited source
+
+        Args:
+            records (list): SourceLine records for every line of the source,
+                with their line numbers already checked
+
+        Returns:
+            list: LineChange tuples in line number order
+
+        Raises:
+            LooseBraceError: If a changed line has a loose brace
+            BadCharError: If a changed line has a character with no
+                Commodore equivalent
+        """
+        old_keys = [(line.line_num, line.text) for line in self.lines]
+        new_keys = [(record.line_num, record.text) for record in records]
+        matcher = SequenceMatcher(None, old_keys, new_keys, autojunk=False)
+
+        lines = []
+        first_change = None
+        converted = 0
+        for (tag, old_start, old_end, new_start, new_end) in \
+                matcher.get_opcodes():
+            if tag == 'equal':
+                lines.extend(self.lines[old_start:old_end])
+                continue
+            if first_change is None:
+                first_change = new_start
+            for record in records[new_start:new_end]:
+                try:
+                    (byte_list, checksum) = convert_line(
+                        record.line_num, record.text, self.source)
+                except ValueError:
+                    if bad_char_column(record) is None:
+                        raise
+                    raise BadCharError(record) from None
+                if byte_list is None:
+                    raise LooseBraceError(record)
+                lines.append(WatchedLine(record.line_num, record.text,
+                                         bytes(byte_list), checksum))
+                converted += 1
+
+        self.converted = converted
+        if first_change is None:
+            return []
+
+        # relink the image from the first changed line on
+        if first_change < len(self.offsets):
+            self.prg.truncate(self.offsets[first_change], first_change)
+        del self.offsets[first_change:]
+        for line in lines[first_change:]:
+            self.offsets.append(len(self.prg.data) - 2)
+            self.prg.add_line(line.line_num, line.byte_list)
+
+        old_codes = dict(self.checksums)
+        self.lines = lines
+        new_codes = dict(self.checksums)
+        return [LineChange(line_num, old_codes.get(line_num),
+                           new_codes.get(line_num))
+                for line_num in sorted(old_codes.keys() | new_codes.keys())
+                if old_codes.get(line_num) != new_codes.get(line_num)]
+
+
+def file_watcher(filename, interval=0.5):
+    """Watch a file for changes with inotify where available, else by
+       polling its size and modification time
+
+    Args:
+        filename (str): File to watch
+        interval (float): Seconds between checks when polling
+
+    Returns:
+        InotifyWatcher or PollWatcher: Watcher whose wait() returns once the
+            file may have changed
+    """
+    try:
+        return InotifyWatcher(filename)
+    except OSError:
+        return PollWatcher(filename, interval)
+
+
+class PollWatcher:
+    """Waits for a file's size or modification time to change"""
+
+    def __init__(self, filename, interval=0.5):
+        self.filename = filename
+        self.interval = interval
+        self.signature = self._signature()
+
+    def _signature(self):
+        try:
+            status = os.stat(self.filename)
+        except OSError:
+            return None
+        return (status.st_mtime_ns, status.st_size)
+
+    def wait(self):
+        while True:
+            time.sleep(self.interval)
+            signature = self._signature()
+            if signature != self.signature:
+                self.signature = signature
+                return
+
+    def close(self):
+        pass
+
+
+# inotify event masks, see inotify(7)
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    """Waits for inotify to report a write to a file, or a file renamed over
+       it as editors do when saving, by watching its directory
+    """
+
+    def __init__(self, filename):
+        import ctypes
+        import ctypes.util
+
+        library = ctypes.util.find_library('c')
+        if library is None:
+            raise OSError('C library not found')
+        libc = ctypes.CDLL(library, use_errno=True)
+        if not hasattr(libc, 'inotify_init1'):
+            raise OSError('inotify not available')
+
+        self.name = os.fsencode(os.path.basename(filename))
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        directory = os.path.dirname(os.path.abspath(filename))
+        if libc.inotify_add_watch(
+                self.fd, os.fsencode(directory),
+                _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE) < 0:
+            error = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(error, 'inotify_add_watch failed')
+
+    def wait(self):
+        while True:
+            data = os.read(self.fd, 65536)
+            pos = 0
+            while pos < len(data):
+                (_, _, _, length) = _EVENT_HEADER.unpack_from(data, pos)
+                pos += _EVENT_HEADER.size
+                name = data[pos:pos + length].rstrip(b'\0')
+                pos += length
+                if name == self.name:
+                    return
+
+    def close(self):
+        os.close(self.fd)
@@ -0,0 +1,182 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+import pytest
+
+from retrotype.cache import (ConversionCache,
+                             CacheEntry,
+                             default_cache_dir,
+                             _encode_entry,
+                             )
+from retrotype.retrotype_cli import command_line_runner, open_source
+
+
+PRG = (b'\x01\x08\x0e\x08\n\x00\x99"HELLO"\x00\x16\x08\x14\x00\x8910\x00'
+       b'\x00\x00')
+CHECKSUMS = [(10, 'EO'), (20, 'PH')]
+AUTO_CHECKSUMS = [(10, {'ahoy1': 'IA', 'ahoy2': 'EO', 'ahoy3': 'GC'})]
+
+
+def test_default_cache_dir(monkeypatch, tmp_path):
+    """
+    Unit test to check that function default_cache_dir() follows
+    $XDG_CACHE_HOME.
+    """
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path))
+    assert default_cache_dir() == str(tmp_path / 'retrotype')
+    assert ConversionCache().cache_dir == str(tmp_path / 'retrotype')
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        (b'10 print"hello"\n20 goto11\n', 'ahoy2', 0x0801),
+        (b'10 print"hello"\n20 goto10\n', 'ahoy3', 0x0801),
+        (b'10 print"hello"\n20 goto10\n', 'ahoy2', 0x1001),
+    ],
+)
+def test_key(options):
+    """
+    Unit test to check that ConversionCache.key() changes with the source
+    content and with each conversion option.
+    """
+    cache = ConversionCache('unused')
+    key = cache.key(b'10 print"hello"\n20 goto10\n', 'ahoy2', 0x0801)
+    assert key == cache.key(b'10 print"hello"\n20 goto10\n', 'ahoy2', 0x0801)
+    assert key != cache.key(*options)
+
+
+@pytest.mark.parametrize("checksums", [CHECKSUMS, AUTO_CHECKSUMS, []])
+def test_put_get(tmp_path, checksums):
+    """
+    Unit test to check that a converted program is returned from the cache as
+    it was stored, counting hits and misses.
+    """
+    cache = ConversionCache(str(tmp_path / 'cache'))
+    key = cache.key(b'10 print"hello"', 'ahoy2', 0x0801)
+    assert cache.get(key) is None
+    cache.put(key, memoryview(PRG), checksums)
+    assert cache.get(key) == CacheEntry(PRG, checksums)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b'',
+        b'retrotype-cache 1 200\n10 EO\n',
+        b'retrotype-cache 9 0\n',
+    ],
+)
+def test_get_incomplete(tmp_path, data):
+    """
+    Unit test to check that an unreadable or incomplete entry is a miss.
+    """
+    cache = ConversionCache(str(tmp_path))
+    key = cache.key(b'', 'ahoy2', 0x0801)
+    (tmp_path / f'{key}.entry').write_bytes(data)
+    assert cache.get(key) is None
+
+
+def test_evict_least_recently_used(tmp_path):
+    """
+    Unit test to check that the least recently used entries are removed
+    once the cache grows past its size bound.
+    """
+    size = len(_encode_entry(PRG, CHECKSUMS))
+    cache = ConversionCache(str(tmp_path), max_bytes=size * 2)
+    keys = [cache.key(bytes([index]), 'ahoy2', 0x0801) for index in range(3)]
+    for (age, key) in enumerate(keys[:2]):
+        cache.put(key, PRG, CHECKSUMS)
+        os.utime(tmp_path / f'{key}.entry', (1000 + age, 1000 + age))
+    assert cache.get(keys[0]) is not None  # now the most recently used
+    cache.put(keys[2], PRG, CHECKSUMS)
+
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        f'{key}.entry' for key in (keys[0], keys[2]))
+
+
+def _put_many(args):
+    (cache_dir, index) = args
+    cache = ConversionCache(cache_dir, max_bytes=4096)
+    for count in range(50):
+        key = cache.key(bytes([(index + count) % 8]), 'ahoy2', 0x0801)
+        cache.put(key, PRG, CHECKSUMS)
+        entry = cache.get(key)
+        assert entry is None or entry == CacheEntry(PRG, CHECKSUMS)
+
+
+def test_concurrent_access(tmp_path):
+    """
+    Unit test to check that processes sharing a cache directory only ever
+    read complete entries while others write and evict.
+    """
+    with ProcessPoolExecutor(4) as executor:
+        list(executor.map(_put_many, [(str(tmp_path), index)
+                                      for index in range(4)]))
+    assert all(name.endswith('.entry') for name in os.listdir(tmp_path))
+    assert sum(os.path.getsize(tmp_path / name)
+               for name in os.listdir(tmp_path)) <= 4096
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError('source converted')
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ['-s', 'ahoy1'],
+        ['-s', 'auto', '-r', '{d}/example.ref'],
+        ['--batch', '{d}', '-s', 'ahoy1'],
+    ],
+)
+def test_command_line_runner_cache(tmp_path, capsys, monkeypatch, argv):
+    """
+    End to end test to check that function command_line_runner() gives the
+    same outputs from the cache without converting an unchanged source, and
+    converts it again with --no-cache or once it changes.
+    """
+    d = tmp_path / 'src'
+    d.mkdir()
+    p = d / 'example.ahoy'
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+    (d / 'example.ref').write_text('10 IA\n20 NI\n')
+    argv = [arg.format(d=d) for arg in argv]
+    if '--batch' not in argv:
+        argv.append(str(p))
+    argv[:0] = ['--cache-dir', str(tmp_path / 'cache')]
+
+    def run(argv):
+        for output in ('example.prg', 'example.chk'):
+            if (d / output).exists():
+                (d / output).unlink()
+        command_line_runner(argv, 40)
+        return (capsys.readouterr().out, (d / 'example.prg').read_bytes(),
+                (d / 'example.chk').read_text())
+
+    converted = run(argv)
+    monkeypatch.setattr('retrotype.retrotype_cli.convert_lines', _fail)
+    assert run(argv) == converted
+    with pytest.raises(AssertionError, match='source converted'):
+        run(argv + ['--no-cache'])
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n\n')
+    with pytest.raises(AssertionError, match='source converted'):
+        run(argv)
+
+
+def test_open_source_large(tmp_path):
+    """
+    Unit test to check that function open_source() streams a source larger
+    than the cache's limit without reading it for a cache key.
+    """
+    cache = ConversionCache(str(tmp_path / 'cache'), max_source_bytes=20)
+    p = tmp_path / 'example.ahoy'
+    p.write_text('10 PRINT"HELLO"\n')
+    (file, key, entry) = open_source(str(p), cache, 'ahoy2', None)
+    with file:
+        assert key is not None and entry is None
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+    (file, key, entry) = open_source(str(p), cache, 'ahoy2', None)
+    with file:
+        assert (key, entry) == (None, None)
+        assert file.read() == '10 PRINT"HELLO"\n20 GOTO10\n'
@@ -0,0 +1,75 @@
+import pytest
+
+from retrotype.retrotype import PrgBuilder, convert_line
+from retrotype.interactive import TypedProgram, EnteredLine
+
+
+def test_typed_program_enter():
+    """
+    Unit test to check that TypedProgram.enter() adds, replaces, and deletes
+    lines by line number as BASIC does, in any order.
+    """
+    program = TypedProgram('ahoy2')
+    assert program.enter('20 GOTO10') == EnteredLine(
+        20, '20 GOTO10', b'\x89\x31\x30\x00', 'PH')
+    assert program.enter('  10 PRINT"HELLO"  ').checksum == 'EO'
+    assert program.enter('20 GOTO11').checksum == 'PG'
+    assert program.checksums == [(10, 'EO'), (20, 'PG')]
+    assert program.modified
+
+    assert program.enter('10') is None
+    assert program.checksums == [(20, 'PG')]
+    assert len(program) == 1
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ('PRINT"HELLO"', 'Line should start with a line number'),
+        ('30', 'Line 30 is not in the program'),
+        ('64000 REM', 'Line numbers should be at most 63999'),
+        ('30 REM"{CD', 'Loose brace/bracket at column 8 - special characters '
+                       'should be enclosed in braces/brackets'),
+        ('30 PRINT"\u201cHI"',
+         'Character "\u201c" at column 10 has no Commodore equivalent - type '
+         'it as printed in the magazine'),
+    ],
+)
+def test_typed_program_enter_errors(line, message):
+    """
+    Unit test to check that TypedProgram.enter() rejects lines it cannot
+    enter, leaving the program unchanged.
+    """
+    program = TypedProgram('ahoy2')
+    program.enter('10 REM')
+    program.modified = False
+    with pytest.raises(ValueError) as error:
+        program.enter(line)
+    assert str(error.value) == message
+    assert program.checksums == [(10, 'JD')]
+    assert not program.modified
+
+
+def test_typed_program_build():
+    """
+    Unit test to check that TypedProgram.build() links the lines in line
+    number order whatever order they were typed in, and ahoy3 checksums
+    include the line number.
+    """
+    lines = ['10 print"{cd}hello"', '20 data 1,2,3', '30 goto10']
+    program = TypedProgram('ahoy3', 0x1001)
+    for line in reversed(lines):
+        program.enter(line)
+    program.enter('15 rem')
+    program.enter('15')
+
+    prg = PrgBuilder(0x1001)
+    checksums = []
+    for line in lines:
+        (line_num, text) = line.split(' ', 1)
+        (byte_list, checksum) = convert_line(int(line_num), text, 'ahoy3')
+        prg.add_line(int(line_num), byte_list)
+        checksums.append((int(line_num), checksum))
+    assert bytes(program.build().data) == bytes(prg.data)
+    assert program.checksums == checksums
+    assert [line.listing for line in program.ordered(15, 30)] == lines[1:]
@@ -0,0 +1,219 @@
+from io import BytesIO
+import json
+import pytest
+
+from retrotype.lsp import (LineInfo,
+                           analyze_line,
+                           SourceDocument,
+                           LanguageServer,
+                           main,
+                           )
+
+
+@pytest.mark.parametrize(
+    "line, info",
+    [
+        ('', None),
+        ('   ', None),
+        ('10 PRINT"HELLO"', LineInfo(10, 1, 2, 'EO', None)),
+        ('  020 GOTO10', LineInfo(20, 3, 3, 'PH', None)),
+        ('PRINT"HELLO"', LineInfo(None, 1, 0, None, None)),
+        ('30 REM"{CD', LineInfo(30, 1, 2, None, 8)),
+        ('40 PRINT"IT\u2019S"', LineInfo(40, 1, 2, None, None, 12, '\u2019')),
+        ('50 REM\U0001f600"{CD',
+         LineInfo(50, 1, 2, None, None, 7, '\U0001f600')),
+        ('60 REM"\xe9\U0001f600{CD',
+         LineInfo(60, 1, 2, None, None, 9, '\U0001f600')),
+    ],
+)
+def test_analyze_line(line, info):
+    """
+    Unit test to check that function analyze_line() gives the checksum or
+    the error of a line with the position of its line number.
+    """
+    assert analyze_line(line, 'ahoy2') == info
+
+
+def _messages(diagnostics):
+    return [(diagnostic['range']['start']['line'],
+             diagnostic['range']['start']['character'],
+             diagnostic['range']['end']['character'],
+             diagnostic['severity'], diagnostic['message'])
+            for diagnostic in diagnostics]
+
+
+def test_source_document_diagnostics():
+    """
+    Unit test to check that SourceDocument.diagnostics() reports line number,
+    loose brace, and reference file errors at the lines they are found in.
+    """
+    text = ('10 PRINT"HELLO"\n\n20 GOTO11\nPRINT\n15 REM"{CD\n40 END\n'
+            '45 END\n')
+    ref_codes = {10: 'EO', 20: 'PH', 30: 'JD', 40: 'IC', 50: 'AA'}
+    document = SourceDocument(text, 'ahoy2', ref_codes)
+    assert _messages(document.diagnostics()) == [
+        (2, 0, 2, 2, 'Checksum PG does not match reference PH'),
+        (3, 0, 5, 1, 'Line should start with a line number'),
+        (4, 0, 2, 1, 'Line 15 follows line 20 - lines should be in '
+                     'sequential order'),
+        (4, 7, 8, 1, 'Loose brace/bracket - special characters should be '
+                     'enclosed in braces/brackets'),
+        (5, 0, 2, 3, 'Reference lines missing: 30'),
+        (6, 0, 2, 2, 'Line 45 is not in the reference file'),
+        (6, 0, 6, 3, 'Reference lines missing: 50'),
+    ]
+    assert document.inlay_hints(0, 2) == [
+        {'position': {'line': 0, 'character': 15}, 'label': 'EO',
+         'paddingLeft': True},
+        {'position': {'line': 2, 'character': 9}, 'label': 'PG',
+         'paddingLeft': True},
+    ]
+
+
+LINES = [f'{10 * i} PRINT"{{CD}}LINE {i}":GOTO{10 * i}' for i in range(1, 41)]
+
+
+@pytest.mark.parametrize(
+    "change, converted",
+    [
+        # replace a character, then type at the end of a line
+        ({'range': {'start': {'line': 5, 'character': 1},
+                    'end': {'line': 5, 'character': 2}}, 'text': '5'}, 1),
+        ({'range': {'start': {'line': 7, 'character': 40},
+                    'end': {'line': 7, 'character': 40}}, 'text': '{'}, 1),
+        # split a line, and join lines by deleting across them
+        ({'range': {'start': {'line': 9, 'character': 3},
+                    'end': {'line': 9, 'character': 3}},
+          'text': 'REM\n95 '}, 2),
+        ({'range': {'start': {'line': 3, 'character': 10},
+                    'end': {'line': 12, 'character': 4}}, 'text': ''}, 1),
+        # insert lines, with a position past the end of the document
+        ({'range': {'start': {'line': 40, 'character': 0},
+                    'end': {'line': 45, 'character': 0}},
+          'text': '\r\n500 END\r\n'}, 3),
+        ({'text': '10 END\n'}, 2),
+    ],
+)
+def test_source_document_apply_change(change, converted):
+    """
+    Unit test to check that SourceDocument.apply_change() converts only the
+    edited lines, giving the same lines and diagnostics as converting the
+    edited text in full.
+    """
+    document = SourceDocument('\n'.join(LINES) + '\n', 'ahoy3', {10: 'AA'})
+    document.diagnostics()
+    document.apply_change(change)
+    assert document.converted == converted
+
+    fresh = SourceDocument('\n'.join(document.lines), 'ahoy3', {10: 'AA'})
+    assert document.infos == fresh.infos
+    assert document.diagnostics() == fresh.diagnostics()
+
+
+def test_source_document_utf16_columns():
+    """
+    Unit test to check that SourceDocument.diagnostics() gives columns in
+    UTF-16 code units, and reports a character with no Commodore byte value
+    rather than failing, including when it is typed in an edit.
+    """
+    text = '10 REM"\U0001f600\n20 PRINT"A"\n30 REM"\U0001f600{CD\n'
+    document = SourceDocument(text, 'ahoy2', {10: 'AA', 20: 'AA', 40: 'AA'})
+    document.apply_change({'range': {'start': {'line': 1, 'character': 9},
+                                     'end': {'line': 1, 'character': 9}},
+                           'text': '\u2019'})
+    assert document.lines[1] == '20 PRINT"\u2019A"'
+    assert len(document.lines) == len(document.infos) == 4
+    assert _messages(document.diagnostics()) == [
+        (0, 7, 9, 1, 'Character "\U0001f600" has no Commodore equivalent - '
+                     'type it as printed in the magazine'),
+        (1, 9, 10, 1, 'Character "\u2019" has no Commodore equivalent - '
+                      'type it as printed in the magazine'),
+        (2, 7, 9, 1, 'Character "\U0001f600" has no Commodore equivalent - '
+                     'type it as printed in the magazine'),
+        (2, 0, 12, 3, 'Reference lines missing: 40'),
+    ]
+
+
+def _frame(message):
+    body = json.dumps(message).encode()
+    return b'Content-Length: %d\r\n\r\n' % len(body) + body
+
+
+def _read_frames(data):
+    messages = []
+    while data:
+        (header, _, data) = data.partition(b'\r\n\r\n')
+        length = int(header.split(b':')[1])
+        messages.append(json.loads(data[:length]))
+        data = data[length:]
+    return messages
+
+
+def test_language_server(tmp_path):
+    """
+    End to end test to check that LanguageServer publishes diagnostics for
+    open documents as they change, answers inlay hint requests, and exits
+    cleanly after shutdown.
+    """
+    (tmp_path / "example.ref").write_text('10 EO\n20 PH\n')
+    uri = (tmp_path / "example.ahoy").as_uri()
+    requests = [
+        {'jsonrpc': '2.0', 'id': 1, 'method': 'initialize',
+         'params': {'initializationOptions': {'source': 'ahoy2'}}},
+        {'jsonrpc': '2.0', 'method': 'initialized', 'params': {}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didOpen',
+         'params': {'textDocument': {'uri': uri, 'languageId': 'ahoy',
+                                     'version': 1,
+                                     'text': '10 PRINT"HELLO"\n20 GOTO11\n'}}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didChange',
+         'params': {'textDocument': {'uri': uri, 'version': 2},
+                    'contentChanges': [
+                        {'range': {'start': {'line': 1, 'character': 8},
+                                   'end': {'line': 1, 'character': 9}},
+                         'text': '0'}]}},
+        {'jsonrpc': '2.0', 'id': 2, 'method': 'textDocument/inlayHint',
+         'params': {'textDocument': {'uri': uri},
+                    'range': {'start': {'line': 1, 'character': 0},
+                              'end': {'line': 2, 'character': 0}}}},
+        {'jsonrpc': '2.0', 'id': 3, 'method': 'textDocument/hover',
+         'params': {}},
+        {'jsonrpc': '2.0', 'method': 'textDocument/didClose',
+         'params': {'textDocument': {'uri': uri}}},
+        {'jsonrpc': '2.0', 'id': 4, 'method': 'shutdown'},
+        {'jsonrpc': '2.0', 'method': 'exit'},
+    ]
+    writer = BytesIO()
+    server = LanguageServer(
+        BytesIO(b''.join(_frame(request) for request in requests)), writer)
+    assert server.serve() == 0
+
+    responses = _read_frames(writer.getvalue())
+    assert responses[0]['id'] == 1
+    assert responses[0]['result']['capabilities']['inlayHintProvider']
+    assert [response['params']['diagnostics'] for response in responses[1:3]
+            ] == [
+        [{'range': {'start': {'line': 1, 'character': 0},
+                    'end': {'line': 1, 'character': 2}},
+          'severity': 2, 'source': 'retrotype',
+          'message': 'Checksum PG does not match reference PH'}],
+        []]
+    assert responses[3] == {
+        'jsonrpc': '2.0', 'id': 2,
+        'result': [{'position': {'line': 1, 'character': 9}, 'label': 'PH',
+                    'paddingLeft': True}]}
+    assert responses[4]['error']['code'] == -32601
+    assert responses[5]['params'] == {'uri': uri, 'diagnostics': []}
+    assert responses[6] == {'jsonrpc': '2.0', 'id': 4, 'result': None}
+
+
+def test_main_without_shutdown(monkeypatch):
+    """
+    Unit test to check that function main() serves stdin and exits with
+    status 1 when input ends without a shutdown request.
+    """
+    class _Stream:
+        buffer = BytesIO()
+
+    monkeypatch.setattr('sys.stdin', _Stream())
+    monkeypatch.setattr('sys.stdout', _Stream())
+    assert main(['-s', 'ahoy3']) == 1
@@ -0,0 +1,45 @@
+from io import StringIO
+import pytest
+
+from retrotype.output import place_binary
+
+
+def _no_link(source, target):
+    raise PermissionError(1, 'Operation not permitted')
+
+
+@pytest.mark.parametrize("links", [True, False])
+@pytest.mark.parametrize(
+    "existing, confirm, user_entry, expected, messages",
+    [
+        (None, True, '', b'new', ['written successfully']),
+        (b'old', True, 'y\n', b'new',
+         ['already exists', 'written successfully']),
+        (b'old', True, 'n\n', b'old', ['already exists', 'not overwritten']),
+        (b'old', False, '', b'new', ['written successfully']),
+    ],
+)
+def test_place_binary(tmp_path, capsys, monkeypatch, links, existing,
+                      confirm, user_entry, expected, messages):
+    """
+    Unit test to check that function place_binary() puts the temporary file
+    in place, confirming before replacing an existing file, also on file
+    systems without hard links.
+    """
+    if not links:
+        monkeypatch.setattr('retrotype.output.link', _no_link)
+    monkeypatch.setattr('sys.stdin', StringIO(user_entry))
+    temp = tmp_path / 'out.prg.1.tmp'
+    temp.write_bytes(b'new')
+    file = tmp_path / 'out.prg'
+    if existing is not None:
+        file.write_bytes(existing)
+
+    place_binary(str(temp), str(file), confirm)
+
+    out = capsys.readouterr().out
+    assert file.read_bytes() == expected
+    assert out.startswith(f'Writing binary output file "{file}"...\n\n')
+    for message in messages:
+        assert message in out
+    assert ('already exists' in out) == ('already exists' in messages)
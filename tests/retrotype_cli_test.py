@@ -1,6 +1,7 @@
 from io import StringIO
 import pytest
 
+from retrotype import line_checksum, scan_ahoy_line
 from retrotype.retrotype_cli import (parse_args,
                                      print_checksums,
                                      command_line_runner,
@@ -30,6 +31,16 @@ def test_parse_args(argv, arg_valid):
     assert arg_list == arg_valid
 
 
+def test_parse_args_ref():
+    """
+    Unit test to check that function parse_args() accepts a reference file
+    and the 'auto' source format.
+    """
+    args = parse_args(['-s', 'auto', '--ref', 'infile.ref', 'infile.ahoy'])
+    assert [args.source[0], args.ref[0]] == ['auto', 'infile.ref']
+    assert parse_args(['infile.ahoy']).ref is None
+
+
 @pytest.mark.parametrize(
     "ahoy_checksums, term_width, term_capture",
     [
@@ -159,3 +170,727 @@ def test_command_line_runner_interactive(tmp_path, capsys, monkeypatch,
     command_line_runner(argv, 40)
     captured = capsys.readouterr()
     assert captured.out == term_capture
+
+
+def test_command_line_runner_loose_brace(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() reports the
+    line number of a loose brace and exits without writing output.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"{CD}HELLO"\n20 PRINT"{CD HELLO"\n30 GOTO10')
+
+    with pytest.raises(SystemExit):
+        command_line_runner(['-s', 'ahoy2', str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        "Loose brace/bracket error in line: 20 (source line 2, column 10)\n"
+        "Special characters should be enclosed in braces/brackets.\n"
+        "Please check for unmatched single brace/bracket in above line.\n")
+    assert not (tmp_path / "example.prg").exists()
+    assert [f.name for f in tmp_path.iterdir()] == ["example.ahoy"]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ('10 PRINT"HELLO"\n20 PRINT"IT\u2019S"\n',
+         'Character "\u2019" has no Commodore equivalent in line: 20 (source '
+         'line 2, column 12) - type it as printed in the magazine.\n'),
+        ('10 PRINT"HELLO"\n20 X=\u03c0\n',
+         'Character "\u03c0" has no Commodore equivalent in line: 20 (source '
+         'line 2, column 6) - type it as printed in the magazine.\n'),
+    ],
+)
+@pytest.mark.parametrize("jobs", ['1', '2'])
+def test_command_line_runner_bad_char(tmp_path, capsys, text, message, jobs):
+    """
+    End to end test to check that function command_line_runner() reports the
+    line and column of a character with no Commodore equivalent and exits
+    with status 1 without writing output, also in batch mode.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text(text, encoding='utf-8')
+
+    with pytest.raises(SystemExit) as exit:
+        command_line_runner(['--no-cache', '--jobs', jobs, str(p)], 40)
+
+    assert exit.value.code == 1
+    assert capsys.readouterr().out == message
+    assert [f.name for f in tmp_path.iterdir()] == ["example.ahoy"]
+
+    with pytest.raises(SystemExit) as exit:
+        command_line_runner(['--no-cache', '--jobs', jobs, '--batch',
+                             str(tmp_path)])
+    assert exit.value.code == 1
+    assert f'    {p}  error     {message}' in capsys.readouterr().out
+
+
+def test_command_line_runner_large(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() streams a
+    program larger than memory to its outputs, warning that link addresses
+    wrap around.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text(''.join(f'{line_num} PRINT"{"{CD}" * 60}"\n'
+                         for line_num in range(1, 2001)))
+
+    command_line_runner(['-s', 'ahoy2', str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out.startswith(
+        "Warning: program extends past the end of memory - line link "
+        "addresses wrap around.\n\n"
+        f'Writing binary output file "{tmp_path}/example.prg"...\n\n')
+    assert (tmp_path / "example.prg").stat().st_size == 2 + 2000 * 68 + 2
+    chk = (tmp_path / "example.chk").read_text().splitlines()
+    assert len(chk) == 2002 and chk[-1] == 'Lines: 2000'
+    assert sorted(f.name for f in tmp_path.iterdir()) == [
+        "example.ahoy", "example.chk", "example.prg"]
+
+
+@pytest.mark.parametrize(
+    "ref_contents, term",
+    [
+        ('10 IA\n',
+         'Detected source format: ahoy1 (1 of 1 reference lines match)\n\n'
+         'Writing binary output file "{d}/example.prg"...\n\nFile '
+         '"{d}/example.prg" written successfully.\n\n'
+         'All 1 listed lines match the reference file.\n\n'
+         'Line Checksums:\n\n    10 IA       20 NI   \n\nLines: 2\n\n'),
+
+        ('10 EO\n20 PH\n\nLines: 2\n',
+         'Detected source format: ahoy2 (2 of 2 reference lines match)\n\n'
+         'Writing binary output file "{d}/example.prg"...\n\nFile '
+         '"{d}/example.prg" written successfully.\n\n'
+         'All 2 lines match the reference file.\n\n'),
+
+        ('10 GC\n20 PP\n',
+         'Detected source format: ahoy3 (2 of 2 reference lines match)\n\n'
+         'Writing binary output file "{d}/example.prg"...\n\nFile '
+         '"{d}/example.prg" written successfully.\n\n'
+         'All 2 lines match the reference file.\n\n'),
+    ],
+)
+def test_command_line_runner_auto(tmp_path, capsys, ref_contents, term):
+    """
+    End to end test to check that function command_line_runner() detects the
+    Ahoy checksum format from a reference file.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10')
+    r = tmp_path / "example.ref"
+    r.write_text(ref_contents)
+
+    command_line_runner(['-s', 'auto', '-r', str(r), str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == term.format(d=tmp_path)
+
+
+def test_command_line_runner_auto_sample_mismatch(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() reports a
+    line that does not match a sample reference file for format detection,
+    without reporting the lines it does not list as extra.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n30 END\n')
+    r = tmp_path / "example.ref"
+    r.write_text('10 GC\n20 XX\n')
+
+    with pytest.raises(SystemExit) as error:
+        command_line_runner(['-s', 'auto', '-r', str(r), str(p)], 40)
+
+    assert error.value.code == 1
+    captured = capsys.readouterr()
+    assert captured.out.endswith(
+        'Reference Check:\n\n'
+        'Mismatched lines (line, checksum, reference):\n'
+        '    20 PP XX\n\n'
+        'Lines: 3 (reference: 2)\n\n'
+        'Line Checksums:\n\n    10 GC       20 PP       30 JO   \n\n'
+        'Lines: 3\n\n')
+
+
+@pytest.mark.parametrize(
+    "ref_contents, term",
+    [
+        (None,
+         "Source format 'auto' requires a reference file (--ref).\n"),
+        ('10 AA\n',
+         "Unable to detect source format - no line checksums match the "
+         "reference file.\n"),
+        ('10 A\n',
+         "Reference file read failed - Reference file line 1 should be a "
+         "line number and checksum: 10 A\n"),
+    ],
+)
+def test_command_line_runner_auto_errors(tmp_path, capsys, ref_contents,
+                                         term):
+    """
+    End to end test to check that function command_line_runner() exits with
+    an error when the format cannot be detected from a reference file.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10')
+    argv = ['-s', 'auto', str(p)]
+    if ref_contents is not None:
+        r = tmp_path / "example.ref"
+        r.write_text(ref_contents)
+        argv += ['-r', str(r)]
+
+    with pytest.raises(SystemExit):
+        command_line_runner(argv, 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == term
+
+
+def test_command_line_runner_suggest(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() suggests
+    corrections for lines that do not match the reference file.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"{CU}HELLO"\n20 GOTO1O\n30 END')
+    r = tmp_path / "example.ref"
+    r.write_text('10 GF\n20 PH\n30 IC\n')
+
+    with pytest.raises(SystemExit):
+        command_line_runner(['-r', str(r), '--suggest', str(p)], 40)
+
+    captured = capsys.readouterr()
+    report = captured.out[captured.out.index('Reference Check'):]
+    assert report.startswith(
+        'Reference Check:\n\n'
+        'Mismatched lines (line, checksum, reference):\n'
+        '    10 OK GF\n'
+        '        replace "{CU}" with "{CD}":  10 PRINT"{CD}HELLO"\n')
+    assert ('    20 AI PH\n'
+            '        replace "O" with "0":  20 GOTO10\n') in report
+    assert '    30 ' not in report
+    assert report.endswith('\nLines: 3 (reference: 3)\n\n')
+
+
+def test_command_line_runner_suggest_no_ref(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() requires a
+    reference file for suggestions.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"')
+
+    with pytest.raises(SystemExit):
+        command_line_runner(['--suggest', str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == \
+        "Option --suggest requires a reference file (--ref).\n"
+
+
+@pytest.mark.parametrize(
+    "ref_contents, term",
+    [
+        ('10 EO\n20 PH\n',
+         'All 2 lines match the reference file.\n\n'),
+        ('10 EO\n20 PP\n',
+         'Reference Check:\n\n'
+         'Mismatched lines (line, checksum, reference):\n'
+         '    20 PH PP\n\n'
+         'Lines: 2 (reference: 2)\n\n'),
+        ('10 EO\n15 AB\n20 PH\n25 CD\n',
+         'Reference Check:\n\n'
+         'Missing lines: 15, 25\n\n'
+         'Lines: 2 (reference: 4)\n\n'),
+        ('20 PH\n',
+         'Reference Check:\n\n'
+         'Extra lines: 10\n\n'
+         'Lines: 2 (reference: 1)\n\n'),
+        ('10 EA\n30 PH\n',
+         'Reference Check:\n\n'
+         'Mismatched lines (line, checksum, reference):\n'
+         '    10 EO EA\n\n'
+         'Missing lines: 30\n\n'
+         'Extra lines: 20\n\n'
+         'Lines: 2 (reference: 2)\n\n'),
+    ],
+)
+def test_command_line_runner_ref(tmp_path, capsys, ref_contents, term):
+    """
+    End to end test to check that function command_line_runner() reports
+    only mismatched, missing, and extra lines against a reference file and
+    exits with an error status when any are found.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10')
+    r = tmp_path / "example.ref"
+    r.write_text(ref_contents)
+
+    if term.startswith('All'):
+        command_line_runner(['-r', str(r), str(p)], 40)
+    else:
+        with pytest.raises(SystemExit) as exit_info:
+            command_line_runner(['-r', str(r), str(p)], 40)
+        assert exit_info.value.code == 1
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        f'Writing binary output file "{tmp_path}/example.prg"...\n\n'
+        f'File "{tmp_path}/example.prg" written successfully.\n\n' + term)
+    assert (tmp_path / "example.chk").read_text() == \
+        '10 EO\n20 PH\n\nLines: 2\n'
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'auto'])
+def test_command_line_runner_jobs(tmp_path, capsys, source):
+    """
+    End to end test to check that function command_line_runner() writes the
+    same outputs when tokenizing chunks of lines in worker processes.
+    """
+    text = ''.join(f'{line_num} PRINT"{"{CD}" * (line_num % 7)}X":GOTO10\n'
+                   for line_num in range(1, 2600))
+    outputs = []
+    for jobs in ('1', '3'):
+        d = tmp_path / jobs
+        d.mkdir()
+        (d / "example.ahoy").write_text(text)
+        (d / "example.ref").write_text(''.join(
+            f'{line_num} {line_checksum("ahoy1", *scan_ahoy_line(line))}\n'
+            for (line_num, line) in enumerate(text.lower().splitlines()[:3],
+                                              1)))
+        argv = ['-s', source, '--jobs', jobs, str(d / "example.ahoy")]
+        if source == 'auto':
+            argv[2:2] = ['-r', str(d / "example.ref")]
+        command_line_runner(argv, 40)
+        outputs.append(((d / "example.prg").read_bytes(),
+                        (d / "example.chk").read_text(),
+                        capsys.readouterr().out.replace(str(d), '')))
+
+    assert outputs[0] == outputs[1]
+
+
+def test_command_line_runner_jobs_loose_brace(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() reports a
+    loose brace in a later chunk of lines and writes no output.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text(''.join(f'{line_num} PRINT"{{CD}}"\n'
+                         for line_num in range(1, 2500))
+                 + '2500 PRINT"{CD"\n2510 END\n')
+
+    with pytest.raises(SystemExit):
+        command_line_runner(['--jobs', '2', str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        "Loose brace/bracket error in line: 2500 (source line 2500, "
+        "column 12)\n"
+        "Special characters should be enclosed in braces/brackets.\n"
+        "Please check for unmatched single brace/bracket in above line.\n")
+    assert [f.name for f in tmp_path.iterdir()] == ["example.ahoy"]
+
+
+@pytest.mark.parametrize(
+    "brace_line, message",
+    [
+        (500,
+         "Loose brace/bracket error in line: 500 (source line 500, "
+         "column 11)\n"
+         "Special characters should be enclosed in braces/brackets.\n"
+         "Please check for unmatched single brace/bracket in above line.\n"),
+        (2700,
+         "Entry error after line 2600 (source line 2601, column 1) - lines "
+         "should be in sequential order.  Exiting.\n"),
+    ],
+)
+def test_command_line_runner_jobs_errors(tmp_path, capsys, brace_line,
+                                         message):
+    """
+    End to end test to check that function command_line_runner() reports
+    the first error in the source with --jobs as it does converting the
+    lines in order, though it reads a line number error in a later chunk
+    of lines ahead of a loose brace in an earlier one.
+    """
+    lines = [f'{line_num} PRINT"{{CD}}"\n' for line_num in range(1, 5000)]
+    lines[brace_line - 1] = f'{brace_line} PRINT"{{CD"\n'
+    lines[2600] = '2550 END\n'
+    p = tmp_path / "example.ahoy"
+    p.write_text(''.join(lines))
+
+    for jobs in ('1', '4'):
+        with pytest.raises(SystemExit):
+            command_line_runner(['--jobs', jobs, str(p)], 40)
+        assert capsys.readouterr().out == message
+        assert [f.name for f in tmp_path.iterdir()] == ["example.ahoy"]
+
+
+def _batch_dir(tmp_path):
+    d = tmp_path / "batch"
+    d.mkdir()
+    (d / "a.ahoy").write_text('10 PRINT"HELLO"\n20 GOTO10')
+    (d / "b.ahoy").write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+    (d / "b.ref").write_text('10 EO\n20 PP\n')
+    (d / "c.ahoy").write_text('10 PRINT"HELLO"\n20 PRINT"{CD"\n')
+    (d / "d.txt").write_text('10 PRINT"HELLO"\n')
+    return d
+
+
+@pytest.mark.parametrize("jobs", ['1', '2', '3'])
+def test_command_line_runner_batch(tmp_path, capsys, jobs):
+    """
+    End to end test to check that function command_line_runner() converts
+    each file of a batch directory and summarizes the results the same way
+    whatever the number of worker processes.
+    """
+    d = _batch_dir(tmp_path)
+
+    with pytest.raises(SystemExit):
+        command_line_runner(['--batch', str(d), '--jobs', jobs])
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        'Batch Summary:\n\n'
+        f'    {d}/a.ahoy  ok        2 lines (ahoy2)\n'
+        f'    {d}/b.ahoy  mismatch  2 lines, 1 mismatched (ahoy2)\n'
+        f'    {d}/c.ahoy  error     Loose brace/bracket error in line: 20 '
+        '(source line 2, column 10)\n'
+        '\nFiles: 3 (ok: 1, mismatched: 1, errors: 1)\n\n')
+    assert (d / "a.prg").read_bytes() == (
+        b'\x01\x08\x0e\x08\n\x00\x99"HELLO"\x00\x16\x08\x14\x00\x8910\x00'
+        b'\x00\x00')
+    assert (d / "b.chk").read_text() == '10 EO\n20 PH\n\nLines: 2\n'
+    assert sorted(f.name for f in d.iterdir()) == [
+        "a.ahoy", "a.chk", "a.prg", "b.ahoy", "b.chk", "b.prg", "b.ref",
+        "c.ahoy", "d.txt"]
+
+
+def test_command_line_runner_batch_glob(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() converts
+    the files matching a batch glob pattern.
+    """
+    d = _batch_dir(tmp_path)
+
+    command_line_runner(['--batch', str(d / '*.txt'), '-s', 'ahoy1'])
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        'Batch Summary:\n\n'
+        f'    {d}/d.txt  ok        1 lines (ahoy1)\n'
+        '\nFiles: 1 (ok: 1, mismatched: 0, errors: 0)\n\n')
+    assert (d / "d.prg").exists()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        [],
+        ['--batch', 'dir', 'infile.ahoy'],
+        ['--batch', 'dir', '--ref', 'infile.ref'],
+        ['--batch', 'dir', '--jobs', '0'],
+        ['--serve', 'sock', 'infile.ahoy'],
+        ['--serve', 'sock', '--batch', 'dir'],
+        ['--serve', 'sock', '--ref', 'infile.ref'],
+    ],
+)
+def test_parse_args_batch_errors(capsys, argv):
+    """
+    Unit test to check that function parse_args() rejects conflicting batch
+    and server mode options.
+    """
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+    assert 'error:' in capsys.readouterr().err
+
+
+def test_command_line_runner_line_cache(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() reports line
+    cache use, with a cache shared by the files each batch worker process
+    converts.
+    """
+    d = tmp_path / "batch"
+    d.mkdir()
+    for name in ('a', 'b'):
+        (d / f'{name}.ahoy').write_text(
+            '10 DATA 1,2,3\n20 DATA 1,2,3\n30 PRINT"{CD}"\n')
+
+    command_line_runner(['--no-cache', '--line-cache', '16',
+                         str(d / 'a.ahoy')], 40)
+    assert capsys.readouterr().out.startswith(
+        'Line cache: 1 hits, 2 misses (33% hit rate)\n\n')
+
+    command_line_runner(['--no-cache', '--line-cache', '16', '--jobs', '1',
+                         '--batch', str(d)])
+    assert capsys.readouterr().out.endswith(
+        '\nFiles: 2 (ok: 2, mismatched: 0, errors: 0)\n\n'
+        'Line cache: 4 hits, 2 misses (66% hit rate)\n\n')
+
+    command_line_runner(['--no-cache', '--line-cache', '16', '--jobs', '2',
+                         '--batch', str(d)])
+    # which files each worker converts, and so its hits, vary from run to run
+    (summary, stats) = capsys.readouterr().out.rsplit('Line cache: ', 1)
+    assert summary.endswith('\nFiles: 2 (ok: 2, mismatched: 0, errors: 0)\n\n')
+    assert ' in 2 worker process caches (' in stats
+
+
+def test_command_line_runner_typed_entry(tmp_path, capsys, monkeypatch):
+    """
+    End to end test to check that function command_line_runner() gives the
+    checksum of each line typed in --interactive mode, and saves the program
+    on demand.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO11\n')
+    r = tmp_path / "example.ref"
+    r.write_text('10 EO\n20 PH\n30 JD\n')
+    user_entry = ('20 GOTO10\n30 REM"{CD\n30 REM\n40 END\n40\nlist 20-\n'
+                  'check\nquit\nsave\nquit\n')
+
+    monkeypatch.setattr('sys.stdin', StringIO(user_entry))
+    command_line_runner(['--interactive', '-r', str(r), str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        f'Loaded 2 lines from "{p}".\n\n'
+        f'Type in program lines for "{p}" (ahoy2).  Commands: LIST, CHECK, '
+        'SAVE, QUIT.\n\n'
+        '    20 PH - matches reference\n'
+        '    Error: Loose brace/bracket at column 8 - special characters '
+        'should be enclosed in braces/brackets\n'
+        '    30 JD - matches reference\n'
+        '    40 IC - not in reference\n'
+        '    40 deleted\n'
+        '  PH  20 GOTO10\n'
+        '  JD  30 REM\n'
+        '\nLines: 3\n\n'
+        'All 3 lines match the reference file.\n\n'
+        'Unsaved changes - SAVE them, or QUIT again to discard them.\n\n'
+        f'Saved 3 lines to "{p}", "{tmp_path}/example.prg" and '
+        f'"{tmp_path}/example.chk".\n\n')
+    assert p.read_text() == '10 PRINT"HELLO"\n20 GOTO10\n30 REM\n'
+    assert (tmp_path / "example.chk").read_text() == (
+        '10 EO\n20 PH\n30 JD\n\nLines: 3\n')
+    prg = (tmp_path / "example.prg").read_bytes()
+    assert prg[:4] == b'\x01\x08\x0e\x08' and prg[-2:] == b'\x00\x00'
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ['--interactive', '--watch', 'infile.ahoy'],
+        ['--interactive', '--batch', 'dir'],
+        ['--interactive', '-s', 'auto', '-r', 'infile.ref', 'infile.ahoy'],
+    ],
+)
+def test_parse_args_interactive_errors(capsys, argv):
+    """
+    Unit test to check that function parse_args() rejects options that
+    cannot be used with --interactive.
+    """
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+    assert 'error:' in capsys.readouterr().err
+
+
+def test_command_line_runner_dotted_path(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() names the
+    output files after the whole input file basename when the path has dots.
+    """
+    d = tmp_path / "v1.2"
+    d.mkdir()
+    p = d / "example.v2.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+
+    command_line_runner([str(p)], 40)
+    capsys.readouterr()
+    assert sorted(f.name for f in d.iterdir()) == [
+        'example.v2.ahoy', 'example.v2.chk', 'example.v2.prg']
+
+
+_PIPE_PRG = (b'\x01\x08\x0e\x08\x0a\x00\x99"HELLO"\x00\x16\x08\x14\x00'
+             b'\x8910\x00\x00\x00')
+
+
+@pytest.mark.parametrize("cache", [['--no-cache'], []])
+def test_command_line_runner_pipe(tmp_path, capsysbinary, monkeypatch,
+                                  cache):
+    """
+    End to end test to check that function command_line_runner() reads the
+    source from standard input and writes the program to standard output,
+    with messages on standard error.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('sys.stdin', StringIO('10 PRINT"HELLO"\n20 GOTO10\n'))
+    command_line_runner(cache + ['-', '--prg-out', '-'], 40)
+
+    captured = capsysbinary.readouterr()
+    assert captured.out == _PIPE_PRG
+    assert captured.err == (b'Line Checksums:\n\n    10 EO       20 PH   \n\n'
+                            b'Lines: 2\n\n')
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_command_line_runner_pipe_spooled(capsysbinary, monkeypatch):
+    """
+    End to end test to check that function command_line_runner() writes a
+    program spooled to a temporary file to standard output unchanged.
+    """
+    monkeypatch.setattr('retrotype.retrotype_cli.DATA_SPOOL_BYTES', 8)
+    monkeypatch.setattr('retrotype.retrotype_cli.DATA_BLOCK_SIZE', 5)
+    monkeypatch.setattr('sys.stdin', StringIO('10 PRINT"HELLO"\n20 GOTO10\n'))
+    command_line_runner(['-', '--prg-out', '-'], 40)
+    assert capsysbinary.readouterr().out == _PIPE_PRG
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ['-', '--prg-out', '-'],
+        ['-', '--prg-out', 'out.prg', '--chk-out', '-'],
+    ],
+)
+def test_command_line_runner_pipe_error(tmp_path, capsys, monkeypatch, argv):
+    """
+    End to end test to check that function command_line_runner() writes
+    nothing to standard output when a later line fails to convert.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr('sys.stdin', StringIO(
+        '10 PRINT"HELLO"\n20 GOTO10\n30 PRINT"{RED"\n'))
+    with pytest.raises(SystemExit):
+        command_line_runner(argv, 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'Loose brace' in captured.err
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_command_line_runner_chk_out(tmp_path, capsys, monkeypatch):
+    """
+    End to end test to check that function command_line_runner() writes the
+    checksums to standard output and replaces an existing program file
+    without asking when the source is standard input.
+    """
+    o = tmp_path / "out.prg"
+    o.write_text('old output')
+    monkeypatch.setattr('sys.stdin', StringIO('10 PRINT"HELLO"\n20 GOTO10\n'))
+    command_line_runner(['-', '--prg-out', str(o), '--chk-out', '-'], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == '10 EO\n20 PH\n\nLines: 2\n'
+    assert captured.err == (
+        f'Writing binary output file "{o}"...\n\n'
+        f'File "{o}" written successfully.\n\n'
+        'Line Checksums:\n\n    10 EO       20 PH   \n\nLines: 2\n\n')
+    assert o.read_bytes() == _PIPE_PRG
+    assert sorted(f.name for f in tmp_path.iterdir()) == ['out.prg']
+
+
+def test_command_line_runner_prg_out(tmp_path, capsys):
+    """
+    End to end test to check that function command_line_runner() writes the
+    checksum file next to the program file named by --prg-out.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+    d = tmp_path / "build"
+    d.mkdir()
+
+    command_line_runner(['--prg-out', str(d / 'game.prg'), str(p)], 40)
+    capsys.readouterr()
+    assert (d / 'game.prg').read_bytes() == _PIPE_PRG
+    assert (d / 'game.chk').read_text() == '10 EO\n20 PH\n\nLines: 2\n'
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ['-'],
+        ['-', '--prg-out', '-', '--chk-out', '-'],
+        ['--batch', 'dir', '--prg-out', 'out.prg'],
+        ['--watch', '-', '--prg-out', 'out.prg'],
+    ],
+)
+def test_parse_args_pipe_errors(capsys, argv):
+    """
+    Unit test to check that function parse_args() rejects standard input and
+    output options that cannot be used together.
+    """
+    with pytest.raises(SystemExit):
+        parse_args(argv)
+    assert 'error:' in capsys.readouterr().err
+
+
+def test_command_line_runner_typed_entry_rejected(tmp_path, capsys,
+                                                  monkeypatch):
+    """
+    End to end test to check that function command_line_runner() does not
+    save over the input file in --interactive mode while lines of it that
+    could not be loaded remain, so they are never dropped from the source.
+    """
+    p = tmp_path / "example.ahoy"
+    source = '10 PRINT"{CU}HELLO"\n20 PRINT"{CD HELLO"\n30 GOTO10\n'
+    p.write_text(source)
+    user_entry = 'save\nquit\n'
+
+    monkeypatch.setattr('sys.stdin', StringIO(user_entry))
+    command_line_runner(['--interactive', str(p)], 40)
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        '    20 PRINT"{CD HELLO"\n'
+        '    Error: Loose brace/bracket at column 10 - special characters '
+        'should be enclosed in braces/brackets\n'
+        f'Loaded 2 lines from "{p}".\n\n'
+        f'Type in program lines for "{p}" (ahoy2).  Commands: LIST, CHECK, '
+        'SAVE, QUIT.\n\n'
+        f'Not saved - these lines of "{p}" could not be loaded and would be '
+        'lost:\n\n'
+        '    20 PRINT"{CD HELLO"\n\n'
+        'Re-enter or delete them (lines without a line number must be fixed '
+        'in the file)\nbefore saving.\n\n')
+    assert p.read_text() == source
+    assert not (tmp_path / "example.prg").exists()
+
+    # once the line is re-entered, or deleted, the program can be saved
+    for (entry, count, saved) in (
+            ('20 PRINT"{CD}HELLO"\n', 3,
+             '10 PRINT"{CU}HELLO"\n20 PRINT"{CD}HELLO"\n30 GOTO10\n'),
+            ('20\n', 2, '10 PRINT"{CU}HELLO"\n30 GOTO10\n')):
+        p.write_text(source)
+        monkeypatch.setattr('sys.stdin', StringIO(f'{entry}save\nquit\n'))
+        command_line_runner(['--interactive', str(p)], 40)
+        assert f'Saved {count} lines to "{p}"' in capsys.readouterr().out
+        assert p.read_text() == saved
+
+
+def test_command_line_runner_typed_entry_unnumbered(tmp_path, capsys,
+                                                    monkeypatch):
+    """
+    End to end test to check that function command_line_runner() lists every
+    line of the input file without a line number in --interactive mode,
+    refusing to save until they are fixed in the file.
+    """
+    p = tmp_path / "example.ahoy"
+    source = 'PRINT"A"\n10 PRINT"{CD"\nPRINT"B"\n20 GOTO10\n'
+    p.write_text(source)
+    monkeypatch.setattr('sys.stdin', StringIO('10 REM\nsave\nquit\nquit\n'))
+    command_line_runner(['--interactive', str(p)], 40)
+
+    out = capsys.readouterr().out
+    assert out.endswith(
+        f'Not saved - these lines of "{p}" could not be loaded and would be '
+        'lost:\n\n'
+        '    PRINT"A"\n'
+        '    PRINT"B"\n\n'
+        'Re-enter or delete them (lines without a line number must be fixed '
+        'in the file)\nbefore saving.\n\n'
+        'Unsaved changes - SAVE them, or QUIT again to discard them.\n\n')
+    assert p.read_text() == source
@@ -1,18 +1,51 @@
-from io import StringIO
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO, StringIO
+import random
+import re
 import pytest
 
+from retrotype import char_maps
 from retrotype.retrotype import (read_file,
+                                 SourceLine,
+                                 parse_source_line,
+                                 read_source_lines,
+                                 iter_source_lines,
+                                 read_ref_file,
+                                 compare_checksums,
                                  check_line_number_seq,
+                                 iter_checked_lines,
                                  ahoy_lines_list,
                                  split_line_num,
                                  _scan,
                                  scan_manager,
+                                 scan_line,
+                                 scan_ahoy_line,
+                                 scan_ahoy_text,
+                                 loose_brace_column,
+                                 PrgBuilder,
+                                 tokenize_chunk,
+                                 convert_line,
+                                 LineCache,
                                  write_binary,
                                  ahoy1_checksum,
                                  ahoy2_checksum,
                                  ahoy3_checksum,
+                                 line_checksum,
+                                 fused_checksums,
+                                 detect_source,
+                                 batch_checksums,
+                                 checksum_state,
+                                 checksum_prefix_states,
                                  confirm_overwrite,
                                  write_checksums,
+                                 stream_checksums,
+                                 iter_numbered_lines,
+                                 parse_ref_lines,
+                                 ConversionError,
+                                 LineNumberError,
+                                 BadCharError,
+                                 LooseBraceError,
+                                 convert,
                                  )
 
 
@@ -33,6 +66,70 @@ def test_read_file(infile_data):
     assert infile_data == ['10 print"hello!"', '20 goto10']
 
 
+@pytest.mark.parametrize(
+    "contents, ref_codes",
+    [
+        ('10 EO\n20 PH\n\nLines: 2\n', {10: 'EO', 20: 'PH'}),
+        ('  100 ic\n\n64000   KK  \n', {100: 'IC', 64000: 'KK'}),
+        ('', {}),
+    ],
+)
+def test_read_ref_file(tmpdir, contents, ref_codes):
+    """
+    Unit test to check that function read_ref_file() reads line numbers and
+    checksums from a reference file into a dict.
+    """
+    file = tmpdir.join('program.ref')
+    file.write(contents)
+    assert read_ref_file(file) == ref_codes
+
+
+@pytest.mark.parametrize("contents", ['10 EO\n20\n', '10 EO\nX PH\n',
+                                      '10 E0\n'])
+def test_read_ref_file_bad(tmpdir, contents):
+    """
+    Unit test to check that function read_ref_file() rejects lines that are
+    not a line number and a checksum.
+    """
+    file = tmpdir.join('program.ref')
+    file.write(contents)
+    with pytest.raises(ValueError):
+        read_ref_file(file)
+
+
+@pytest.mark.parametrize(
+    "ref_codes, comparison",
+    [
+        ({10: 'EO', 20: 'PH'}, ([], [], [], 2, 2, True)),
+        ({10: 'EO', 20: 'PP'}, ([(20, 'PH', 'PP')], [], [], 2, 2, False)),
+        ({5: 'AA', 10: 'EO', 30: 'BB', 20: 'PH'},
+         ([], [5, 30], [], 2, 4, False)),
+        ({20: 'PH'}, ([], [], [10], 2, 1, False)),
+    ],
+)
+def test_compare_checksums(ref_codes, comparison):
+    """
+    Unit test to check that function compare_checksums() finds mismatched,
+    missing, and extra lines against a reference.
+    """
+    result = compare_checksums(iter([(10, 'EO'), (20, 'PH')]), ref_codes)
+    assert tuple(result[:5]) + (result.ok,) == comparison
+
+
+def test_compare_checksums_sample():
+    """
+    Unit test to check that function compare_checksums() does not count the
+    lines a sample reference does not list as extra.
+    """
+    result = compare_checksums(iter([(10, 'EO'), (20, 'PH')]), {20: 'PH'},
+                               sample=True)
+    assert result == ([], [], [10], 2, 1, True)
+    assert result.ok
+    result = compare_checksums(iter([(10, 'EO'), (20, 'PH')]), {20: 'PP'},
+                               sample=True)
+    assert not result.ok
+
+
 @pytest.mark.parametrize(
     "lines_list, term_capture",
     [
@@ -106,6 +203,90 @@ def test_check_line_number_seq_bad(capsys, lines_list, term_capture):
     assert capture.out == term_capture
 
 
+@pytest.mark.parametrize(
+    "line, record",
+    [
+        ('10 print"hi"', SourceLine(10, 'print"hi"', 3, 1, 4)),
+        ('  20print  ', SourceLine(20, 'print', 3, 3, 5)),
+        ('30', SourceLine(30, '', 3, 1, 3)),
+        ('  goto 10', SourceLine(None, 'goto 10', 3, 3, 3)),
+    ],
+)
+def test_parse_source_line(line, record):
+    """
+    Unit test to check that function parse_source_line() splits the line
+    number from the text once and keeps the source position of each.
+    """
+    assert parse_source_line(line, 3) == record
+    if record.line_num is not None:
+        assert (record.line_num, record.text) == split_line_num(line.rstrip())
+
+
+def test_read_source_lines(tmp_path):
+    """
+    Unit test to check that function read_source_lines() skips blank lines
+    while keeping the source file row of each line.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HI"\n\n   \n 20 GOTO10\n')
+    assert read_source_lines(p) == [SourceLine(10, 'print"hi"', 1, 1, 4),
+                                    SourceLine(20, 'goto10', 4, 2, 5)]
+
+
+@pytest.mark.parametrize(
+    "lines, term_capture",
+    [
+        (['10 ok', '', '  5 off'],
+         "Entry error after line 10 (source line 3, column 3) - lines should "
+         "be in sequential order.  Exiting.\n"),
+        (['10 ok', 'off'],
+         "Entry error after line 10 (source line 2, column 1) - each line "
+         "should start with a line number.  Exiting.\n"),
+    ],
+)
+def test_check_line_number_seq_records(capsys, lines, term_capture):
+    """
+    Unit test to check that function check_line_number_seq() cites the
+    source position of SourceLine records in its error messages.
+    """
+    records = [parse_source_line(line, row)
+               for (row, line) in enumerate(lines, 1) if line]
+    with pytest.raises(SystemExit):
+        check_line_number_seq(records)
+    assert capsys.readouterr().out == term_capture
+
+
+def test_check_line_number_seq_returns_records():
+    """
+    Unit test to check that function check_line_number_seq() returns a
+    SourceLine record for each line, parsing plain strings once.
+    """
+    records = [parse_source_line('10 ok', 1), parse_source_line('20 ok', 2)]
+    assert check_line_number_seq(records) == records
+    assert check_line_number_seq(['10 a', '20b']) == [
+        SourceLine(10, 'a', 0, 1, 4), SourceLine(20, 'b', 0, 1, 3)]
+
+
+@pytest.mark.parametrize(
+    "line, column",
+    [
+        ('10 print"{CD"', 10),
+        ('10 print"CD}"', 12),
+        ('10 ?"{cd}{cu}}{rd}"', 14),
+        ('10 ?"[cd}{cu]"', None),
+        ('10 ?"{cd}"', None),
+    ],
+)
+def test_loose_brace_column(line, column):
+    """
+    Unit test to check that function loose_brace_column() finds the source
+    column of the brace that stops a line from converting.
+    """
+    record = parse_source_line(line, 1)
+    assert loose_brace_column(record) == column
+    assert (scan_ahoy_text(record.text) is None) == (column is not None)
+
+
 @pytest.mark.parametrize(
     "lines_list, new_lines",
     [
@@ -156,6 +337,105 @@ def test_ahoy_lines_list(lines_list, new_lines):
     assert ahoy_lines_list(lines_list) == new_lines
 
 
+def _regex_ahoy_lines_list(lines_list):
+    """Reference regex-based ahoy_lines_list() used before the brace lexer."""
+    new_lines = []
+    for line in lines_list:
+        line = line.replace('[', '{')
+        line = line.replace(']', '}')
+        str_split = re.split(r"{\d+\s?\".[^{]*?\"}|{.[^{]*?}", line)
+        for sub_str in str_split:
+            if re.search(r"\}|{", sub_str) is not None:
+                return (None, line)
+        code_split = re.findall(r"{\d+\s?\".+?\"}|{.+?}", line)
+        new_codes = []
+        num = 0
+        for item in code_split:
+            if item.upper() in char_maps.AHOY_TO_PETCAT:
+                new_codes.append(char_maps.AHOY_TO_PETCAT[item.upper()])
+            elif re.match(r"{\d+\s?\".+?\"}", item):
+                char_count = int(re.search(r"\d+\b", item).group())
+                char_code = re.search(r"\".+?\"", item).group()[1:-1]
+                if char_code.upper() in char_maps.AHOY_TO_PETCAT:
+                    char_code = char_maps.AHOY_TO_PETCAT[char_code.upper()]
+                new_codes.append(char_code)
+                while char_count > 1:
+                    new_codes.append(char_code)
+                    str_split.insert(num + 1, '')
+                    num += 1
+                    char_count -= 1
+            else:
+                new_codes.append(item)
+            num += 1
+        if new_codes:
+            new_codes.append('')
+            new_line = []
+            for count in range(len(new_codes)):
+                new_line.extend((str_split[count], new_codes[count]))
+        else:
+            new_line = str_split
+        new_lines.append(''.join(new_line))
+    return new_lines
+
+
+def _regex_codes_agree(line):
+    """Check that the reference split and findall regexes see the same codes.
+
+    They disagree only for malformed repeat codes such as {2"}, where the
+    regex version produced scrambled output.
+    """
+    line = line.replace('[', '{').replace(']', '}')
+    split_codes = [m.group() for m in
+                   re.finditer(r"{\d+\s?\".[^{]*?\"}|{.[^{]*?}", line)]
+    return split_codes == re.findall(r"{\d+\s?\".+?\"}|{.+?}", line)
+
+
+def test_ahoy_lines_list_matches_regex_split():
+    """
+    Unit test to check that the single-pass brace lexer in ahoy_lines_list()
+    gives the same lines and loose brace errors as the regex version.
+    """
+    rand = random.Random(1987)
+    atoms = (list('ab1 "*{}[]') + list(char_maps.AHOY_TO_PETCAT)
+             + ['{4"[cd]"}', '[3 "*"]', '{s a}', '[c g]', '{0"x"}',
+                '{12"{CU}"}', '{2 "SPACE"}'])
+    checked = 0
+    for _ in range(20000):
+        line = ''.join(rand.choice(atoms) for _ in range(rand.randint(0, 8)))
+        if _regex_codes_agree(line):
+            assert ahoy_lines_list([line]) == _regex_ahoy_lines_list([line])
+            checked += 1
+    assert checked > 15000
+
+
+@pytest.mark.parametrize(
+    "line, new_line",
+    [
+        ('{2"}{0"x"}{s a}', '{2"}x{s a}'),
+        ('{2""}{4"[cd]"}[c g]', '{2""}{down}{down}{down}{down}{c g}'),
+    ],
+)
+def test_ahoy_lines_list_malformed_repeat(line, new_line):
+    """
+    Unit test to check that a malformed repeat code is kept as written
+    rather than scrambling the special character codes that follow it.
+    """
+    assert ahoy_lines_list([line]) == [new_line]
+
+
+def test_ahoy_lines_list_long_lines():
+    """
+    Unit test to check that ahoy_lines_list() handles lines with thousands
+    of codes, large repeat counts, and a long run after an unclosed brace.
+    """
+    line = '10 print"' + '{CU}[s a]{2 "*"}' * 2000 + '{255 "SPACE"}"'
+    expected = ('10 print"' + '{up}{s a}**' * 2000 + 'SPACE' * 255 + '"')
+    assert ahoy_lines_list([line]) == [expected]
+
+    line = '10 print"{' + '"{CU}x' * 5000
+    assert ahoy_lines_list([line]) == (None, line)
+
+
 @pytest.mark.parametrize(
     "line, split_line",
     [
@@ -192,6 +472,186 @@ def test_write_binary(tmpdir):
 \x00\x18\x08\x14\x00\x8910\x00\x00\x00'
 
 
+@pytest.mark.parametrize(
+    "program",
+    [
+        b'\x01\x08\x10\x08\n\x00\x99("HELLO")\x00\x18\x08\x14\x00\x8910\x00'
+        b'\x00\x00',
+        bytearray(b'\x01\x08\x00\x00'),
+    ],
+)
+def test_write_binary_bytes(tmpdir, program):
+    """
+    Unit test to check that function write_binary() writes bytes-like program
+    images, including a memoryview of one, unchanged.
+    """
+    file = tmpdir.join('output.prg')
+    with memoryview(program) as image:
+        write_binary(file, image)
+    with open(file, 'rb') as f:
+        contents = f.read()
+
+    assert contents == bytes(program)
+
+
+@pytest.mark.parametrize(
+    "load_addr, lines, image",
+    [
+        (0x0801, [], b'\x01\x08\x00\x00'),
+        (0x0801, [(10, bytearray(b'\x99("HELLO")\x00')),
+                  (20, [137, 49, 48, 0])],
+         b'\x01\x08\x10\x08\n\x00\x99("HELLO")\x00\x18\x08\x14\x00\x8910\x00'
+         b'\x00\x00'),
+        (0x1001, [(65535, b'\x80\x00')],
+         b'\x01\x10\x07\x10\xff\xff\x80\x00\x00\x00'),
+    ],
+)
+def test_prg_builder(load_addr, lines, image):
+    """
+    Unit test to check that PrgBuilder links each line to the address of the
+    next and always ends the image with the end of program marker.
+    """
+    prg = PrgBuilder(load_addr)
+    addr = load_addr
+    for (line_num, byte_list) in lines:
+        addr += len(byte_list) + 4
+        assert prg.add_line(line_num, byte_list) == addr
+        assert prg.next_addr == addr
+    with prg.image() as view:
+        assert view.tobytes() == image
+    assert prg.line_count == len(lines)
+
+
+@pytest.mark.parametrize("buffer_size", [1, 40, 65536])
+def test_prg_builder_file(buffer_size):
+    """
+    Unit test to check that PrgBuilder streams the same image to a file
+    whatever the buffer size, wrapping link addresses past the end of memory.
+    """
+    lines = [(line_num, bytes([65 + line_num % 26]) * 250 + b'\x00')
+             for line_num in range(1, 300)]
+    whole = PrgBuilder()
+    with BytesIO() as file:
+        prg = PrgBuilder(0x0801, file, buffer_size)
+        for (line_num, byte_list) in lines:
+            whole.add_line(line_num, byte_list)
+            prg.add_line(line_num, byte_list)
+            assert len(prg.data) < buffer_size + 256
+        prg.finish()
+        assert file.getvalue() == bytes(whole.data)
+    assert prg.next_addr == whole.next_addr > 0xffff
+    assert whole.data[2:4] == (0x0801 + 255).to_bytes(2, 'little')
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3', 'auto'])
+def test_tokenize_chunk_matches_serial(source):
+    """
+    Unit test to check that lines tokenized in chunks by tokenize_chunk() and
+    linked by PrgBuilder.add_chunk() give the same image and checksums as
+    adding each line in turn.
+    """
+    rand = random.Random(1984)
+    atoms = ['print', '"', 'goto', '10', ' ', 'a', '{cd}', '[s a]', 'rem']
+    records = [parse_source_line(
+        f'{line_num} ' + ''.join(rand.choice(atoms) for _ in range(12)), 1)
+        for line_num in range(1, 400)]
+    serial = PrgBuilder(0x1001)
+    serial_codes = []
+    for record in records:
+        byte_list = scan_ahoy_text(record.text)
+        serial.add_line(record.line_num, byte_list)
+        codes = fused_checksums(record.line_num, byte_list)
+        serial_codes.append((record.line_num, codes if source == 'auto'
+                             else codes[source]))
+
+    chunked = PrgBuilder(0x1001)
+    chunked_codes = []
+    for start in range(0, len(records), 64):
+        (blob, sizes, checksums, error) = tokenize_chunk(
+            records[start:start + 64], source)
+        assert error is None
+        chunked.add_chunk(blob, sizes)
+        chunked_codes.extend(checksums)
+
+    assert chunked.data == serial.data
+    assert chunked.next_addr == serial.next_addr
+    assert chunked.line_count == serial.line_count
+    assert chunked_codes == serial_codes
+
+
+def test_tokenize_chunk_loose_brace():
+    """
+    Unit test to check that function tokenize_chunk() stops at a line with a
+    loose brace, returning the lines before it and the line itself.
+    """
+    records = [parse_source_line(line, row) for (row, line) in
+               enumerate(['10 print"{cd}"', '20 print"{cd"', '30 end'], 1)]
+    (blob, sizes, checksums, error) = tokenize_chunk(records, 'ahoy2')
+    assert (blob, sizes, error) == (b'\n\x00\x99"\x11"\x00', [7], records[1])
+    assert checksums == [(10, line_checksum('ahoy2', 10, blob[2:]))]
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3', 'auto'])
+def test_line_cache_matches_convert_line(source):
+    """
+    Unit test to check that LineCache gives the same bytes and checksums as
+    convert_line() for repeated lines, counting hits and misses.
+    """
+    cache = LineCache(8)
+    lines = [(10 * (index + 1), text) for (index, text) in enumerate(
+        ['data 1,2,3', 'print"{cd}"', 'data 1,2,3', 'print"{cd"',
+         'data 1,2,3', 'print"{cd}"'])]
+    for (line_num, text) in lines:
+        (byte_list, checksum) = convert_line(line_num, text, source)
+        assert cache.convert(line_num, text, source) == (
+            None if byte_list is None else bytes(byte_list), checksum)
+    # the ahoy3 checksum includes the line number, so only identical
+    # numbered lines repeat
+    if source in ('ahoy3', 'auto'):
+        assert (cache.hits, cache.misses) == (0, 6)
+    else:
+        assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_line_cache_bounded():
+    """
+    Unit test to check that LineCache keeps only its most recently used
+    lines.
+    """
+    cache = LineCache(2)
+    for text in ['a=1', 'b=2', 'a=1', 'c=3', 'b=2', 'a=1']:
+        cache.convert(10, text, 'ahoy2')
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+def test_stream_checksums():
+    """
+    Unit test to check that function stream_checksums() passes each checksum
+    on as it writes it and ends the file with the line count.
+    """
+    file = StringIO()
+    stream = stream_checksums(file, iter([(10, 'EO'), (20, 'PH')]))
+    assert next(stream) == (10, 'EO')
+    assert file.getvalue() == '10 EO\n'
+    assert list(stream) == [(20, 'PH')]
+    assert file.getvalue() == '10 EO\n20 PH\n\nLines: 2\n'
+
+
+def test_iter_checked_lines(capsys):
+    """
+    Unit test to check that function iter_checked_lines() passes on lines
+    checked so far before it reaches an out of sequence line.
+    """
+    source = StringIO('10 a\n\n20 b\n15 c\n')
+    lines = iter_checked_lines(iter_source_lines(source))
+    assert [next(lines).row, next(lines).row] == [1, 3]
+    with pytest.raises(SystemExit):
+        next(lines)
+    assert capsys.readouterr().out == (
+        "Entry error after line 20 (source line 4, column 1) - lines should "
+        "be in sequential order.  Exiting.\n")
+
+
 @pytest.mark.parametrize(
     "user_entry, return_value",
     [
@@ -236,6 +696,103 @@ def test_scan_manager(ln, bytestr):
     assert scan_manager(ln) == bytestr
 
 
+def _slicing_scan_manager(ln):
+    """Reference scan_manager() that re-slices the line after each token."""
+    in_quotes = False
+    in_remark = False
+    bytestr = []
+    while ln:
+        (byte, ln) = _linear_scan(ln, tokenize=not (in_quotes or in_remark))
+        bytestr.append(byte)
+        if byte == ord('"'):
+            in_quotes = not in_quotes
+        if byte == 143:
+            in_remark = True
+    bytestr.append(0)
+    return bytestr
+
+
+@pytest.mark.parametrize(
+    "ln, bytestr",
+    [
+        ('rem lawn', b'\x8f LAWN\x00'),
+        ('goto110', b'\x89110\x00'),
+        ('print"{rvon}rem"rem', b'\x99"\x12REM"\x8f\x00'),
+        ('', b'\x00'),
+    ],
+)
+def test_scan_line(ln, bytestr):
+    """
+    Unit test to check that function scan_line() returns the tokenized bytes
+    for a line, including the quote/REM state handling, as a bytearray.
+    """
+    result = scan_line(ln)
+    assert isinstance(result, bytearray)
+    assert result == bytestr
+
+
+def test_scan_line_matches_slicing_scan():
+    """
+    Unit test to check that the cursor-based scan_line() produces the same
+    bytes as scanning by re-slicing the line, including long lines of codes.
+    """
+    lines = _scan_vectors()
+    lines.append('print"' + '{rvon}{c g}{s ep}x' * 500 + '":goto10')
+    lines.append('rem "' + 'print{down}' * 500)
+    lines.append('rem ' + '*' * 2000 + ' by m. buhidar, 1987 ' + '*' * 2000)
+    lines.append('print"caf\xe9 \x8frem{c g}{x}"rem"\x8f"')
+    for ln in lines:
+        assert list(scan_line(ln)) == _slicing_scan_manager(ln), ln
+
+
+def _two_stage_scan(line):
+    """Reference ahoy_lines_list(), split_line_num(), scan_line() path."""
+    new_lines = ahoy_lines_list([line])
+    if new_lines[0] is None:
+        return None
+    (line_num, line_txt) = split_line_num(new_lines[0])
+    return (line_num, scan_line(line_txt))
+
+
+@pytest.mark.parametrize(
+    "line, scanned",
+    [
+        ('10 print"hello"', (10, b'\x99"HELLO"\x00')),
+        ('20 print"{CD}[4"[cu]"]{s a}"',
+         (20, b'\x99"\x11\x91\x91\x91\x91\xc1"\x00')),
+        ('30{2" "}{WH}rem{4"*"}', (30, b'\x05\x8f****\x00')),
+        ('40 {2"p"}rint', (40, b'P\x99\x00')),
+        ('50 print"{CD"', None),
+        ('60{2"1"}', (60, b'11\x00')),
+    ],
+)
+def test_scan_ahoy_line(line, scanned):
+    """
+    Unit test to check that function scan_ahoy_line() converts a line of
+    Ahoy source straight to its line number and tokenized bytes.
+    """
+    assert scan_ahoy_line(line) == scanned
+
+
+def test_scan_ahoy_line_matches_two_stage():
+    """
+    Unit test to check that the fused scan_ahoy_line() gives the same line
+    numbers and bytes as converting to petcat text and then tokenizing.
+    """
+    rand = random.Random(1985)
+    atoms = (list('ab1 "*:{}[]') + list(char_maps.AHOY_TO_PETCAT)
+             + ['{4"[cd]"}', '[3 "*"]', '{s a}', '[c g]', '{2"1"}', 'rem',
+                'print', '{2 " "}', '{3"""}', '{c 9}', '{xyz}', 'go', 'to'])
+    for _ in range(20000):
+        line = ''.join(rand.choice(atoms) for _ in range(rand.randint(0, 8)))
+        line = f'{rand.randint(0, 63999)}{rand.choice(["", " "])}{line}'
+        # the two stages join digits from a repeat code straight after the
+        # line number onto it, which the fused scan keeps in the text
+        if re.match(r'\d+\{2"1"\}', line):
+            continue
+        assert scan_ahoy_line(line) == _two_stage_scan(line), line
+
+
 @pytest.mark.parametrize(
     "ln, tokenize, byte, remaining_line",
     [
@@ -258,6 +815,54 @@ def test__scan(ln, tokenize, byte, remaining_line):
     assert _scan(ln, tokenize) == (byte, remaining_line)
 
 
+def _linear_scan(ln, tokenize=True):
+    """Reference table walk used by _scan() before the token trie."""
+    for (token, value) in char_maps.PETCAT_TOKENS:
+        if ln.startswith(token):
+            return (value, ln[len(token):])
+    for (token, value) in char_maps.SHIFT_CMDRE_TOKENS:
+        if ln.startswith(token):
+            return (value, ln[len(token):])
+    if tokenize:
+        for (token, value) in char_maps.TOKENS_V2:
+            if ln.startswith(token):
+                return (value, ln[len(token):])
+    char_val = ord(ln[0])
+    if char_val >= 97 and char_val <= 122:
+        char_val -= 32
+    return (char_val, ln[1:])
+
+
+def _scan_vectors():
+    tokens = [token for table in (char_maps.PETCAT_TOKENS,
+                                  char_maps.SHIFT_CMDRE_TOKENS,
+                                  char_maps.TOKENS_V2)
+              for (token, _) in table]
+    rand = random.Random(1984)
+    pieces = tokens + list('abcdefghijklmnopqrstuvwxyz0123456789 {}"#$(_')
+    vectors = ['rem lawn', 'goto110', 'printtab(10);sc$',
+               'printtab(16)"{lgrn}{down}l', 'data15,103,255,169',
+               ' space test', '{wht}"tab(32)', '{c g} test commodore-g',
+               '{s ep}start mower', 'input#1,a$', 'print#4', 'gosub9',
+               '{up_arrow}{up}{s up_arrow}{c ep}{ep}']
+    vectors.extend(tokens)
+    vectors.extend(token[:-1] for token in tokens if len(token) > 1)
+    for _ in range(500):
+        vectors.append(''.join(rand.choice(pieces)
+                               for _ in range(rand.randint(1, 12))))
+    return vectors
+
+
+def test__scan_matches_linear_lookup():
+    """
+    Unit test to check that the trie-based _scan() gives byte-for-byte the
+    same result as walking the token tables in order.
+    """
+    for ln in _scan_vectors():
+        for tokenize in (True, False):
+            assert _scan(ln, tokenize) == _linear_scan(ln, tokenize), ln
+
+
 @pytest.mark.parametrize(
     "byte_list, checksum",
     [
@@ -349,6 +954,182 @@ def test_ahoy3_checksum(line_num, byte_list, checksum):
     assert ahoy3_checksum(line_num, byte_list) == checksum
 
 
+def _unbounded_ahoy1(byte_list):
+    """Reference ahoy1_checksum() with the unmasked running value."""
+    next_value = 0
+    for char_val in byte_list:
+        if char_val == 32:
+            continue
+        next_value = (char_val + next_value) << 1
+    return chr(((next_value & 0xf0) >> 4) + 65) + chr((next_value & 0x0f) + 65)
+
+
+def _unbounded_ahoy2(byte_list):
+    """Reference ahoy2_checksum() with the unmasked xor value."""
+    xor_value = 0
+    char_position = 1
+    in_quotes = False
+    for char_val in byte_list:
+        carry_flag = 0 if char_val < 34 else 1
+        if char_val == 34:
+            in_quotes = not in_quotes
+        if char_val == 32 and in_quotes is False:
+            continue
+        xor_value = (char_val + xor_value + carry_flag) ^ char_position
+        char_position = char_position + 1
+    return chr(((xor_value & 0xf0) >> 4) + 65) + chr((xor_value & 0x0f) + 65)
+
+
+def _unbounded_ahoy3(line_num, byte_list):
+    """Reference ahoy3_checksum() with the unmasked xor value."""
+    xor_value = 0
+    char_position = 0
+    in_quotes = False
+    for char_val in [line_num % 256] + [int(line_num / 256)] + byte_list:
+        if char_val == 34:
+            in_quotes = not in_quotes
+        if char_val == 32 and in_quotes is False:
+            continue
+        xor_value = (char_val + xor_value) ^ char_position
+        char_position = char_position + 1
+    return chr(((xor_value & 0xf0) >> 4) + 65) + chr((xor_value & 0x0f) + 65)
+
+
+def test_checksums_match_unbounded_versions():
+    """
+    Unit test to check that the fixed-width checksum kernels give the same
+    codes as the unmasked versions for random lines passed as list, bytes,
+    bytearray, or memoryview.
+    """
+    rand = random.Random(1984)
+    for _ in range(1500):
+        byte_list = [rand.choice((32, 34, rand.randint(0, 255)))
+                     for _ in range(rand.randint(0, 300))]
+        line_num = rand.randint(0, 63999)
+        codes = (_unbounded_ahoy1(byte_list), _unbounded_ahoy2(byte_list),
+                 _unbounded_ahoy3(line_num, byte_list))
+        for buf in (byte_list, bytes(byte_list), bytearray(byte_list),
+                    memoryview(bytes(byte_list))):
+            assert (ahoy1_checksum(buf), ahoy2_checksum(buf),
+                    ahoy3_checksum(line_num, buf)) == codes
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3'])
+def test_checksum_state(source):
+    """
+    Unit test to check that feeding a checksum state byte by byte, in runs,
+    or resumed from a memoized prefix after an edit gives the same code as
+    the checksum functions.
+    """
+    functions = {'ahoy1': lambda num, bl: ahoy1_checksum(bl),
+                 'ahoy2': lambda num, bl: ahoy2_checksum(bl),
+                 'ahoy3': ahoy3_checksum}
+    rand = random.Random(1987)
+    for _ in range(200):
+        byte_list = [rand.choice((32, 34, rand.randint(0, 255)))
+                     for _ in range(rand.randint(0, 80))]
+        line_num = rand.randint(0, 63999)
+        start = checksum_state(source, line_num)
+
+        state = start
+        for char_val in byte_list:
+            state = state.feed(char_val)
+        assert state.checksum == functions[source](line_num, byte_list)
+        assert start.feed_many(byte_list) == state
+
+        prefixes = checksum_prefix_states(start, byte_list)
+        assert prefixes[0] == start and prefixes[-1] == state
+        pos = rand.randint(0, len(byte_list))
+        edited = byte_list[:pos] + [rand.randint(0, 255)] + byte_list[pos:]
+        assert (prefixes[pos].feed_many(edited[pos:]).checksum
+                == functions[source](line_num, edited))
+
+
+def test_checksum_state_bad_source():
+    """
+    Unit test to check that checksum_state() rejects unsupported formats.
+    """
+    with pytest.raises(ValueError):
+        checksum_state('compute')
+
+
+def _random_lines(seed, count):
+    rand = random.Random(seed)
+    lines = []
+    for row in range(count):
+        byte_list = [rand.choice((32, 34, rand.randint(1, 255)))
+                     for _ in range(rand.randint(0, 90))] + [0]
+        byte_list = rand.choice((list, bytes, bytearray))(byte_list)
+        lines.append((rand.choice((row, rand.randint(0, 63999))), byte_list))
+    return lines
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3'])
+def test_batch_checksums_pure_python(source):
+    """
+    Unit test to check that function batch_checksums() without NumPy gives
+    the same codes as the scalar checksum functions.
+    """
+    lines = _random_lines(1986, 300)
+    assert batch_checksums(source, lines, use_numpy=False) == \
+        [line_checksum(source, num, byte_list) for (num, byte_list) in lines]
+    assert batch_checksums(source, [], use_numpy=False) == []
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3'])
+def test_batch_checksums_numpy(source):
+    """
+    Unit test to check that the NumPy path of batch_checksums() gives the
+    same codes as the scalar checksum functions.
+    """
+    pytest.importorskip('numpy')
+    lines = _random_lines(1988, 2000)
+    assert batch_checksums(source, lines, use_numpy=True) == \
+        [line_checksum(source, num, byte_list) for (num, byte_list) in lines]
+
+
+def test_fused_checksums():
+    """
+    Unit test to check that function fused_checksums() gives the same codes
+    in one pass as each of the checksum functions.
+    """
+    for (line_num, byte_list) in _random_lines(1989, 500):
+        assert fused_checksums(line_num, byte_list) == \
+            {source: line_checksum(source, line_num, byte_list)
+             for source in ('ahoy1', 'ahoy2', 'ahoy3')}
+
+
+@pytest.mark.parametrize(
+    "ref_codes, detected",
+    [
+        ({10: 'EO', 20: 'PH'}, ('ahoy2', 2)),
+        ({10: 'GC'}, ('ahoy3', 1)),
+        ({10: 'IA', 20: 'PH', 30: 'AA'}, ('ahoy1', 1)),
+        ({10: 'AA', 20: 'AA'}, None),
+        ({}, None),
+    ],
+)
+def test_detect_source(ref_codes, detected):
+    """
+    Unit test to check that function detect_source() picks the format with
+    the most lines matching the reference.
+    """
+    line_codes = [(10, {'ahoy1': 'IA', 'ahoy2': 'EO', 'ahoy3': 'GC'}),
+                  (20, {'ahoy1': 'NI', 'ahoy2': 'PH', 'ahoy3': 'PP'})]
+    assert detect_source(line_codes, ref_codes) == detected
+
+
+def test_line_checksum_bad_source():
+    """
+    Unit test to check that line_checksum() and batch_checksums() reject
+    unsupported formats.
+    """
+    with pytest.raises(ValueError):
+        line_checksum('compute', 10, [0])
+    with pytest.raises(ValueError):
+        batch_checksums('compute', [(10, [0])])
+
+
 @pytest.mark.parametrize(
     "ahoy_checksums, file_contents",
     [
@@ -373,3 +1154,134 @@ def test_write_checksums(tmpdir, ahoy_checksums, file_contents):
         contents = f.read()
 
     assert contents == file_contents
+
+
+def test_iter_numbered_lines():
+    """
+    Unit test to check that function iter_numbered_lines() raises an
+    exception with the line at fault rather than printing and exiting.
+    """
+    records = list(iter_source_lines(['10 a\n', '\n', '10 b\n']))
+    lines = iter_numbered_lines(records)
+    assert next(lines) == records[0]
+    with pytest.raises(LineNumberError) as error:
+        next(lines)
+    assert str(error.value) == ('Entry error after line 10 (source line 3, '
+                                'column 1) - lines should be in sequential '
+                                'order.')
+    assert error.value.record == records[1]
+
+
+def test_iter_numbered_lines_range():
+    """
+    Unit test to check that function iter_numbered_lines() raises an
+    exception for a line number past the highest that BASIC accepts.
+    """
+    records = list(iter_source_lines(['63999 a\n', '64000 b\n']))
+    lines = iter_numbered_lines(records)
+    assert next(lines) == records[0]
+    with pytest.raises(LineNumberError) as error:
+        next(lines)
+    assert str(error.value) == ('Entry error after line 63999 (source line 2, '
+                                'column 1) - line numbers should be at most '
+                                '63999.')
+    assert error.value.record == records[1]
+
+
+def test_parse_ref_lines():
+    """
+    Unit test to check that function parse_ref_lines() parses reference text
+    as read_ref_file() does.
+    """
+    assert parse_ref_lines(['10 eo\n', '\n', '20 PH\n', 'Lines: 2\n']) == {
+        10: 'EO', 20: 'PH'}
+    with pytest.raises(ValueError):
+        parse_ref_lines(['10 EO PH'])
+
+
+PROGRAM_TEXT = '10 PRINT"{CD}HELLO"\r\n\r\n20 DATA 1,2,3\r30 GOTO10\n'
+
+
+def test_convert(capsys):
+    """
+    Unit test to check that function convert() gives the program image and
+    checksums of converting a source file, without any output.
+    """
+    result = convert(PROGRAM_TEXT, 'ahoy3', 0x1001)
+    prg = PrgBuilder(0x1001)
+    checksums = []
+    for line in ('10 print"{cd}hello"', '20 data 1,2,3', '30 goto10'):
+        (line_num, text) = line.split(' ', 1)
+        (byte_list, checksum) = convert_line(int(line_num), text, 'ahoy3')
+        prg.add_line(int(line_num), byte_list)
+        checksums.append((int(line_num), checksum))
+    assert result.prg == bytes(prg.data)
+    assert result.checksums == checksums
+    assert (result.source, result.comparison, result.wraps) == (
+        'ahoy3', None, False)
+    assert capsys.readouterr() == ('', '')
+
+
+def test_convert_ref_codes():
+    """
+    Unit test to check that function convert() compares the checksums to
+    reference codes, detecting the source format for 'auto'.
+    """
+    codes = dict(convert(PROGRAM_TEXT, 'ahoy1').checksums)
+    ref_codes = {10: codes[10], 20: 'AA'}
+    result = convert(PROGRAM_TEXT, 'auto', ref_codes=ref_codes)
+    assert result.source == 'ahoy1'
+    assert result.checksums == sorted(codes.items())
+    assert result.comparison.mismatched == [(20, codes[20], 'AA')]
+    assert result.comparison.extra == [30]
+
+
+@pytest.mark.parametrize(
+    "text, source, ref_codes, error_type, message",
+    [
+        ('10 A\nB', 'ahoy2', None, LineNumberError,
+         'Entry error after line 10 (source line 2, column 1) - each line '
+         'should start with a line number.'),
+        ('10 A\n20 PRINT"{CD"', 'ahoy2', None, LooseBraceError,
+         'Loose brace/bracket error in line: 20 (source line 2, column 10) - '
+         'special characters should be enclosed in braces/brackets.'),
+        ('10 A\n20 PRINT"\u2019"', 'ahoy2', None, BadCharError,
+         'Character "\u2019" has no Commodore equivalent in line: 20 (source '
+         'line 2, column 10) - type it as printed in the magazine.'),
+        ('10 A\n20 X=\u03c0', 'ahoy2', None, BadCharError,
+         'Character "\u03c0" has no Commodore equivalent in line: 20 (source '
+         'line 2, column 6) - type it as printed in the magazine.'),
+        ('10 A\n70000 B', 'ahoy2', None, LineNumberError,
+         'Entry error after line 10 (source line 2, column 1) - line '
+         'numbers should be at most 63999.'),
+        ('10 A', 'auto', {10: 'AA'}, ConversionError,
+         'Unable to detect source format - no line checksums match the '
+         'reference codes.'),
+        ('10 A', 'auto', None, ValueError,
+         "Source format 'auto' requires reference codes"),
+        ('10 A', 'compute', None, ValueError,
+         "Unknown source format 'compute'"),
+    ],
+)
+def test_convert_errors(capsys, text, source, ref_codes, error_type,
+                        message):
+    """
+    Unit test to check that function convert() raises an exception for a
+    program it cannot convert, without any output.
+    """
+    with pytest.raises(error_type) as error:
+        convert(text, source, ref_codes=ref_codes)
+    assert str(error.value) == message
+    assert capsys.readouterr() == ('', '')
+
+
+def test_convert_threads():
+    """
+    Unit test to check that function convert() gives the same results when
+    called from several threads at once.
+    """
+    texts = [''.join(f'{10 * i} PRINT"{{CD}}{n}";{i}\n'
+                     for i in range(1, 200)) for n in range(16)]
+    expected = [convert(text, 'ahoy2') for text in texts]
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(convert, texts * 4)) == expected * 4
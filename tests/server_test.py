@@ -0,0 +1,217 @@
+from base64 import b64decode
+from io import StringIO
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import pytest
+
+from retrotype.retrotype import PrgBuilder, convert_line
+from retrotype.server import (MAX_REQUEST,
+                              convert_request,
+                              handle_request_line,
+                              )
+from retrotype import client
+
+
+def _prg(lines, load_addr=0x0801):
+    prg = PrgBuilder(load_addr)
+    for line in lines:
+        (line_num, text) = line.split(' ', 1)
+        prg.add_line(int(line_num), convert_line(int(line_num), text,
+                                                 'ahoy2')[0])
+    return bytes(prg.data)
+
+
+def test_convert_request():
+    """
+    Unit test to check that function convert_request() gives the output
+    files and terminal output of retrotype_cli for a source text.
+    """
+    response = convert_request({'text': '10 PRINT"HELLO"\n20 GOTO10\n',
+                                'load_addr': '0x1001', 'width': 40})
+    assert response == {
+        'status': 0, 'messages': '',
+        'report': 'Line Checksums:\n\n    10 EO       20 PH   \n\n'
+                  'Lines: 2\n\n',
+        'prg': response['prg'], 'chk': '10 EO\n20 PH\n\nLines: 2\n'}
+    assert b64decode(response['prg']) == _prg(['10 print"hello"',
+                                               '20 goto10'], 0x1001)
+
+
+@pytest.mark.parametrize(
+    "request_, status, messages, report",
+    [
+        ({'text': '10 PRINT"HELLO"\n20 GOTO10\n', 'ref': '10 EO\n20 PG\n',
+          'source': 'auto'}, 1,
+         'Detected source format: ahoy2 (1 of 2 reference lines match)\n\n',
+         'Reference Check:\n\nMismatched lines (line, checksum, reference):'
+         '\n    20 PH PG\n\nLines: 2 (reference: 2)\n\n'),
+        ({'text': '10 PRINT"HELLO"\n20 GOTO10\n', 'ref': '10 EO\n20 PH\n'},
+         0, '', 'All 2 lines match the reference file.\n\n'),
+        ({'text': '10 REM"{CD\n'}, 1,
+         'Loose brace/bracket error in line: 10 (source line 1, column 8)\n'
+         'Special characters should be enclosed in braces/brackets.\n'
+         'Please check for unmatched single brace/bracket in above line.\n',
+         ''),
+        ({'text': '10 END\n', 'ref': '10 X\n'}, 1,
+         'Reference file read failed - Reference file line 1 should be a '
+         'line number and checksum: 10 X\n', ''),
+        ({'text': '10 END\n', 'source': 'auto'}, 1,
+         "Source format 'auto' requires a reference file (--ref).\n", ''),
+        ({'text': '10 PRINT"IT\u2019S"\n'}, 1,
+         'Character "\u2019" has no Commodore equivalent in line: 10 (source '
+         'line 1, column 12) - type it as printed in the magazine.\n', ''),
+        ({'text': '10 END\n70000 END\n'}, 1,
+         'Entry error after line 10 (source line 2, column 1) - line numbers '
+         'should be at most 63999.  Exiting.\n', ''),
+        ({'source': 'ahoy2'}, 1, "Invalid request - 'text'\n", ''),
+        ({'text': '10 END\n', 'load_addr': 'x'}, 1,
+         "Invalid request - invalid literal for int() with base 16: 'x'\n",
+         ''),
+    ],
+)
+def test_convert_request_status(request_, status, messages, report):
+    """
+    Unit test to check that function convert_request() gives the exit
+    status and messages of retrotype_cli for reference checks and errors.
+    """
+    response = convert_request(request_)
+    assert (response['status'], response['messages'], response['report']) \
+        == (status, messages, report)
+    assert (response['prg'] is None) == (response['chk'] is None)
+
+
+def test_convert_request_error(monkeypatch):
+    """
+    Unit test to check that function convert_request() answers a request
+    whose conversion fails with an error it does not report itself.
+    """
+    def overflow(records, prg, source, source_lines=None):
+        raise OverflowError('int too big to convert')
+
+    monkeypatch.setattr('retrotype.server.convert_lines', overflow)
+    response = convert_request({'text': '10 END\n'})
+    assert response == {'status': 1, 'messages': 'int too big to convert\n',
+                        'report': '', 'prg': None, 'chk': None}
+
+
+@pytest.mark.parametrize("line", [b'{"text": ', b'[1, 2]\n'])
+def test_handle_request_line_invalid(line):
+    """
+    Unit test to check that function handle_request_line() answers a line
+    that is not a JSON object with an error response.
+    """
+    response = json.loads(handle_request_line(line))
+    assert response['status'] == 1
+    assert response['messages'].startswith('Invalid request - ')
+
+
+@pytest.fixture
+def server(tmp_path):
+    """Conversion server running in its own process"""
+    socket_path = str(tmp_path / "retrotype.sock")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'retrotype.retrotype_cli', '--serve',
+         socket_path, '--jobs', '2'], env=env, stdout=subprocess.PIPE,
+        universal_newlines=True)
+    started = process.stdout.readline()
+    assert started.startswith('Conversion server listening')
+    yield (process, socket_path)
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+    process.stdout.close()
+
+
+def test_server_clients(tmp_path, capsys, monkeypatch, server):
+    """
+    End to end test to check that the client converts files with a server as
+    retrotype_cli does, with several clients at once, and that the server
+    removes its socket when terminated.
+    """
+    (process, socket_path) = server
+    names = [f'prog{i}' for i in range(6)]
+    for (i, name) in enumerate(names):
+        (tmp_path / f'{name}.v1.ahoy').write_text(
+            f'10 PRINT"{i}"\n20 GOTO10\n')
+
+    def convert(name, results):
+        results[name] = client.main([socket_path, '-s', 'ahoy3',
+                                     str(tmp_path / f'{name}.v1.ahoy')], 40)
+
+    results = {}
+    threads = [threading.Thread(target=convert, args=(name, results))
+               for name in names]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    capsys.readouterr()
+
+    assert results == dict.fromkeys(names, 0)
+    for (i, name) in enumerate(names):
+        (_, code) = convert_line(10, f'print"{i}"', 'ahoy3')
+        assert (tmp_path / f'{name}.v1.chk').read_text() == (
+            f'10 {code}\n20 PP\n\nLines: 2\n')
+        assert (tmp_path / f'{name}.v1.prg').read_bytes() == _prg(
+            [f'10 print"{i}"', '20 goto10'])
+
+    (tmp_path / 'prog0.v1.ref').write_text('10 AA\n')
+    monkeypatch.setattr('sys.stdin', StringIO('y\n'))
+    assert client.main([socket_path, '-r', str(tmp_path / 'prog0.v1.ref'),
+                        str(tmp_path / 'prog0.v1.ahoy')], 40) == 1
+    assert capsys.readouterr().out.endswith(
+        'Mismatched lines (line, checksum, reference):\n    10 BA AA\n\n'
+        'Extra lines: 20\n\nLines: 2 (reference: 1)\n\n')
+
+    process.terminate()
+    assert process.wait(timeout=10) == 0
+    assert not os.path.exists(socket_path)
+    assert client.main([socket_path, str(tmp_path / 'prog0.v1.ahoy')]) == 1
+    assert capsys.readouterr().out.startswith(
+        'Conversion server request failed - ')
+
+
+def _exchange(socket_path, data):
+    """Send data to the server on a new connection and read what it sends
+    back until it closes the connection or ends a response line.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        try:
+            sock.sendall(data)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # closed by the server before reading all of the data
+        received = b''
+        while not received.endswith(b'\n'):
+            try:
+                block = sock.recv(65536)
+            except ConnectionResetError:
+                break
+            if not block:
+                break
+            received += block
+    return received
+
+
+def test_server_errors(server):
+    """
+    End to end test to check that the server answers a request whose
+    conversion fails, and only closes the connection of a request line
+    over MAX_REQUEST, going on serving other connections.
+    """
+    (process, socket_path) = server
+    for text in ('10 PRINT"IT\u2019S"\n', '10 END\n70000 END\n'):
+        request = json.dumps({'text': text}).encode() + b'\n'
+        response = json.loads(_exchange(socket_path, request))
+        assert (response['status'], response['prg']) == (1, None)
+        assert response['messages'].startswith(('Character', 'Entry error'))
+
+    assert _exchange(socket_path, b'x' * (MAX_REQUEST + 1) + b'\n') == b''
+    request = json.dumps({'text': '10 END\n'}).encode() + b'\n'
+    assert json.loads(_exchange(socket_path, request))['status'] == 0
+    assert process.poll() is None
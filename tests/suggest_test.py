@@ -0,0 +1,101 @@
+import random
+import pytest
+
+from retrotype.retrotype import (scan_ahoy_line,
+                                 detokenize_line,
+                                 line_checksum,
+                                 checksum_state,
+                                 checksum_prefix_states,
+                                 )
+from retrotype.suggest import (suggest_corrections,
+                               _SuffixTables,
+                               _LITERAL_VALUES,
+                               )
+
+
+GOOD_LINE = '20 print"{cd}{cd}mike buhidar jr.":goto10'
+GOOD_LISTING = '20 PRINT"{CD}{CD}MIKE BUHIDAR JR.":GOTO10'
+
+
+@pytest.mark.parametrize(
+    "line, description",
+    [
+        ('10 print"{cd}hello{s a}":goto10', 'PRINT"{CD}HELLO{S A}":GOTO10'),
+        ('20 rem print "{pi}"', 'REM PRINT "{PI}"'),
+        ('30 a=b+c^2:print"^+\\"', 'A=B+C^2:PRINT"{UP_ARROW}+{EP}"'),
+    ],
+)
+def test_detokenize_line(line, description):
+    """
+    Unit test to check that function detokenize_line() lists tokenized bytes
+    as typed-in text that tokenizes back to the same bytes.
+    """
+    (line_num, byte_list) = scan_ahoy_line(line)
+    assert detokenize_line(byte_list) == description
+    assert scan_ahoy_line(f'{line_num} {description}'.lower()) == \
+        (line_num, byte_list)
+
+
+@pytest.mark.parametrize("source", ['ahoy2', 'ahoy3'])
+@pytest.mark.parametrize(
+    "bad_line, description",
+    [
+        ('20 print"{cu}{cd}mike buhidar jr.":goto10',
+         'replace "{CU}" with "{CD}"'),
+        ('20 print"{cd}{cd}mike buhidar jr.":goto1o',
+         'replace "O" with "0"'),
+        ('20 print"{cd}{cd}mike buhidar jr.":gotoo10', 'delete "O"'),
+    ],
+)
+def test_suggest_corrections(source, bad_line, description):
+    """
+    Unit test to check that function suggest_corrections() finds the typing
+    error in a line among its suggestions, and that every suggested listing
+    has the reference checksum.
+    """
+    (line_num, byte_list) = scan_ahoy_line(GOOD_LINE)
+    ref_code = line_checksum(source, line_num, byte_list)
+
+    suggestions = suggest_corrections(bad_line, ref_code, source)
+
+    assert (description, GOOD_LISTING) in \
+        [(s.description, s.listing) for s in suggestions]
+    for suggestion in suggestions:
+        (num, new_bytes) = scan_ahoy_line(suggestion.listing.lower())
+        assert line_checksum(source, num, new_bytes) == ref_code
+
+
+@pytest.mark.parametrize("source", ['ahoy1', 'ahoy2', 'ahoy3'])
+def test_suffix_tables_match_rescan(source):
+    """
+    Unit test to check that resuming from a prefix state and finishing with
+    a suffix table gives the same checksum as rescanning each edited line.
+    """
+    rand = random.Random(1984)
+    (line_num, byte_list) = scan_ahoy_line(
+        '30 print"a b {cd}":rem "x y" z')
+    byte_list = bytes(byte_list)
+    states = checksum_prefix_states(checksum_state(source, line_num),
+                                    byte_list)
+    suffix = _SuffixTables(source, byte_list, states)
+    for _ in range(2000):
+        pos = rand.randint(0, len(byte_list) - 1)
+        end = pos + rand.randint(0, 1)
+        value = rand.choice(_LITERAL_VALUES)
+        new_list = byte_list[:pos] + bytes((value,)) + byte_list[end:]
+        state = states[pos].feed(value)
+        if state.in_quotes != states[end].in_quotes:
+            continue
+        shift = (state.char_position - states[end].char_position) & 255
+        assert (suffix.lookup(end, shift, state.xor_value)
+                == checksum_state(source, line_num)
+                .feed_many(new_list).xor_value)
+
+
+def test_suggest_corrections_no_match():
+    """
+    Unit test to check that function suggest_corrections() returns no
+    suggestions for a loose brace or an invalid reference code.
+    """
+    assert suggest_corrections('10 print"{cd"', 'AB', 'ahoy2') == []
+    assert suggest_corrections('10 print"hi"', 'ZZ', 'ahoy2') == []
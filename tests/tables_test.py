@@ -0,0 +1,125 @@
+import marshal
+import os
+import subprocess
+import sys
+
+import pytest
+
+import retrotype
+from retrotype import tables, token_tables
+
+
+def test_precompiled_tables_current():
+    """
+    Unit test to check that the precompiled tables in token_tables.py were
+    generated from the current char_maps.py tables, so they are the ones
+    loaded.  Run 'python -m retrotype.tables' if this fails.
+    """
+    assert token_tables.SOURCE_DIGEST == tables.source_digest()
+    assert tables._precompiled_tables() == tables.build_tables()
+
+
+@pytest.mark.parametrize(
+    "attribute, value",
+    [
+        ('SOURCE_DIGEST', 0),
+        ('TABLES_VERSION', tables.TABLES_VERSION + 1),
+        ('MARSHAL_VERSION', marshal.version + 1),
+    ],
+)
+def test_load_tables_out_of_date(monkeypatch, attribute, value):
+    """
+    Unit test to check that function load_tables() builds the tables from
+    char_maps.py when the precompiled tables are out of date.
+    """
+    monkeypatch.setattr(token_tables, attribute, value)
+    assert tables._precompiled_tables() is None
+    assert tables.load_tables() == tables.build_tables()
+
+
+def test_write_tables(tmp_path):
+    """
+    Unit test to check that function write_tables() writes a module whose
+    tables load back unchanged.
+    """
+    module = tmp_path / "token_tables.py"
+    tables.write_tables(str(module))
+    namespace = {}
+    exec(compile(module.read_text(), str(module), 'exec'), namespace)
+    assert namespace['TABLES_VERSION'] == tables.TABLES_VERSION
+    assert namespace['SOURCE_DIGEST'] == tables.source_digest()
+    assert marshal.loads(namespace['DATA']) == tables.build_tables()
+
+
+# modules a single file conversion does not need, which should only be
+# imported by the runs that use them
+DEFERRED_MODULES = {
+    'asyncio', 'concurrent.futures', 'difflib', 'glob', 'hashlib', 'json',
+    'multiprocessing', 'shutil', 'socket', 'retrotype.cache',
+    'retrotype.char_maps', 'retrotype.interactive', 'retrotype.server',
+    'retrotype.suggest', 'retrotype.watch',
+}
+
+# start-up budget for importing the package's own modules for the command
+# line tool, in microseconds of import time (about 5 ms when measured).
+# Import times vary too much between machines and under load to check by
+# default; set this environment variable to the budget to check it.
+STARTUP_BUDGET_ENV = 'RETROTYPE_STARTUP_BUDGET_US'
+
+
+def _import_times(tmp_path, module, runs=3):
+    """Import a module in a fresh interpreter with -X importtime, returning
+    the least self time (us) of each module imported
+    """
+    env = dict(os.environ, PYTHONPYCACHEPREFIX=str(tmp_path),
+               PYTHONPATH=os.path.dirname(os.path.dirname(retrotype.__file__)))
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    command = [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+    # first run writes the bytecode so later runs do not compile
+    subprocess.run(command, env=env, capture_output=True, check=True)
+    times = {}
+    for _ in range(runs):
+        result = subprocess.run(command, env=env, capture_output=True,
+                                check=True, text=True)
+        for line in result.stderr.splitlines():
+            if not line.startswith('import time:') or 'self [us]' in line:
+                continue
+            (self_us, _, name) = line[len('import time:'):].split('|')
+            name = name.strip()
+            times[name] = min(times.get(name, sys.maxsize), int(self_us))
+    return times
+
+
+def test_cli_startup(tmp_path):
+    """
+    Test to check that importing the command line tool does not load the
+    modules only some runs need.
+    """
+    times = _import_times(tmp_path, 'retrotype.retrotype_cli', runs=1)
+    assert 'retrotype.retrotype' in times
+    assert 'retrotype.token_tables' in times
+    assert not DEFERRED_MODULES & set(times)
+
+
+@pytest.mark.skipif(STARTUP_BUDGET_ENV not in os.environ,
+                    reason=f'set {STARTUP_BUDGET_ENV} to check the budget')
+def test_cli_startup_budget(tmp_path):
+    """
+    Test to check that importing the command line tool stays within the
+    start-up budget in microseconds given by RETROTYPE_STARTUP_BUDGET_US.
+    """
+    times = _import_times(tmp_path, 'retrotype.retrotype_cli')
+    own = sum(us for (name, us) in times.items()
+              if name.split('.')[0] == 'retrotype')
+    assert own < int(os.environ[STARTUP_BUDGET_ENV])
+
+
+def test_client_startup(tmp_path):
+    """
+    Test to check that importing the server client does not load the
+    conversion code or tables.
+    """
+    times = _import_times(tmp_path, 'retrotype.client', runs=1)
+    assert 'retrotype.client' in times
+    assert 'retrotype.retrotype' not in times
+    assert 'retrotype.tables' not in times
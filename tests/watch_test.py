@@ -0,0 +1,193 @@
+import os
+import threading
+import time
+import pytest
+
+from retrotype.retrotype import (PrgBuilder,
+                                 parse_source_line,
+                                 convert_line,
+                                 BadCharError,
+                                 LooseBraceError,
+                                 )
+from retrotype.watch import (ProgramState,
+                             LineChange,
+                             PollWatcher,
+                             InotifyWatcher,
+                             )
+from retrotype.retrotype_cli import command_line_runner
+
+
+PROGRAM = ['10 print"{cd}hello"', '20 data 1,2,3', '30 data 4,5,6',
+           '40 goto10']
+
+
+def _records(lines):
+    return [parse_source_line(line, row) for (row, line) in
+            enumerate(lines, 1)]
+
+
+def _serial_image(lines, source):
+    prg = PrgBuilder()
+    for record in _records(lines):
+        prg.add_line(record.line_num,
+                     convert_line(record.line_num, record.text, source)[0])
+    return bytes(prg.data)
+
+
+@pytest.mark.parametrize(
+    "edited, converted, changes",
+    [
+        (PROGRAM, 0, []),
+        (['10 print"{cd}hello"', '20 data 1,2,4', '30 data 4,5,6',
+          '40 goto10'], 1, [LineChange(20, 'GN', 'GM')]),
+        (['10 print"{cd}hello"', '20 data 1,2,3', '25 rem', '30 data 4,5,6',
+          '40 goto10'], 1, [LineChange(25, None, 'JD')]),
+        (['10 print"{cd}hello"', '30 data 4,5,6', '40 goto10'], 0,
+         [LineChange(20, 'GN', None)]),
+        (['5 rem'] + PROGRAM[:3], 1,
+         [LineChange(5, None, 'JD'), LineChange(40, 'PH', None)]),
+    ],
+)
+def test_program_state_update(edited, converted, changes):
+    """
+    Unit test to check that ProgramState.update() converts only the changed
+    lines and relinks the image to match converting the edited source.
+    """
+    state = ProgramState('ahoy2')
+    assert state.update(_records(PROGRAM)) == [
+        LineChange(line_num, None, code) for (line_num, code) in
+        [(10, 'GF'), (20, 'GN'), (30, 'HG'), (40, 'PH')]]
+    assert state.converted == 4
+
+    assert state.update(_records(edited)) == changes
+    assert state.converted == converted
+    assert bytes(state.prg.data) == _serial_image(edited, 'ahoy2')
+    assert state.prg.line_count == len(edited)
+
+
+@pytest.mark.parametrize(
+    "line, error_type, column",
+    [
+        ('20 data 1,2,3{', LooseBraceError, 14),
+        ('20 print"\u2019"', BadCharError, 10),
+        ('20 x=\u03c0', BadCharError, 6),
+    ],
+)
+def test_program_state_loose_brace(line, error_type, column):
+    """
+    Unit test to check that ProgramState.update() leaves the program as it
+    was when an edited line has a loose brace or a character with no
+    Commodore equivalent.
+    """
+    state = ProgramState('ahoy3')
+    state.update(_records(PROGRAM))
+    (image, checksums) = (bytes(state.prg.data), state.checksums)
+    records = _records(PROGRAM[:1] + [line] + PROGRAM[2:])
+
+    with pytest.raises(error_type) as error:
+        state.update(records)
+    assert error.value.record == records[1]
+    assert error.value.column == column
+    assert (bytes(state.prg.data), state.checksums) == (image, checksums)
+
+
+def _save_later(filename, text, rename):
+    time.sleep(0.2)
+    if rename:
+        with open(f'{filename}.new', 'w') as file:
+            file.write(text)
+        os.replace(f'{filename}.new', filename)
+    else:
+        with open(filename, 'w') as file:
+            file.write(text)
+
+
+@pytest.mark.parametrize("rename", [False, True])
+@pytest.mark.parametrize("watcher_class", [PollWatcher, InotifyWatcher])
+def test_watcher(tmp_path, watcher_class, rename):
+    """
+    Unit test to check that the file watchers return once the file is saved,
+    in place or by renaming a new file over it.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 rem\n')
+    try:
+        watcher = watcher_class(str(p))
+    except OSError:
+        pytest.skip('inotify not available')
+    if watcher_class is PollWatcher:
+        watcher.interval = 0.05
+    thread = threading.Thread(target=_save_later,
+                              args=(str(p), '10 rem\n20 end\n', rename))
+    thread.start()
+    try:
+        watcher.wait()
+    finally:
+        thread.join()
+        watcher.close()
+    assert p.read_text() == '10 rem\n20 end\n'
+
+
+class _FakeWatcher:
+    """Applies each edit in turn when waited on, then stops the watch."""
+
+    def __init__(self, filename, edits):
+        self.filename = filename
+        self.edits = list(edits)
+
+    def wait(self):
+        if not self.edits:
+            raise KeyboardInterrupt
+        with open(self.filename, 'w') as file:
+            file.write(self.edits.pop(0))
+
+    def close(self):
+        pass
+
+
+def test_command_line_runner_watch(tmp_path, capsys, monkeypatch):
+    """
+    End to end test to check that function command_line_runner() keeps
+    converting the input file as it is edited, reporting only the lines
+    whose checksums changed and any errors.
+    """
+    p = tmp_path / "example.ahoy"
+    p.write_text('10 PRINT"HELLO"\n20 GOTO10\n')
+    (tmp_path / "example.prg").write_text('old output')
+    (tmp_path / "example.ref").write_text('10 EO\n20 PH\n30 JD\n')
+    edits = ['10 PRINT"HELLO"\n20 GOTO11\n',
+             '10 PRINT"HELLO"\n20 GOTO11\n30 REM"{CD\n',
+             '10 PRINT"HELLO"\n20 GOTO11\n30 REM\u2019S\n',
+             '10 PRINT"HELLO"\n20 GOTO10\n30 REM\n',
+             '10 PRINT"HELLO"\n10 GOTO10\n']
+    monkeypatch.setattr('retrotype.watch.file_watcher',
+                        lambda filename: _FakeWatcher(filename, edits))
+
+    command_line_runner(['--watch', '-r', str(tmp_path / "example.ref"),
+                         str(p)])
+
+    captured = capsys.readouterr()
+    assert captured.out == (
+        'Reference Check:\n\n'
+        'Missing lines: 30\n\n'
+        'Lines: 2 (reference: 3)\n\n'
+        f'Watching "{p}" for changes - press Ctrl-C to stop.\n\n'
+        'Changed lines:\n\n'
+        '    20 PG (was PH) - reference PH\n'
+        '\nLines: 2\n\n'
+        'Loose brace/bracket error in line: 30 (source line 3, column 8)\n'
+        'Special characters should be enclosed in braces/brackets.\n'
+        'Please check for unmatched single brace/bracket in above line.\n\n'
+        'Character "\u2019" has no Commodore equivalent in line: 30 (source '
+        'line 3, column 7) - type it as printed in the magazine.\n\n'
+        'Changed lines:\n\n'
+        '    20 PH (was PG) - matches reference\n'
+        '    30 JD (new line) - matches reference\n'
+        '\nLines: 3\n\n'
+        'Entry error after line 10 (source line 2, column 1) - lines should '
+        'be in sequential order.  Exiting.\n\n'
+        'Stopped watching.\n')
+    assert (tmp_path / "example.prg").read_bytes() == _serial_image(
+        ['10 print"hello"', '20 goto10', '30 rem'], 'ahoy2')
+    assert (tmp_path / "example.chk").read_text() == (
+        '10 EO\n20 PH\n30 JD\n\nLines: 3\n')